@@ -0,0 +1,44 @@
+import time
+from typing import Callable, Optional
+
+BAG = 'bag'
+
+
+def wait_bag_transition(
+    was_open: bool,
+    wait_frame: Callable[..., Optional[object]],
+    identify: Callable[[object], str],
+    pressed_at: float,
+    timeout: float,
+    confirm_frames: int = 1
+) -> str:
+    """
+    Tab 按下后等待背包界面切换到预期状态
+
+    按下前背包关闭时等待背包出现，按下前背包打开时等待背包消失：关闭背包后的
+    最初几帧仍显示背包，只看第一帧会把正在关闭的背包当成刚打开。预期状态需要
+    连续 confirm_frames 帧确认；超时前没有确认时返回最后一帧的结果。
+
+    Args:
+        was_open: 按下前背包是否打开
+        wait_frame: 与 ImageRecognition.wait_frame 相同签名的取帧函数
+        identify: 识别一帧的背包区域，返回标签名
+        pressed_at: 按键时刻（time.monotonic()）
+        timeout: 最长等待时间（秒）
+        confirm_frames: 确认预期状态所需的连续帧数
+    Returns:
+        str: 背包区域的识别结果，没有截到画面时为 'none'
+    """
+    deadline = pressed_at + timeout
+    expect_open = not was_open
+    result = 'none'
+    confirmed = 0
+    frame = wait_frame(after=pressed_at, timeout=max(deadline - time.monotonic(), 0.0))
+    while frame is not None:
+        result = identify(frame.image)
+        confirmed = confirmed + 1 if (result == BAG) == expect_open else 0
+        remaining = deadline - time.monotonic()
+        if confirmed >= confirm_frames or remaining <= 0:
+            break
+        frame = wait_frame(after_seq=frame.seq, timeout=remaining)
+    return result
@@ -0,0 +1,120 @@
+"""
+单通道匹配模式验证
+
+对已记录的区域截图（recognition.record_crops 开启后保存在 cache/crops/<分辨率>/<类别>/）
+分别用 BGR 与指定通道模式匹配，报告识别结果一致率与加速比，
+一致率达标后可通过 --apply 将该类别切换到新模式。
+
+用法:
+    python -m src.assistant.core.channel_validation --mode gray
+    python -m src.assistant.core.channel_validation --mode gray --categories poses bag --apply
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .image_recognition import ImageRecognition, CHANNEL_MODES, convert_channels
+from .resolution import resolve_template_dir, resolution_name
+from .template_pack import TemplatePack
+from ..utils.constants import TEMPLATE_CATEGORIES
+from ...config.settings import ConfigManager
+
+
+def load_crops(folder: Path) -> List[np.ndarray]:
+    """读取某个类别的全部区域截图（BGR）"""
+    crops = []
+    for path in sorted(folder.glob("*.png")):
+        image = cv2.imdecode(np.fromfile(str(path), dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is not None:
+            crops.append(image)
+    return crops
+
+
+def _run(crops: List[np.ndarray], templates: List[np.ndarray], mode: str,
+         threshold: float) -> Tuple[List[int], float]:
+    """用指定模式识别全部截图，返回 (结果编号列表, 匹配耗时秒)"""
+    label_ids = np.arange(1, len(templates) + 1, dtype=np.int16)
+    converted = [convert_channels(crop, mode) for crop in crops]
+    start = time.perf_counter()
+    results = [ImageRecognition.identify_label_id(crop, label_ids, templates, threshold)[0]
+               for crop in converted]
+    return results, time.perf_counter() - start
+
+
+def validate_category(pack: TemplatePack, category: str, crops: List[np.ndarray],
+                      mode: str, threshold: float) -> Dict:
+    """
+    对比 BGR 与指定通道模式
+    Returns:
+        Dict: {'samples', 'agreement', 'bgr_ms', 'mode_ms', 'speedup', 'mismatches'}
+    """
+    bgr_templates = pack.category(category, "bgr")
+    mode_templates = pack.category(category, mode)
+    names = [name for name in bgr_templates if name in mode_templates]
+
+    bgr_results, bgr_time = _run(crops, [bgr_templates[n] for n in names], "bgr", threshold)
+    mode_results, mode_time = _run(crops, [mode_templates[n] for n in names], mode, threshold)
+
+    labels = ["none"] + names
+    mismatches = [(labels[a], labels[b]) for a, b in zip(bgr_results, mode_results) if a != b]
+    samples = len(crops)
+    return {
+        "samples": samples,
+        "agreement": (samples - len(mismatches)) / samples if samples else 0.0,
+        "bgr_ms": bgr_time * 1000,
+        "mode_ms": mode_time * 1000,
+        "speedup": bgr_time / mode_time if mode_time > 0 else 0.0,
+        "mismatches": mismatches,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = ConfigManager("config")
+    parser = argparse.ArgumentParser(description="验证单通道匹配模式")
+    parser.add_argument("--mode", default="gray", choices=[m for m in CHANNEL_MODES if m != "bgr"])
+    parser.add_argument("--categories", nargs="*", default=None, help="要验证的类别，默认全部")
+    parser.add_argument("--width", type=int, default=settings.get("screen", "width"))
+    parser.add_argument("--height", type=int, default=settings.get("screen", "height"))
+    parser.add_argument("--crops", type=Path, default=None, help="截图目录，默认 cache/crops/<分辨率>")
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="切换所需的最低一致率")
+    parser.add_argument("--apply", action="store_true", help="将达标的类别写入 recognition.channel_modes")
+    args = parser.parse_args(argv)
+
+    name = resolution_name(args.width, args.height)
+    crops_root = args.crops or settings.get_path('cache') / 'crops' / name
+    template_dir = resolve_template_dir(settings.get_path('templates'), settings.get_path('cache') / 'templates',
+                                        args.width, args.height)
+    pack = TemplatePack.load_or_build(template_dir)
+    threshold = settings.get('recognition', 'threshold', 0.5)
+
+    channel_modes = dict(settings.get('recognition', 'channel_modes', {}) or {})
+    passed = []
+    print(f"{'类别':<10}{'样本':>6}{'一致率':>10}{'BGR(ms)':>10}{args.mode + '(ms)':>10}{'加速比':>8}")
+    for category in args.categories or TEMPLATE_CATEGORIES:
+        crops = load_crops(crops_root / category)
+        if not crops:
+            print(f"{category:<10}{'无截图':>6}")
+            continue
+        report = validate_category(pack, category, crops, args.mode, threshold)
+        print(f"{category:<10}{report['samples']:>6}{report['agreement']:>10.2%}"
+              f"{report['bgr_ms']:>10.1f}{report['mode_ms']:>10.1f}{report['speedup']:>8.2f}")
+        for expected, actual in report["mismatches"][:5]:
+            print(f"    不一致: bgr={expected} {args.mode}={actual}")
+        if report["agreement"] >= args.min_agreement:
+            passed.append(category)
+
+    if args.apply and passed:
+        for category in passed:
+            channel_modes[category] = args.mode
+        settings.set('recognition', 'channel_modes', channel_modes)
+        print(f"已切换到 {args.mode}: {', '.join(passed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+核心子进程端：管道日志记录器与命令循环
+
+本模块是 spawn 子进程导入的入口，不能依赖 PyQt5（见 core_process）。
+"""
+from collections import deque
+from datetime import datetime
+from threading import Thread, Lock, Event
+from typing import Optional
+
+from ..utils.logger_factory import LoggerFactory
+from ...config.settings import ConfigManager
+
+SEND_INTERVAL = 0.05  # 核心端批量发送间隔（秒）
+MAX_PENDING_LOGS = 2000  # 界面长时间不读取时最多积压的日志条数
+
+
+class PipeLogger:
+    """子进程日志记录器：接口与 QtLogger 一致，日志与界面数据经管道批量发往界面进程"""
+
+    def __init__(self, conn):
+        self.settings = ConfigManager("config")
+        self.time_format = self.settings.get('logger', 'time_format', '%H:%M:%S')
+        self._conn = conn
+        self._lock = Lock()
+        self._logs = deque(maxlen=MAX_PENDING_LOGS)
+        self._progress = []
+        self._ui = None
+        self._perf = None
+        self._stop_event = Event()
+        self._sender = Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+
+    def _append(self, level: str, message: str):
+        with self._lock:
+            self._logs.append((level, datetime.now().strftime(self.time_format), message))
+
+    def debug(self, message: str):
+        self._append('DEBUG', message)
+
+    def info(self, message: str):
+        self._append('INFO', message)
+
+    def warning(self, message: str):
+        self._append('WARN', message)
+
+    def error(self, message: str):
+        self._append('ERROR', message)
+
+    def close_progress(self, progress: int):
+        with self._lock:
+            self._progress.append(progress)
+
+    def update_ui(self, ui_data: dict):
+        # 只保留最新一份界面数据
+        with self._lock:
+            self._ui = ui_data
+
+    def update_perf(self, perf_data: dict):
+        # 只保留最新一份性能快照
+        with self._lock:
+            self._perf = perf_data
+
+    def flush(self):
+        """发送积压的消息（日志 -> 界面数据 -> 性能快照 -> 关闭进度）"""
+        with self._lock:
+            logs, self._logs = list(self._logs), deque(maxlen=MAX_PENDING_LOGS)
+            ui, self._ui = self._ui, None
+            perf, self._perf = self._perf, None
+            progress, self._progress = self._progress, []
+        try:
+            if logs:
+                self._conn.send(("logs", logs))
+            if ui is not None:
+                self._conn.send(("ui", ui))
+            if perf is not None:
+                self._conn.send(("perf", perf))
+            for stage in progress:
+                self._conn.send(("progress", stage))
+        except (BrokenPipeError, EOFError, OSError):
+            self._stop_event.set()
+
+    def _send_loop(self):
+        while not self._stop_event.wait(SEND_INTERVAL):
+            self.flush()
+
+    def cleanup(self):
+        self.flush()
+        self._stop_event.set()
+
+
+def core_main(conn) -> None:
+    """子进程入口：执行界面发来的控制命令"""
+    LoggerFactory.set_logger(PipeLogger(conn))
+    logger = LoggerFactory.get_logger()
+    core = None
+    core_thread: Optional[Thread] = None
+
+    def stop_core():
+        if core is not None and core_thread is not None and core_thread.is_alive():
+            core.stop()
+            core_thread.join(timeout=5.0)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        command = message[0]
+        try:
+            if command == "start":
+                if core is None:
+                    from .pubg_main import PubgCore
+                    core = PubgCore()
+                if core_thread is None or not core_thread.is_alive():
+                    core_thread = Thread(target=core.start, daemon=True)
+                    core_thread.start()
+            elif command == "stop":
+                stop_core()
+                logger.close_progress(7)
+            elif command == "perf":
+                # 在命令线程中计算快照，不占用识别线程
+                if core is not None:
+                    logger.update_perf(core.perf_snapshot())
+                else:
+                    from .perf_stats import PerfStats
+                    logger.update_perf(PerfStats.get_instance().snapshot())
+            elif command == "trace":
+                if core is not None:
+                    core.dump_trace()
+                else:
+                    logger.warning("核心尚未启动，没有追踪记录")
+            elif command == "memory":
+                if core is not None:
+                    core.log_memory_report()
+                else:
+                    logger.warning("核心尚未启动，没有内存统计")
+            elif command in ("fps", "method"):
+                from ...screen_capture.capture_manager import CaptureManager
+                manager = CaptureManager.get_instance()
+                if command == "fps":
+                    manager.set_fps(message[1])
+                else:
+                    manager.set_method(message[1])
+            elif command == "quit":
+                stop_core()
+                break
+        except Exception as e:
+            logger.error(f"核心进程执行 {command} 失败: {e}")
+    logger.cleanup()
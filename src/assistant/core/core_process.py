@@ -0,0 +1,146 @@
+"""
+在子进程中运行 PubgCore
+
+界面进程只保留 Qt 事件循环；截图、识别、键鼠钩子全部在子进程中运行。
+两端通过一条双工管道通信：
+
+    界面 -> 核心: ("start",) ("stop",) ("fps", 数值) ("method", 名称) ("perf",) ("trace",) ("memory",) ("quit",)
+    核心 -> 界面: ("logs", [(级别, 时间, 消息), ...]) ("ui", 最新界面数据) ("perf", 性能快照)
+                  ("progress", 阶段)
+
+核心端只把消息放入内存队列，由独立的发送线程每 SEND_INTERVAL 秒批量发送，
+界面数据只保留最新一份；界面卡顿最多使队列积压，不会阻塞识别线程。
+
+子进程端（PipeLogger、core_main）在 core_child 中，子进程不导入 PyQt5。
+子进程不设为守护进程：守护进程不能再创建子进程，识别引擎的进程池
+（recognition.engine=process）无法在其中启动。退出时由 shutdown 通知退出，
+超时则强制终止；界面进程意外退出时管道断开，子进程随之结束。
+"""
+import atexit
+import multiprocessing
+from threading import Thread
+from typing import Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .core_child import core_main
+from ..utils.logger_factory import LoggerFactory
+
+
+class CoreProcess(QObject):
+    """界面进程中的核心进程代理，接口与 WorkerThread 保持一致"""
+    stop_signal = pyqtSignal()
+    _instance: Optional['CoreProcess'] = None
+
+    @classmethod
+    def get_instance(cls) -> 'CoreProcess':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.logger = LoggerFactory.get_logger()
+        self._process = None
+        self._conn = None
+        self._reader: Optional[Thread] = None
+        self._is_running = False
+        self._atexit_registered = False
+        self.stop_signal.connect(self.stop)
+
+    def launch(self) -> None:
+        """启动子进程（启动时预先拉起，开启识别时无需等待导入）"""
+        if self._process is not None and self._process.is_alive():
+            return
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe(duplex=True)
+        self._process = context.Process(target=core_main, args=(child_conn,), daemon=False,
+                                        name="PubgCore")
+        self._process.start()
+        if not self._atexit_registered:
+            # 非守护进程在解释器退出时会被 join，须先通知其退出
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+        child_conn.close()
+        self._reader = Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        self.logger.info(f"核心进程已启动: pid={self._process.pid}")
+
+    def _read_loop(self) -> None:
+        """读取核心进程消息并转发为日志记录器的信号（信号跨线程排队到界面线程）"""
+        while True:
+            try:
+                kind, payload = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "logs":
+                self.logger.log_batch(payload)
+            elif kind == "ui":
+                self.logger.update_ui(payload)
+            elif kind == "perf":
+                self.logger.update_perf(payload)
+            elif kind == "progress":
+                if payload >= 7:
+                    self._is_running = False
+                self.logger.close_progress(payload)
+        self._is_running = False
+
+    def _send(self, *message) -> None:
+        try:
+            self._conn.send(message)
+        except (BrokenPipeError, OSError, AttributeError) as e:
+            self.logger.error(f"发送到核心进程失败: {e}")
+
+    def start(self) -> None:
+        self.launch()
+        self._is_running = True
+        self._send("start")
+
+    def stop(self) -> None:
+        if self.is_alive():
+            self._send("stop")
+        else:
+            self.logger.close_progress(7)
+
+    def set_fps(self, fps: int) -> None:
+        if self._process is not None:
+            self._send("fps", fps)
+
+    def set_method(self, method: str) -> None:
+        if self._process is not None:
+            self._send("method", method)
+
+    def request_perf(self) -> None:
+        """请求一份性能快照，经 logger.perf_signal 送达"""
+        if self._process is not None and self._process.is_alive():
+            self._send("perf")
+
+    def dump_trace(self) -> None:
+        """通知核心导出追踪记录（结果见日志）"""
+        if self._process is not None and self._process.is_alive():
+            self._send("trace")
+
+    def memory_snapshot(self) -> None:
+        """通知核心输出内存占用报告（结果见日志）"""
+        if self._process is not None and self._process.is_alive():
+            self._send("memory")
+
+    def is_alive(self) -> bool:
+        return self._is_running and self._process is not None and self._process.is_alive()
+
+    def isRunning(self) -> bool:
+        return self.is_alive()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """通知核心进程退出并等待结束"""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._send("quit")
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self.logger.warning("核心进程未能正常退出，已强制终止")
+        self._conn.close()
+        self._process = None
+        self._is_running = False
@@ -0,0 +1,132 @@
+"""
+线程池与多进程识别引擎吞吐量对比
+
+默认使用合成模板（每个类别若干随机图案），也可以通过 --pack 指定真实模板包；
+画面为合成画面，每个区域内贴入一个模板。
+
+用法:
+    python -m src.assistant.core.engine_benchmark
+    python -m src.assistant.core.engine_benchmark --regions 8 16 32 --workers 1 2 4 --repeat 20
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .image_recognition import ImageRecognition
+from .process_engine import ProcessRecognitionEngine, load_bank
+from .template_pack import TemplatePack
+from ..utils.label_catalog import LabelCatalog
+
+# 合成数据使用的类别与每类模板数
+SYNTHETIC_CATEGORIES = ["weapons", "muzzles", "grips", "scopes", "stocks"]
+SYNTHETIC_TEMPLATES = 8
+TEMPLATE_SIZE = (48, 96)  # (高, 宽)
+REGION_PAD = 16
+
+
+def build_synthetic_pack(folder: Path) -> Path:
+    """生成合成模板目录并编译为模板包"""
+    catalog = LabelCatalog()
+    rng = np.random.default_rng(0)
+    h, w = TEMPLATE_SIZE
+    for category in SYNTHETIC_CATEGORIES:
+        target = folder / "weapon_templates" / category
+        target.mkdir(parents=True, exist_ok=True)
+        labels = catalog.category_label_names(catalog.category_ids[category])[:SYNTHETIC_TEMPLATES]
+        for _, name in labels:
+            coarse = rng.integers(0, 255, (h // 8, w // 8, 3), dtype=np.uint8)
+            image = cv2.resize(coarse, (w, h), interpolation=cv2.INTER_CUBIC)
+            cv2.imencode(".png", image)[1].tofile(str(target / f"{name}.png"))
+    with open(folder / "config.json", "w", encoding="utf-8") as f:
+        json.dump({"regions": {}}, f)
+    return TemplatePack.build(folder)
+
+
+def build_scene(pack: TemplatePack, catalog: LabelCatalog, region_count: int,
+                frame_size: Tuple[int, int] = (1440, 2560)) -> Tuple[Dict[str, List[int]], np.ndarray]:
+    """在画面中排布 region_count 个区域，每个区域贴入一个模板"""
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 40, (*frame_size, 4), dtype=np.uint8)
+    categories = [c for c in catalog.categories if pack.category(c)]
+    regions = {}
+    x = y = REGION_PAD
+    for i in range(region_count):
+        category = categories[i % len(categories)]
+        templates = list(pack.category(category).values())
+        template = templates[i % len(templates)]
+        h, w = template.shape[:2]
+        if x + w + 2 * REGION_PAD > frame_size[1]:
+            x, y = REGION_PAD, y + h + 3 * REGION_PAD
+        if y + h + 2 * REGION_PAD > frame_size[0]:
+            break
+        frame[y + REGION_PAD:y + REGION_PAD + h, x + REGION_PAD:x + REGION_PAD + w, :3] = template
+        regions[f"{category}_{i}"] = [x, y, w + 2 * REGION_PAD, h + 2 * REGION_PAD]
+        x += w + 3 * REGION_PAD
+    return regions, frame
+
+
+def _throughput(recognition: ImageRecognition, catalog: LabelCatalog, bank, frame: np.ndarray,
+                repeat: int) -> Tuple[float, np.ndarray]:
+    """返回 (区域/秒, 最后一次结果)"""
+    result = recognition.batch_process_region_ids(catalog, bank, frame=frame)  # 预热
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = recognition.batch_process_region_ids(catalog, bank, frame=frame)
+    elapsed = time.perf_counter() - start
+    return len(catalog.regions) * repeat / elapsed, result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="对比线程池与多进程识别吞吐量")
+    parser.add_argument("--regions", type=int, nargs="*", default=[8, 16, 32], help="区域数量")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4], help="线程/进程数")
+    parser.add_argument("--repeat", type=int, default=20, help="每组重复次数")
+    parser.add_argument("--pack", type=Path, default=None, help="模板包路径，默认生成合成模板")
+    args = parser.parse_args(argv)
+
+    temp_dir = None
+    if args.pack is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        args.pack = build_synthetic_pack(Path(temp_dir.name))
+    pack = TemplatePack(args.pack)
+    catalog = LabelCatalog()
+    bank = load_bank(pack, catalog, {}, [], None)
+
+    recognition = ImageRecognition()
+    recognition.result_cache = None
+    print(f"{'区域':>6}{'并发':>6}{'线程(区域/s)':>16}{'进程(区域/s)':>16}{'加速比':>8}{'结果一致':>10}")
+    try:
+        for workers in args.workers:
+            engine = ProcessRecognitionEngine(args.pack, workers=workers)
+            try:
+                for region_count in args.regions:
+                    regions, frame = build_scene(pack, catalog, region_count)
+                    catalog.set_regions(regions)
+
+                    recognition.engine = None
+                    recognition.max_workers = workers
+                    thread_rate, thread_result = _throughput(recognition, catalog, bank, frame, args.repeat)
+                    recognition.engine = engine
+                    process_rate, process_result = _throughput(recognition, catalog, bank, frame, args.repeat)
+                    same = bool(np.array_equal(thread_result, process_result))
+                    print(f"{len(regions):>6}{workers:>6}{thread_rate:>16.0f}{process_rate:>16.0f}"
+                          f"{process_rate / thread_rate:>8.2f}{'是' if same else '否':>10}")
+            finally:
+                recognition.engine = None
+                engine.close()
+    finally:
+        pack.close()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
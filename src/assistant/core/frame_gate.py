@@ -0,0 +1,139 @@
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+ACTIVE = "active"
+STATIC = "static"
+INVALID = "invalid"
+STATES = (ACTIVE, STATIC, INVALID)
+
+
+class FrameGate:
+    """逐帧廉价判定画面是否值得识别
+
+    把整帧降采样到很小的灰度图，统计整体亮度与方差，并读取几个锚点像素：
+      - invalid: 画面几乎纯色（黑屏、加载过渡）或所有锚点都接近黑色
+      - static:  与上一帧的降采样图平均差异很小且锚点未变化
+      - active:  其他情况
+    每个消费方（姿势线程、背包识别）使用独立的实例，各自与自己上次看到的画面比较，
+    并各自拥有唤醒事件，一方被唤醒不会吞掉另一方的唤醒。
+    """
+
+    def __init__(self, sample_size: Sequence[int] = (32, 18), anchors: Sequence[Sequence[float]] = (),
+                 invalid_std: float = 3.0, dark_level: float = 16.0, static_diff: float = 1.0,
+                 anchor_diff: float = 12.0, gated_states: Sequence[str] = (STATIC, INVALID)):
+        """
+        Args:
+            sample_size: 降采样尺寸 (宽, 高)
+            anchors: 锚点的相对坐标 [(x, y)]，取值 0~1
+            invalid_std: 降采样灰度图标准差低于该值视为纯色画面
+            dark_level: 锚点亮度低于该值视为黑色
+            static_diff: 与上一帧的平均灰度差低于该值视为静止
+            anchor_diff: 锚点任一通道变化超过该值视为画面变化
+            gated_states: 消费方会拦截的状态，只有这些状态计入连续拦截次数
+        """
+        self.sample_size = (int(sample_size[0]), int(sample_size[1]))
+        self.anchors = [(float(x), float(y)) for x, y in anchors]
+        self.invalid_std = invalid_std
+        self.dark_level = dark_level
+        self.static_diff = static_diff
+        self.anchor_diff = anchor_diff
+        self.gated_states = frozenset(gated_states)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._previous: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.state = ACTIVE
+        self.gated_streak = 0  # 连续被拦截的次数
+        self._since = time.monotonic()
+        self.time_in_state: Dict[str, float] = {state: 0.0 for state in STATES}
+        self.frames_in_state: Dict[str, int] = {state: 0 for state in STATES}
+
+    def _sample(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """降采样灰度图与锚点像素"""
+        h, w = frame.shape[:2]
+        step = max(1, min(h // (self.sample_size[1] * 4), w // (self.sample_size[0] * 4)))
+        coarse = frame[::step, ::step, :3]
+        small = cv2.resize(coarse, self.sample_size, interpolation=cv2.INTER_AREA)
+        gray = small.astype(np.float32).mean(axis=2)
+        points = np.array([frame[min(int(y * h), h - 1), min(int(x * w), w - 1), :3]
+                           for x, y in self.anchors], dtype=np.float32).reshape(-1, 3)
+        return gray, points
+
+    def classify(self, frame: Optional[np.ndarray]) -> str:
+        """判定画面状态并累计各状态的停留时间"""
+        if frame is None or frame.size == 0:
+            state = INVALID
+            sample = None
+        else:
+            sample = self._sample(frame)
+            state = self._state(sample)
+        with self._lock:
+            now = time.monotonic()
+            self.time_in_state[self.state] += now - self._since
+            self._since = now
+            self.state = state
+            self.frames_in_state[state] += 1
+            self.gated_streak = self.gated_streak + 1 if state in self.gated_states else 0
+            if sample is not None:
+                self._previous = sample
+        return state
+
+    def _state(self, sample: Tuple[np.ndarray, np.ndarray]) -> str:
+        gray, points = sample
+        if float(gray.std()) < self.invalid_std:
+            return INVALID
+        if len(points) and bool((points.max(axis=1) < self.dark_level).all()):
+            return INVALID
+        previous = self._previous
+        if previous is None or previous[0].shape != gray.shape:
+            return ACTIVE
+        if float(np.abs(gray - previous[0]).mean()) >= self.static_diff:
+            return ACTIVE
+        if len(points) and float(np.abs(points - previous[1]).max()) > self.anchor_diff:
+            return ACTIVE
+        return STATIC
+
+    def backoff(self, base: float, limit: float) -> float:
+        """被连续拦截时的等待时间：从 base 起按次数翻倍，不超过 limit"""
+        if self.gated_streak == 0:
+            return base
+        return min(base * 2 ** min(self.gated_streak, 16), max(limit, base))
+
+    def wait(self, timeout: float) -> bool:
+        """退避等待 timeout 秒，被唤醒时提前返回 True"""
+        if self._wake.wait(timeout):
+            self._wake.clear()
+            return True
+        return False
+
+    def woken(self) -> bool:
+        """不等待地检查并清除唤醒标志"""
+        if self._wake.is_set():
+            self._wake.clear()
+            return True
+        return False
+
+    def wake(self) -> None:
+        """唤醒退避中的消费方（有用户输入，画面很可能即将变化）"""
+        self._wake.set()
+
+    def reset(self) -> None:
+        """丢弃参考画面（分辨率变化等），下一帧视为活动画面"""
+        with self._lock:
+            self._previous = None
+            self.gated_streak = 0
+
+    def report(self) -> str:
+        """各状态的停留时间与帧数"""
+        with self._lock:
+            now = time.monotonic()
+            self.time_in_state[self.state] += now - self._since
+            self._since = now
+            total = sum(self.time_in_state.values()) or 1.0
+            gated = self.time_in_state[STATIC] + self.time_in_state[INVALID]
+            parts = [f"{state} {self.time_in_state[state]:.1f}s/{self.frames_in_state[state]}帧"
+                     for state in STATES]
+        return f"{', '.join(parts)}；拦截 {gated:.1f}s ({gated / total:.1%})"
@@ -1,14 +1,178 @@
 import os
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Optional, Tuple, List
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, List
 
 import cv2
 import numpy as np
 
+from .metrics import MetricsRegistry
+from .recognition_cache import RecognitionCache, crop_key
+from .tracing import Tracer
+from ..utils.label_catalog import LabelCatalog, NONE_ID
 from ..utils.logger_factory import LoggerFactory
 from ...config.settings import ConfigManager
 
 
+# 匹配通道模式：三通道 BGR、灰度或单个颜色通道
+CHANNEL_MODES = ("bgr", "gray", "b", "g", "r")
+_CHANNEL_INDEX = {"b": 0, "g": 1, "r": 2}
+
+
+def convert_channels(image: np.ndarray, mode: str) -> np.ndarray:
+    """
+    将 BGR/BGRA 图像转换为指定通道模式
+    Args:
+        image: BGR 或 BGRA 图像
+        mode: 通道模式，见 CHANNEL_MODES
+    Returns:
+        numpy.ndarray: 转换后的连续数组
+    """
+    channels = image.shape[2] if image.ndim == 3 else 1
+    if channels == 1:
+        return image
+    if mode == "gray":
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY if channels == 4 else cv2.COLOR_BGR2GRAY)
+    if mode in _CHANNEL_INDEX:
+        return np.ascontiguousarray(image[..., _CHANNEL_INDEX[mode]])
+    return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR) if channels == 4 else image
+
+
+def derive_mask(image: np.ndarray) -> np.ndarray:
+    """
+    生成模板掩码（255 为图标像素）
+    带透明通道时直接使用 alpha，否则对灰度图做 Otsu 二值化并膨胀 1 像素
+    Args:
+        image: BGRA/BGR/灰度模板
+    Returns:
+        numpy.ndarray: uint8 掩码
+    """
+    if image.ndim == 3 and image.shape[2] == 4:
+        return np.where(image[..., 3] > 0, 255, 0).astype(np.uint8)
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return cv2.dilate(mask, np.ones((3, 3), np.uint8))
+
+
+def decode_template(raw: bytes) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    解码模板 PNG，保留透明通道用于生成掩码
+    Args:
+        raw: PNG 文件内容
+    Returns:
+        Optional[Tuple[numpy.ndarray, numpy.ndarray]]: (BGR 模板, 掩码)，解码失败返回None
+    """
+    decoded = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if decoded is None:
+        return None
+    image = convert_channels(decoded if decoded.ndim == 3 else
+                             cv2.cvtColor(decoded, cv2.COLOR_GRAY2BGR), "bgr")
+    return image, derive_mask(decoded)
+
+
+@dataclass
+class MaskedTemplate:
+    """掩码模板的预计算统计量
+
+    zero_mean: 掩码内按通道去均值后再乘以掩码的模板（float32），
+    与任意窗口做互相关时窗口均值项自然抵消；
+    mask: float32 掩码；count: 掩码像素数；norm: zero_mean 的 L2 范数
+    """
+    zero_mean: np.ndarray
+    mask: np.ndarray
+    count: float
+    norm: float
+
+    @classmethod
+    def prepare(cls, template: np.ndarray, mask: np.ndarray) -> Optional['MaskedTemplate']:
+        """预计算掩码统计量，掩码为空或模板无变化时返回None
+
+        传入 float32 掩码时直接复用该数组（多个模板共享同一掩码）
+        """
+        weights = mask if mask.dtype == np.float32 else (mask > 0).astype(np.float32)
+        count = float(weights.sum())
+        if count == 0:
+            return None
+        values = template.astype(np.float32)
+        expanded = weights[..., None] if values.ndim == 3 else weights
+        mean = (values * expanded).sum(axis=(0, 1)) / count
+        zero_mean = np.ascontiguousarray((values - mean) * expanded, dtype=np.float32)
+        norm = float(np.sqrt((zero_mean * zero_mean).sum()))
+        if norm == 0:
+            return None
+        return cls(zero_mean, weights, count, norm)
+
+
+@dataclass
+class CategoryTemplates:
+    """单个类别的模板集合（模板已按 mode 预先转换）"""
+    label_ids: np.ndarray
+    templates: List[np.ndarray]
+    mode: str = "bgr"
+    masked: Optional[List[Optional[MaskedTemplate]]] = None  # 非空时使用掩码匹配
+    threshold: Optional[float] = None  # 为None时使用全局阈值
+
+
+def build_category_bank(
+    sources: List[Tuple[int, Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]]],
+    mode: str = "bgr",
+    masked: bool = False,
+    masked_threshold: Optional[float] = None
+) -> CategoryTemplates:
+    """
+    由模板来源构建单个类别的模板集合
+    Args:
+        sources: [(标签编号, BGR模板, 按 mode 转换后的模板, 掩码)]，掩码可为None
+        mode: 通道模式
+        masked: 是否预计算掩码匹配统计量
+        masked_threshold: 掩码匹配阈值
+    Returns:
+        CategoryTemplates: 模板集合
+    """
+    label_ids, images, prepared = [], [], []
+    shared_masks = {}
+    for label_id, template, converted, mask in sources:
+        if template is None or converted is None:
+            continue
+        label_ids.append(label_id)
+        images.append(converted)
+        if masked:
+            if mask is None:
+                mask = derive_mask(template)
+            # 相同掩码共享同一数组，匹配时窗口统计量只算一次
+            key = (mask.shape, mask.tobytes())
+            if key not in shared_masks:
+                shared_masks[key] = (mask > 0).astype(np.float32)
+            prepared.append(MaskedTemplate.prepare(converted, shared_masks[key]))
+
+    bank = CategoryTemplates(np.array(label_ids, dtype=np.int16), images, mode)
+    if masked:
+        bank.masked = prepared
+        bank.threshold = masked_threshold
+    return bank
+
+
+def crop_rect(frame: np.ndarray, rect, scale: float = 1.0) -> np.ndarray:
+    """截取矩形区域，scale 非1时缩放回模板尺度"""
+    x, y, w, h = (int(v) for v in rect)
+    cropped = frame[y:y + h, x:x + w]
+    if scale != 1.0 and cropped.size:
+        cropped = cv2.resize(cropped, None, fx=1.0 / scale, fy=1.0 / scale, interpolation=cv2.INTER_AREA)
+    return cropped
+
+
+def match_bank(cropped: np.ndarray, bank: CategoryTemplates, threshold: float) -> Tuple[int, float]:
+    """用类别模板集合识别区域截图，返回 (标签编号, 匹配分数)"""
+    if bank.threshold is not None:
+        threshold = bank.threshold
+    converted = convert_channels(cropped, bank.mode)
+    if bank.masked is not None:
+        return ImageRecognition.identify_label_id_masked(converted, bank.label_ids, bank.masked, threshold)
+    return ImageRecognition.identify_label_id(converted, bank.label_ids, bank.templates, threshold)
+
+
 class ImageRecognition:
     """图像识别类，用于处理屏幕捕获和图像识别"""
 
@@ -19,6 +183,18 @@ class ImageRecognition:
         self.logger = LoggerFactory.get_logger()
         self.template_cache = {}
         self.frame_cache = None
+        self.frame_size = None  # 最近一帧的 (宽, 高)
+        self.frame_timestamp: Optional[float] = None  # 最近一帧开始截取的 time.monotonic()
+        self.frame_seq: Optional[int] = None  # 最近一帧的序号（追踪记录用）
+        self.tracer = Tracer.get_instance()
+        self.crop_record_dir: Optional[Path] = None  # 设置后保存识别区域截图，供离线验证
+        self.result_cache: Optional[RecognitionCache] = None  # 内容寻址识别缓存
+        self.max_workers = 8  # 线程池大小
+        self.engine = None  # 多进程识别引擎（ProcessRecognitionEngine），为None时使用线程池
+        self.queue_depth = 0  # 已提交、尚未完成的区域识别任务数（性能页显示）
+        registry = MetricsRegistry.get_instance()
+        self.matches = registry.counter("matches_total", "按类别统计的模板匹配次数", ("category",))
+        self.skipped_matches = registry.counter("matches_skipped_total", "未做模板匹配的次数", ("reason",))
 
     @staticmethod
     def img_read(image_path: str) -> Optional[np.ndarray]:
@@ -46,46 +222,168 @@ class ImageRecognition:
             return None
 
     @staticmethod
-    def identify_from_templates(
+    def identify_label_id(
         frame: np.ndarray,
-        templates: Dict[str, np.ndarray]
-    ) -> str:
+        label_ids: np.ndarray,
+        templates: List[np.ndarray],
+        threshold: float
+    ) -> Tuple[int, float]:
         """
-        从模板中识别图像
+        从模板中识别图像，返回整数编号
         Args:
             frame: 待识别的图像
-            templates: 模板字典 {名称: 模板图像}
+            label_ids: 模板对应的标签编号
+            templates: 模板图像列表，与 label_ids 一一对应
+            threshold: 匹配阈值
         Returns:
-            str: 识别结果名称，未识别返回'none'
+            Tuple[int, float]: (标签编号, 匹配分数)，未识别返回 NONE_ID
         """
-        settings = ConfigManager('config')
-        logger = LoggerFactory.get_logger()
-        # 输入验证
         if frame is None or frame.size == 0 or not templates:
-            return 'none'
+            return NONE_ID, 0.0
+
+        max_val = 0.0
+        best = NONE_ID
+        for label_id, template in zip(label_ids, templates):
+            if template.shape[0] > frame.shape[0] or template.shape[1] > frame.shape[1]:
+                continue
+            _, val, _, _ = cv2.minMaxLoc(cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED))
+            if val > max_val:
+                max_val = val
+                best = int(label_id)
+        return (best, max_val) if max_val >= threshold else (NONE_ID, max_val)
 
-        recognition = settings.get('recognition')
-        threshold = recognition['threshold']
-        max_val = 0
-        result_name = 'none'
+    @staticmethod
+    def identify_label_id_masked(
+        frame: np.ndarray,
+        label_ids: np.ndarray,
+        masked: List[Optional[MaskedTemplate]],
+        threshold: float
+    ) -> Tuple[int, float]:
+        """
+        掩码归一化相关系数匹配（等价于带掩码的 TM_CCOEFF_NORMED）
+        分子只需一次与预计算 zero_mean 模板的互相关；分母的窗口方差由
+        掩码与 I、I² 的互相关得到，I 与 I² 在同一区域内只计算一次。
+        Args:
+            frame: 待识别的图像（与模板相同的通道模式）
+            label_ids: 模板对应的标签编号
+            masked: 预计算的掩码模板
+            threshold: 匹配阈值
+        Returns:
+            Tuple[int, float]: (标签编号, 匹配分数)
+        """
+        if frame is None or frame.size == 0 or not masked:
+            return NONE_ID, 0.0
+
+        image = frame.astype(np.float32)
+        planes = cv2.split(image) if image.ndim == 3 else [image]
+        squares = [plane * plane for plane in planes]
+        window_stats = {}  # 共享同一掩码的模板在同一区域内只计算一次窗口统计
+
+        max_val = 0.0
+        best = NONE_ID
+        for label_id, item in zip(label_ids, masked):
+            if item is None:
+                continue
+            h, w = item.mask.shape[:2]
+            if h > image.shape[0] or w > image.shape[1]:
+                continue
+            key = id(item.mask)
+            variance = window_stats.get(key)
+            if variance is None:
+                variance = 0
+                for plane, square in zip(planes, squares):
+                    s1 = cv2.matchTemplate(plane, item.mask, cv2.TM_CCORR)
+                    s2 = cv2.matchTemplate(square, item.mask, cv2.TM_CCORR)
+                    variance = variance + s2 - s1 * s1 / item.count
+                window_stats[key] = variance
+            numerator = cv2.matchTemplate(image, item.zero_mean, cv2.TM_CCORR)
+            scores = numerator / (np.sqrt(np.maximum(variance, 1e-6)) * item.norm)
+            val = float(scores.max())
+            if val > max_val:
+                max_val = val
+                best = int(label_id)
+        return (best, max_val) if max_val >= threshold else (NONE_ID, max_val)
+
+    def capture_raw(self) -> Optional[np.ndarray]:
+        """
+        捕获屏幕原始帧（不做颜色转换，由各区域裁剪后按需转换）
+        Returns:
+            numpy.ndarray: BGRA 或 BGR 格式的图像数组
+        """
         try:
-            # 遍历所有模板进行匹配
-            for name, template in templates.items():
-                if template is None or template.size == 0:
-                    continue
-                # 模板匹配
-                result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
-                _, val, _, _ = cv2.minMaxLoc(result)
-                # 更新最佳匹配
-                if val > max_val:
-                    max_val = val
-                    result_name = name
+            from ...screen_capture.capture_manager import CaptureManager
+            with self.tracer.span("safe_capture") as span:
+                info = CaptureManager.get_instance().get_frame_info()
+                if info is not None:
+                    span.set(seq=info.seq, backend=info.backend, fresh=info.seq != self.frame_seq)
+            if info is None:
+                return self.frame_cache
+            frame = info.image
+            self.frame_cache = frame
+            self.frame_size = (frame.shape[1], frame.shape[0])
+            self.frame_timestamp = info.timestamp
+            self.frame_seq = info.seq
+            return frame
+        except Exception as e:
+            self.logger.error(f"捕获屏幕失败: {e}")
+            return self.frame_cache
 
-            return result_name if max_val >= threshold else 'none'
+    def wait_frame(self, after: Optional[float] = None, after_seq: Optional[int] = None,
+                   timeout: float = 1.0):
+        """
+        等待第一帧在 after（time.monotonic() 时刻）之后截取、或序号大于 after_seq 的新画面
+        Returns:
+            Optional[Frame]: 帧对象（image 为原始帧），超时或失败返回None
+        """
+        try:
+            from ...screen_capture.capture_manager import CaptureManager
+            with self.tracer.span("wait_frame") as span:
+                frame = CaptureManager.get_instance().wait_frame(after, after_seq, timeout)
+                if frame is not None:
+                    span.set(seq=frame.seq, backend=frame.backend)
+            if frame is not None:
+                self.frame_cache = frame.image
+                self.frame_size = (frame.image.shape[1], frame.image.shape[0])
+                self.frame_timestamp = frame.timestamp
+                self.frame_seq = frame.seq
+            return frame
+        except Exception as e:
+            self.logger.error(f"等待新画面失败: {e}")
+            return None
 
+    def demand_capture(self) -> None:
+        """通知截图后端即将需要新画面（按需帧率策略立即提升到峰值）"""
+        try:
+            from ...screen_capture.capture_manager import CaptureManager
+            CaptureManager.get_instance().demand()
+        except Exception as e:
+            self.logger.error(f"提升截图频率失败: {e}")
+
+    def capture_burst(self, count: int, interval: float = 0.0) -> List[np.ndarray]:
+        """
+        连续捕获多帧原始画面，用于多帧投票
+        Args:
+            count: 帧数
+            interval: 相邻两次抓取的间隔（秒）
+        Returns:
+            List[numpy.ndarray]: 成功捕获的帧
+        """
+        try:
+            from ...screen_capture.capture_manager import CaptureManager
+            manager = CaptureManager.get_instance()
+            with self.tracer.span("capture_burst", count=count) as span:
+                frames = manager.get_burst(count, interval)
+                span.set(captured=len(frames))
+            if frames:
+                self.frame_cache = frames[-1]
+                latest = manager.latest_frame()
+                if latest is not None:
+                    self.frame_timestamp = latest.timestamp
+                    self.frame_seq = latest.seq
+            return frames
         except Exception as e:
-            logger.error(f"图像匹配失败: {e}")
-            return 'none'
+            self.logger.error(f"连续捕获屏幕失败: {e}")
+            return []
 
     def capture_screen(self) -> np.ndarray:
         """
@@ -94,101 +392,191 @@ class ImageRecognition:
             numpy.ndarray: BGR格式的图像数组
         """
         try:
-            # 从共享内存获取完整帧
-            # from .frame_client import FrameClient
-            # frame = FrameClient.get_instance().get_frame()
-            from ...screen_capture.capture_manager import CaptureManager
-            frame = CaptureManager.get_instance().get_frame()
+            frame = self.capture_raw()
             if frame is None:
-                return self.frame_cache
-            # frame = cv2.cvtColor(frame, cv2.rgb)
-            self.frame_cache = frame
-            return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+                return None
+            return convert_channels(frame, "bgr")
         except Exception as e:
             self.logger.error(f"捕获屏幕失败: {e}")
 
-    def process_region(
-        self,
-            category: str,
-            templates: Dict[str, np.ndarray],
-            region: List[int],
-            frame: np.ndarray = None
-    ) -> Tuple[str, str]:
+    def identify_rect(
+            self,
+            catalog: LabelCatalog,
+            category_id: int,
+            rect,
+            template_bank: List[CategoryTemplates],
+            frame: Optional[np.ndarray] = None,
+            threshold: Optional[float] = None,
+            region_name: str = "",
+            scale: float = 1.0
+    ) -> Tuple[int, float]:
         """
-        处理特定区域的图像识别
+        识别帧中指定矩形区域，先查识别缓存，未命中再做模板匹配
         Args:
-            category: 类别名称
-            templates: 模板字典
-            region: 截取位置 [x, y, w, h]
-            frame: 输入帧，默认为None
+            catalog: 标签目录
+            category_id: 类别编号
+            rect: 区域 [x, y, w, h]
+            template_bank: 按类别编号索引的模板集合
+            frame: 输入帧（BGRA/BGR 原始帧），为None时自动截图
+            threshold: 匹配阈值，为None时读取配置
+            region_name: 区域名称（用于日志与截图记录）
+            scale: 界面缩放，非1时先把截图缩放回模板尺度
         Returns:
-            Tuple[str, str]: (类别, 识别结果)
+            Tuple[int, float]: (标签编号, 匹配分数)
         """
         try:
             if frame is None:
-                frame = self.capture_screen()
+                frame = self.capture_raw()
                 if frame is None:
-                    return category, 'none'
+                    return NONE_ID, 0.0
+            cropped = crop_rect(frame, rect, scale)
+            if cropped.size == 0:
+                return NONE_ID, 0.0
+            if self.crop_record_dir is not None:
+                self.record_crop(region_name or catalog.categories[category_id],
+                                 catalog.categories[category_id], cropped)
 
-            x, y, w, h = region
-            cropped = frame[y:y + h, x:x + w]
-            if cropped is None or cropped.size == 0:
-                return category, 'none'
+            cache = self.result_cache
+            if cache is not None:
+                key = crop_key(category_id, cropped)
+                cached = cache.get(key)
+                if cached is not None:
+                    self.skipped_matches.inc("cache")
+                    return cached
 
-            result = self.identify_from_templates(cropped, templates)
+            if threshold is None:
+                threshold = ConfigManager('config').get('recognition', 'threshold', 0.5)
+            result = match_bank(cropped, template_bank[category_id], threshold)
+            self.matches.inc(catalog.categories[category_id])
 
-            return category, result
-            
+            if cache is not None:
+                cache.put(key, *result)
+            return result
         except Exception as e:
-            self.logger.error(f"处理区域失败: {e}")
-            return category, 'none'
+            self.logger.error(f"处理区域 {region_name or category_id} 失败: {e}")
+            return NONE_ID, 0.0
 
-    def batch_process_regions(
+    def process_region_id(
+            self,
+            region_id: int,
+            catalog: LabelCatalog,
+            template_bank: List[CategoryTemplates],
+            frame: Optional[np.ndarray] = None,
+            threshold: Optional[float] = None
+    ) -> Tuple[int, float]:
+        """
+        按区域编号识别
+        Args:
+            region_id: 区域编号
+            catalog: 标签目录
+            template_bank: 按类别编号索引的模板集合
+            frame: 输入帧（BGRA/BGR 原始帧），为None时自动截图
+            threshold: 匹配阈值
+        Returns:
+            Tuple[int, float]: (标签编号, 匹配分数)
+        """
+        with self.tracer.span("process_region", region=catalog.regions[region_id],
+                              frame_seq=self.frame_seq) as span:
+            rect, scale = catalog.region_roi(region_id)
+            result = self.identify_rect(catalog, int(catalog.region_categories[region_id]),
+                                        rect, template_bank, frame, threshold,
+                                        catalog.regions[region_id], scale)
+            span.set(label_id=result[0])
+            return result
+
+    def record_crop(self, region: str, category: str, cropped: np.ndarray) -> None:
+        """保存区域截图（BGR），用于离线验证匹配模式"""
+        try:
+            folder = self.crop_record_dir / category
+            folder.mkdir(parents=True, exist_ok=True)
+            ok, encoded = cv2.imencode(".png", convert_channels(cropped, "bgr"))
+            if ok:
+                encoded.tofile(str(folder / f"{time.time_ns()}_{region}.png"))
+        except Exception as e:
+            self.logger.error(f"保存区域截图失败: {e}")
+
+    def batch_process_region_ids(
         self,
-        regions: Dict[str, List[int]],
-        templates: Dict[str, Dict[str, np.ndarray]],
-        exclude_categories: Optional[List[str]] = None
-    ) -> Dict[str, str]:
-        """批量处理多个区域的图像识别"""
-        # import cProfile
-        # self.profiler = cProfile.Profile()
-        # self.profiler.enable()  # 开始性能分析
-
-        results = {}
-        exclude_categories = exclude_categories or []
+        catalog: LabelCatalog,
+        template_bank: List[CategoryTemplates],
+        exclude_categories: Optional[List[str]] = None,
+        return_scores: bool = False,
+        frame: Optional[np.ndarray] = None
+    ):
+        """
+        批量识别所有区域，返回整数结果数组
+        Args:
+            catalog: 标签目录
+            template_bank: 按类别编号索引的模板集合
+            exclude_categories: 跳过的区域名
+            return_scores: 为True时同时返回匹配分数数组
+            frame: 输入帧（BGRA/BGR 原始帧），为None时自动截图
+        Returns:
+            numpy.ndarray: 按区域编号索引的标签编号，未处理的区域为 UNSET_ID；
+            return_scores 为True时返回 (标签编号数组, 分数数组)
+        """
+        results = catalog.new_region_array()
+        scores = np.zeros(len(results), dtype=np.float32)
+        exclude = set(exclude_categories or [])
+        region_ids = [i for i, name in enumerate(catalog.regions) if name not in exclude]
 
         try:
-            frame = self.capture_screen()
+            # 使用原始帧，只对裁剪后的区域做颜色转换
+            if frame is None:
+                frame = self.capture_raw()
             if frame is None:
-                return results
-            # if frame is not None and frame.size > 0:
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                future_to_category = {
+                return (results, scores) if return_scores else results
+            threshold = ConfigManager('config').get('recognition', 'threshold', 0.5)
+            if self.engine is not None:
+                self._batch_with_engine(frame, catalog, region_ids, threshold, results, scores)
+                return (results, scores) if return_scores else results
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
                     executor.submit(
-                        self.process_region,
-                        category,
-                        templates.get(category.split('_')[0], {}),
-                        region,
-                        frame
-                    ): category
-                    for category, region in regions.items()
-                    if category not in exclude_categories
+                        self.process_region_id, region_id, catalog, template_bank, frame, threshold
+                    ): region_id
+                    for region_id in region_ids
                 }
-
-                for future in as_completed(future_to_category):
-                    category = future_to_category[future]
-                    try:
-                        _, result = future.result()
-                        results[category] = result
-                    except Exception as e:
-                        self.logger.error(f"处理区域 {category} 失败: {e}")
-                        results[category] = 'none'
-                            
+                self.queue_depth = len(futures)
+                for future in as_completed(futures):
+                    results[futures[future]], scores[futures[future]] = future.result()
+                    self.queue_depth -= 1
         except Exception as e:
             self.logger.error(f"批量处理失败: {e}")
+        finally:
+            self.queue_depth = 0
 
-        # self.profiler.disable()  # 停止性能分析
-        # self.profiler.print_stats(sort='cumtime')  # 打印性能分析结果
-        # self.profiler.dump_stats('profile_stats.prof')  # 保存性能分析结果
+        return (results, scores) if return_scores else results
+
+    def _batch_with_engine(self, frame: np.ndarray, catalog: LabelCatalog, region_ids: List[int],
+                           threshold: float, results: np.ndarray, scores: np.ndarray) -> None:
+        """多进程路径：主进程只做裁剪、截图记录与缓存查询，未命中的区域交给工作进程匹配"""
+        cache = self.result_cache
+        keys = {}
+        jobs = []
+        for region_id in region_ids:
+            category_id = int(catalog.region_categories[region_id])
+            rect, scale = catalog.region_roi(region_id)
+            cropped = crop_rect(frame, rect, scale)
+            if cropped.size == 0:
+                results[region_id] = NONE_ID
+                continue
+            if self.crop_record_dir is not None:
+                self.record_crop(catalog.regions[region_id], catalog.categories[category_id], cropped)
+            if cache is not None:
+                keys[region_id] = crop_key(category_id, cropped)
+                cached = cache.get(keys[region_id])
+                if cached is not None:
+                    results[region_id], scores[region_id] = cached
+                    self.skipped_matches.inc("cache")
+                    continue
+            jobs.append((region_id, category_id, rect, scale))
+            self.matches.inc(catalog.categories[category_id])
 
-        return results
\ No newline at end of file
+        self.queue_depth = len(jobs)
+        with self.tracer.span("engine_match", jobs=len(jobs), frame_seq=self.frame_seq):
+            matched = self.engine.match(frame, jobs, threshold)
+        for region_id, label_id, score in matched:
+            results[region_id], scores[region_id] = label_id, score
+            if cache is not None:
+                cache.put(keys[region_id], label_id, score)
@@ -0,0 +1,204 @@
+"""
+内存占用统计
+
+各子系统（截图帧、模板库、缓存等）向 MemoryLedger 登记一个函数，返回其持有的
+numpy 数组（可嵌套在列表、字典、dataclass 中）或直接返回字节数。统计时按底层
+缓冲区去重：同一帧被多处引用、裁剪视图与原图只计一次，归入先登记的子系统。
+
+可以为子系统设置预算（MB）：超出时调用登记的释放函数，没有释放函数时只输出警告。
+另外提供 tracemalloc 快照与对比，用于定位 numpy 之外的 Python 对象增长。
+"""
+import dataclasses
+import threading
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from ..utils.logger_factory import LoggerFactory
+
+MB = 1024 * 1024
+
+
+def _root_buffer(array: np.ndarray) -> np.ndarray:
+    """视图对应的最底层 ndarray（np.memmap 等非 ndarray 的底层对象不再向下追溯）"""
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def held_bytes(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    统计对象持有的 numpy 数组字节数
+    Args:
+        obj: ndarray，或包含 ndarray 的列表、元组、字典、dataclass；整数视为已知的字节数
+        seen: 已统计的底层缓冲区 id，跨调用共享时可在多个子系统间去重
+    Returns:
+        int: 字节数
+    """
+    if seen is None:
+        seen = set()
+    if obj is None:
+        return 0
+    if isinstance(obj, (int, np.integer)) and not isinstance(obj, bool):
+        return int(obj)
+    if isinstance(obj, np.ndarray):
+        root = _root_buffer(obj)
+        if isinstance(root, np.memmap):
+            return 0  # 文件映射按需换页，不计入
+        if id(root) in seen:
+            return 0
+        seen.add(id(root))
+        return int(root.nbytes)
+    if isinstance(obj, dict):
+        return sum(held_bytes(value, seen) for value in list(obj.values()))
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return sum(held_bytes(item, seen) for item in list(obj))
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return sum(held_bytes(getattr(obj, f.name), seen) for f in dataclasses.fields(obj))
+    return 0
+
+
+@dataclasses.dataclass
+class _Subsystem:
+    getter: Callable[[], Any]
+    evict: Optional[Callable[[int], None]] = None  # 参数为预算字节数
+    budget: Optional[int] = None  # 字节，None 表示不限制
+    over_budget: bool = False
+
+
+class MemoryLedger:
+    """各子系统的内存占用登记表（单例模式）"""
+    _instance: Optional['MemoryLedger'] = None
+
+    @classmethod
+    def get_instance(cls) -> 'MemoryLedger':
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.logger = LoggerFactory.get_logger()
+        self._lock = threading.Lock()
+        self._subsystems: Dict[str, _Subsystem] = {}
+        self._budgets: Dict[str, int] = {}  # 按名称保存的预算（字节），之后登记的子系统同样生效
+        self.snapshots = MallocSnapshots()
+
+    def register(self, name: str, getter: Callable[[], Any],
+                 evict: Optional[Callable[[int], None]] = None) -> None:
+        """
+        登记子系统，同名子系统被替换；已设置的预算在登记时生效
+        Args:
+            name: 子系统名称
+            getter: 返回持有的数组或字节数
+            evict: 超出预算时调用，参数为预算字节数
+        """
+        with self._lock:
+            self._subsystems[name] = _Subsystem(getter, evict, self._budgets.get(name))
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._subsystems.pop(name, None)
+
+    def set_budgets(self, budgets_mb: Dict[str, float]) -> None:
+        """设置各子系统预算（MB），未列出的子系统不限制；尚未登记的子系统在登记时生效"""
+        with self._lock:
+            self._budgets = {name: int(float(budget) * MB)
+                             for name, budget in budgets_mb.items() if budget is not None}
+            for name, subsystem in self._subsystems.items():
+                subsystem.budget = self._budgets.get(name)
+                subsystem.over_budget = False
+
+    def report(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Optional[int]]]:
+        """
+        {子系统: {"bytes": 字节数, "budget": 预算字节数或None}}，按登记顺序去重统计
+        Args:
+            names: 只统计这些子系统，None 表示全部
+        """
+        with self._lock:
+            subsystems = list(self._subsystems.items())
+        if names is not None:
+            names = set(names)
+            subsystems = [(name, subsystem) for name, subsystem in subsystems if name in names]
+        seen: Set[int] = set()
+        result = {}
+        for name, subsystem in subsystems:
+            try:
+                size = held_bytes(subsystem.getter(), seen)
+            except Exception as e:
+                self.logger.error(f"统计 {name} 内存占用失败: {e}")
+                size = 0
+            result[name] = {"bytes": size, "budget": subsystem.budget}
+        return result
+
+    def check_budgets(self) -> List[str]:
+        """检查预算，超出时释放或警告，返回超出预算的子系统"""
+        report = self.report()
+        with self._lock:
+            subsystems = dict(self._subsystems)
+        exceeded = []
+        for name, entry in report.items():
+            subsystem = subsystems.get(name)
+            if subsystem is None or subsystem.budget is None:
+                continue
+            size, budget = entry["bytes"], subsystem.budget
+            if size <= budget:
+                subsystem.over_budget = False
+                continue
+            exceeded.append(name)
+            if subsystem.evict is not None:
+                try:
+                    subsystem.evict(budget)
+                except Exception as e:
+                    self.logger.error(f"释放 {name} 内存失败: {e}")
+            if not subsystem.over_budget:
+                # 持续超出时只在刚超出时警告一次
+                self.logger.warning(f"{name} 占用 {size / MB:.1f} MB 超出预算 {budget / MB:.1f} MB"
+                                    + ("，已尝试释放" if subsystem.evict is not None else ""))
+            subsystem.over_budget = True
+        return exceeded
+
+
+class MallocSnapshots:
+    """tracemalloc 快照与对比（开启后所有 Python 内存分配都会变慢，只用于排查）"""
+
+    def __init__(self, keep: int = 8):
+        self._snapshots: deque = deque(maxlen=keep)
+
+    @property
+    def enabled(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        """开始跟踪，frames 为每次分配记录的调用栈深度"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._snapshots.clear()
+
+    def take(self) -> Dict[str, int]:
+        """拍摄快照（未开启跟踪时先开启），返回当前与峰值已跟踪字节数"""
+        self.start()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        self._snapshots.append(snapshot)
+        current, peak = tracemalloc.get_traced_memory()
+        return {"current": current, "peak": peak}
+
+    def diff(self, top: int = 10, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        """最近两次快照之间增长最多的位置，快照不足两次时为空"""
+        if len(self._snapshots) < 2:
+            return []
+        stats = self._snapshots[-1].compare_to(self._snapshots[-2], key_type)
+        return [{
+            "location": str(stat.traceback),
+            "size": stat.size,
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+        } for stat in stats[:top]]
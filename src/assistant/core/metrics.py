@@ -0,0 +1,312 @@
+"""
+Prometheus 文本格式指标
+
+计数器与直方图按线程分片：每个线程只修改自己的分片（thread-local 字典），
+记录时不加锁；导出时把所有分片相加，已退出线程的分片合并后丢弃。
+仪表盘可以直接赋值，也可以在导出时由回调读取（如任务队列长度）。
+其他模块已有的统计（截图后端运行状况、进程资源）通过采集函数在导出时读取。
+
+指标名统一加 PREFIX 前缀，导出格式为 Prometheus text exposition format 0.0.4，
+由 MetricsServer 在本机 HTTP 端口的 /metrics 路径提供。
+"""
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..utils.logger_factory import LoggerFactory
+
+PREFIX = "logitech_assistant_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# 默认直方图分桶（秒），覆盖截图/匹配的亚毫秒级到 Tab 等待的数百毫秒
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[str, ...]
+
+
+@dataclass
+class MetricFamily:
+    """一个指标的全部样本：[(名称后缀, {标签: 值}, 数值), ...]"""
+    name: str
+    type: str
+    help: str
+    samples: List[Tuple[str, Dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, labels: Optional[Dict[str, str]] = None, suffix: str = "") -> None:
+        self.samples.append((suffix, labels or {}, value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """按 Prometheus 文本格式输出"""
+    lines = []
+    for family in families:
+        name = PREFIX + family.name
+        lines.append(f"# HELP {name} {_escape(family.help)}")
+        lines.append(f"# TYPE {name} {family.type}")
+        for suffix, labels, value in family.samples:
+            label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}" if label_text
+                         else f"{name}{suffix} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class _Sharded(ABC):
+    """按线程分片的存储：记录时只访问本线程的分片，子类实现分片的合并方式"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}  # 已退出线程的分片合并结果
+        self._shards_lock = threading.Lock()  # 只在线程首次记录与导出时使用
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+        return shard
+
+    @abstractmethod
+    def _merge(self, target: dict, shard: dict) -> None:
+        """把一个分片合并到 target"""
+        pass
+
+    def _collect_shards(self) -> dict:
+        """合并所有分片（dict.copy 在 GIL 下一次完成，不会读到改到一半的字典）"""
+        with self._shards_lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard.copy())
+            self._shards = alive
+            total = {}
+            self._merge(total, self._retired)
+            for _, shard in alive:
+                self._merge(total, shard.copy())
+        return total
+
+
+class Counter(_Sharded):
+    """只增不减的计数器"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merge(self, target: dict, shard: dict) -> None:
+        for labels, value in shard.items():
+            target[labels] = target.get(labels, 0) + value
+
+    def value(self, *labels: str) -> float:
+        return self._collect_shards().get(labels, 0)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, "counter", self.help)
+        for labels, value in sorted(self._collect_shards().items()):
+            family.add(value, dict(zip(self.labelnames, labels)))
+        return family
+
+
+class Histogram(_Sharded):
+    """分桶直方图（每个标签组合记录各桶计数、总和与次数）"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__()
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def _merge(self, target: dict, shard: dict) -> None:
+        for labels, (counts, total, count) in shard.items():
+            merged = target.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], list(counts))]
+            merged[1] += total
+            merged[2] += count
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, "histogram", self.help)
+        for labels, (counts, total, count) in sorted(self._collect_shards().items()):
+            label_dict = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                family.add(cumulative, dict(label_dict, le=_format_value(bound)), "_bucket")
+            family.add(total, label_dict, "_sum")
+            family.add(count, label_dict, "_count")
+        return family
+
+
+class Gauge:
+    """仪表盘：直接赋值，或在导出时调用 getter 读取"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 getter: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.getter = getter
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value  # 单次字典赋值，无需加锁
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, "gauge", self.help)
+        if self.getter is not None:
+            family.add(float(self.getter()))
+        for labels, value in sorted(self._values.copy().items()):
+            family.add(value, dict(zip(self.labelnames, labels)))
+        return family
+
+
+class MetricsRegistry:
+    """进程内的指标注册表（单例模式）"""
+    _instance: Optional['MetricsRegistry'] = None
+
+    @classmethod
+    def get_instance(cls) -> 'MetricsRegistry':
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.logger = LoggerFactory.get_logger()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+
+    def _get_or_create(self, name: str, factory: Callable[[], object]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (),
+              getter: Optional[Callable[[], float]] = None) -> Gauge:
+        gauge = self._get_or_create(name, lambda: Gauge(name, help, labelnames, getter))
+        if getter is not None:
+            gauge.getter = getter  # 重新创建核心时指向新的对象
+        return gauge
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """注册导出时调用的采集函数，同名采集函数被替换"""
+        with self._lock:
+            self._collectors[key] = collector
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+        families = [metric.collect() for metric in metrics]
+        for key, collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                self.logger.error(f"采集指标 {key} 失败: {e}")
+        return families
+
+    def render(self) -> str:
+        return render(self.collect())
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 抓取请求很频繁，不写日志
+
+
+class MetricsServer:
+    """本机 HTTP 指标端点（GET /metrics）"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            registry: 指标注册表
+            host: 监听地址（只应使用本机地址）
+            port: 端口，0 表示由系统分配
+        """
+        self.logger = LoggerFactory.get_logger()
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> int:
+        """在后台线程中启动服务，返回实际监听的端口"""
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": self.registry})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                        name="MetricsServer")
+        self._thread.start()
+        self.logger.info(f"指标端点已启动: http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5.0)
+        self._server = None
+        self._thread = None
+        self.logger.info("指标端点已停止")
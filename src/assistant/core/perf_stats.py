@@ -0,0 +1,114 @@
+"""
+流水线性能统计
+
+识别线程只在各阶段结束时把耗时追加到环形缓冲（deque.append 在 GIL 下是原子操作，
+不加锁），性能页按几 Hz 的频率取快照，分位数等计算都在取快照的线程中完成。
+
+阶段:
+    match          一次识别（整屏批量识别或单个区域）
+    write          一次结果输出（weapon.lua / results.json / 共享内存 / 订阅推送）
+    tab_to_output  按下 Tab 到识别结果写出
+截图耗时由截图后端的 CaptureHealth 记录，由 PubgCore.perf_snapshot() 合并进快照。
+各阶段耗时同时记入指标直方图 stage_latency_seconds。
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .metrics import MetricsRegistry
+from ..utils.process_stats import ProcessSampler
+
+STAGES = ("match", "write", "tab_to_output")
+PERCENTILES = (50, 90, 99)
+
+
+def latency_summary(samples: Iterable[float]) -> Dict[str, float]:
+    """耗时样本（毫秒）的次数与分位数"""
+    values = np.fromiter(samples, dtype=np.float64)
+    summary = {"count": int(values.size)}
+    for q in PERCENTILES:
+        summary[f"p{q}"] = float(np.percentile(values, q)) if values.size else 0.0
+    return summary
+
+
+class FrameRateMeter:
+    """由相邻两次读取的帧序号差计算实际截图帧率"""
+
+    def __init__(self):
+        self._last: Optional[tuple] = None  # (后端, 帧序号, 时刻)
+        self.fps = 0.0
+
+    def update(self, backend: str, seq: int, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            last_backend, last_seq, last_now = self._last
+            if backend == last_backend and seq >= last_seq and now > last_now:
+                self.fps = (seq - last_seq) / (now - last_now)
+            else:
+                self.fps = 0.0  # 切换了后端，序号重新计数
+        self._last = (backend, seq, now)
+        return self.fps
+
+
+class PerfStats:
+    """各阶段最近耗时的环形记录（单例模式）"""
+    _instance: Optional['PerfStats'] = None
+
+    @classmethod
+    def get_instance(cls) -> 'PerfStats':
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, window: int = 512):
+        """
+        Args:
+            window: 每个阶段保留的最近样本数
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = {stage: deque(maxlen=window) for stage in STAGES}
+        # 累计次数（不受窗口限制；不加锁，多个线程同时记录时可能略少）
+        self.counts: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.sampler = ProcessSampler()
+        self.histogram = MetricsRegistry.get_instance().histogram(
+            "stage_latency_seconds", "识别流水线各阶段耗时（秒）", ("stage",))
+
+    def record(self, stage: str, seconds: float) -> None:
+        """记录一次阶段耗时（秒）"""
+        self._samples[stage].append(seconds * 1000.0)
+        self.counts[stage] += 1
+        self.histogram.observe(seconds, stage)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """记录 with 块的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """各阶段最近样本的分位数（毫秒）"""
+        summary = {}
+        for stage, samples in self._samples.items():
+            summary[stage] = latency_summary(tuple(samples))
+            summary[stage]["total"] = self.counts[stage]
+        return summary
+
+    def snapshot(self) -> Dict:
+        """阶段耗时与进程资源占用（调用方可以再合并截图、缓存等信息）"""
+        return {
+            "time": time.time(),
+            "stages": self.stage_summary(),
+            "process": self.sampler.sample(),
+        }
+
+    def reset(self) -> None:
+        for samples in self._samples.values():
+            samples.clear()
+        self.counts = dict.fromkeys(STAGES, 0)
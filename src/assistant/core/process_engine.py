@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .image_recognition import CategoryTemplates, build_category_bank, crop_rect, match_bank
+from .template_pack import TemplatePack
+from ..utils.label_catalog import LabelCatalog
+from ..utils.logger_factory import LoggerFactory
+
+# 识别任务：(区域编号, 类别编号, [x, y, w, h], 缩放)
+RegionJob = Tuple[int, int, Sequence[int], float]
+
+# 工作进程内的状态（由 _init_worker 填充）
+_worker: Dict = {}
+
+
+def load_bank(pack: TemplatePack, catalog: LabelCatalog, channel_modes: Dict[str, str],
+              masked_categories: Sequence[str], masked_threshold: Optional[float]) -> List[CategoryTemplates]:
+    """由模板包构建按类别编号索引的模板库（模板为映射区域上的视图）"""
+    bank = []
+    for category_id, category in enumerate(catalog.categories):
+        mode = channel_modes.get(category, "bgr")
+        sources = pack.sources(category, catalog.category_label_names(category_id), mode)
+        bank.append(build_category_bank(sources, mode, category in masked_categories, masked_threshold))
+    return bank
+
+
+def _init_worker(pack_path: str, channel_modes: Dict[str, str], masked_categories: List[str],
+                 masked_threshold: Optional[float]) -> None:
+    """工作进程初始化：映射模板包并构建模板库，多个进程共享同一份物理页"""
+    pack = TemplatePack(Path(pack_path))
+    _worker["pack"] = pack
+    _worker["bank"] = load_bank(pack, LabelCatalog(), channel_modes, masked_categories, masked_threshold)
+    _worker["frames"] = {}
+
+
+def _attach_frame(name: str, offset: int, shape: Tuple[int, ...]) -> np.ndarray:
+    """按名称附加共享内存并返回指定偏移处的帧视图（附加结果按名称缓存）"""
+    frames = _worker["frames"]
+    shm = frames.get(name)
+    if shm is None:
+        # 只保留最新的共享内存段，旧段随引擎扩容而作废
+        for old in frames.values():
+            old.close()
+        frames.clear()
+        # 工作进程与主进程共用同一个 resource_tracker，共享内存由主进程负责释放
+        shm = shared_memory.SharedMemory(name=name)
+        frames[name] = shm
+    return np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+
+
+def _run_jobs(name: str, offset: int, shape: Tuple[int, ...], threshold: float,
+              jobs: List[RegionJob]) -> List[Tuple[int, int, float]]:
+    """工作进程：在共享帧上识别一批区域，返回 [(区域编号, 标签编号, 分数)]"""
+    frame = _attach_frame(name, offset, shape)
+    bank = _worker["bank"]
+    results = []
+    for region_id, category_id, rect, scale in jobs:
+        cropped = crop_rect(frame, rect, scale)
+        if cropped.size == 0:
+            results.append((region_id, 0, 0.0))
+            continue
+        label_id, score = match_bank(cropped, bank[category_id], threshold)
+        results.append((region_id, int(label_id), float(score)))
+    return results
+
+
+class ProcessRecognitionEngine:
+    """多进程识别引擎
+
+    工作进程各自以只读内存映射打开模板包（物理页共享），主进程把帧写入
+    共享内存，任务中只携带共享内存名称、偏移与形状；每个进程一次处理一批区域，
+    返回紧凑的 (区域编号, 标签编号, 分数) 元组。
+    """
+
+    def __init__(self, pack_path: Path, channel_modes: Optional[Dict[str, str]] = None,
+                 masked_categories: Optional[Sequence[str]] = None,
+                 masked_threshold: Optional[float] = None, workers: int = 0):
+        """
+        Args:
+            pack_path: 模板包路径
+            channel_modes: 各类别通道模式
+            masked_categories: 使用掩码匹配的类别
+            masked_threshold: 掩码匹配阈值
+            workers: 工作进程数，0 表示 CPU 核数减一（至少 1）
+        """
+        self.logger = LoggerFactory.get_logger()
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 2) - 1)
+        # 使用 spawn，与 Windows 行为一致，且不会继承 Qt/钩子等线程状态
+        self._pool = multiprocessing.get_context("spawn").Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(str(pack_path), dict(channel_modes or {}), list(masked_categories or []),
+                      masked_threshold)
+        )
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self.logger.info(f"多进程识别引擎已启动: {self.workers} 个工作进程")
+
+    def _frame_buffer(self, frame: np.ndarray) -> np.ndarray:
+        """把帧写入共享内存（容量不足时重新分配），返回共享内存上的视图"""
+        if self._shm is None or self._shm.size < frame.nbytes:
+            self._release_shm()
+            self._shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf)
+        np.copyto(view, frame)
+        return view
+
+    def match(self, frame: np.ndarray, jobs: List[RegionJob], threshold: float) -> List[Tuple[int, int, float]]:
+        """
+        识别一帧中的多个区域
+        Args:
+            frame: 原始帧（uint8）
+            jobs: 识别任务
+            threshold: 匹配阈值
+        Returns:
+            List[Tuple[int, int, float]]: [(区域编号, 标签编号, 分数)]
+        """
+        if not jobs:
+            return []
+        self._frame_buffer(frame)
+        # 按进程数轮转分批，减少进程间往返次数
+        chunks = [jobs[i::self.workers] for i in range(self.workers)]
+        pending = [
+            self._pool.apply_async(_run_jobs, (self._shm.name, 0, frame.shape, threshold, chunk))
+            for chunk in chunks if chunk
+        ]
+        results = []
+        for item in pending:
+            results.extend(item.get())
+        return results
+
+    def _release_shm(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self) -> None:
+        """关闭工作进程并释放共享内存"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._release_shm()
+        self.logger.info("多进程识别引擎已关闭")
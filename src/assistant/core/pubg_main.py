@@ -1,16 +1,36 @@
+import hashlib
 import json
+import os
 import time
 from dataclasses import dataclass
 from functools import wraps
 from threading import Thread, Lock, Event
-from typing import Dict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import keyboard
+import numpy as np
 from pynput import mouse
 
-from ..core.image_recognition import ImageRecognition
-from ..utils.constants import translate_name, get_attribute_keys
+from ..core.bag_transition import wait_bag_transition
+from ..core.frame_gate import FrameGate, ACTIVE, INVALID, STATIC
+from ..core.image_recognition import (ImageRecognition, CHANNEL_MODES, CategoryTemplates,
+                                      build_category_bank, convert_channels, decode_template)
+from ..core.memory_report import MB, MemoryLedger
+from ..core.metrics import MetricFamily, MetricsRegistry, MetricsServer
+from ..core.perf_stats import FrameRateMeter, PerfStats, latency_summary
+from ..core.recognition_cache import RecognitionCache
+from ..core.recoil_table import Loadout, RecoilTables
+from ..core.result_smoother import ResultSmoother
+from ..core.roi_calibration import RoiCalibration
+from ..core.results_block import ResultsBlock, DEFAULT_NAME as RESULTS_BLOCK_NAME
+from ..core.resolution import compile_regions, resolve_template_dir, resolution_name
+from ..core.state_server import StateServer
+from ..core.template_pack import TemplatePack
+from ..core.tracing import Tracer, traced
+from ..utils.label_catalog import LabelCatalog, NONE_ID, UNSET_ID
 from ..utils.logger_factory import LoggerFactory
+from ..utils.process_stats import process_rss
 from ...config.settings import ConfigManager
 
 
@@ -24,8 +44,10 @@ class GameState:
         self.current_weapon: str = "rifle"
         self.current_scope: str = "none"
         self.is_recognizing: bool = False
+        self.bag_open: bool = False  # 最近一次 Tab 后背包是否打开（整屏识别结果不含背包区域）
         self.off_on_flag: bool = True
         self.results: Dict = {}
+        self.label_ids = None  # 按区域编号索引的整数识别结果
         self._lock = Lock()
         self._stop_event = Event()  # 添加事件用于线程同步
 
@@ -74,14 +96,19 @@ class PubgCore():
     MAX_ZOOM = 1.6
     MIN_ZOOM = 1.0
     ZOOM_STEP = 0.06
+    RESOLUTION_CHECK_INTERVAL = 2.0  # 分辨率检测间隔（秒）
+    RESOLUTION_WIDTH_TOLERANCE = 64  # DXGI 行对齐可能使帧宽略大于屏幕宽度
+    CACHE_SAVE_INTERVAL = 60.0  # 识别缓存定期保存间隔（秒）
+    SEQ_FILE = "weapon.seq"  # 只含结果序号的小文件，供外部轮询
+    API_TOKEN_FILE = "api.token"  # 订阅接口控制命令所需的令牌（每次启动服务重新生成）
 
     def __init__(self):
         """初始化"""
         self.settings = ConfigManager("config")
         self.logger = LoggerFactory.get_logger()
-        self.file_path = (self.settings.get_path('templates') /
-                          (str(self.settings.get("screen", "width"))
-                           + str(self.settings.get("screen", "height"))))
+        self.resolution = (int(self.settings.get("screen", "width")),
+                           int(self.settings.get("screen", "height")))
+        self.file_path = self._resolve_template_dir(*self.resolution)
 
         # 确保在创建其他属性之前初始化 image_recognition
         self.image_recognition = ImageRecognition()
@@ -91,42 +118,368 @@ class PubgCore():
         self.pose_thread = None
         
         # 加载配置和区域
-        self.templates = self._load_templates()
+        self.template_pack = self._load_pack()
         self.config = self._load_config()
-        self.regions = self.config['regions']
-        self.shoot_pixel = self.config['shoot_pixel']
-        
+        self.regions, self.shoot_pixel = compile_regions(self.config, *self.resolution)
+        self.catalog = LabelCatalog(self.regions, self.file_path / 'weapon_templates')
+        self.template_bank = self._load_template_bank()
+        self.smoother = self._create_smoother()
+        self._output_lock = Lock()
+        self.output_seq = self._load_output_seq()
+        self.perf = PerfStats.get_instance()
+        self.tracer = Tracer.get_instance()
+        self.tracer.configure(self.settings.get('trace', 'enabled', False),
+                              self.settings.get('trace', 'capacity', 50000))
+        self._frame_rate = FrameRateMeter()
+        self._tab_pressed_at: Optional[float] = None  # 等待写出结果的 Tab 按下时刻
+        self.results_block: Optional[ResultsBlock] = None
+        self.state_server: Optional[StateServer] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.recoil_tables = RecoilTables(self.settings.get_path('config') / 'weapons.json',
+                                          self.catalog.display_name)
+        self.pose_gate = self._create_frame_gate()
+        # 背包识别只拦截无效画面（静止的背包仍需识别），只有无效画面计入退避
+        self.recognition_gate = self._create_frame_gate((INVALID,))
+        self._recognition_retry_at = 0.0  # 背包识别遇到无效画面后，主循环在该时刻之前不再截图
+        self.roi_calibration = None
+        self._setup_roi_calibration()
+        self._last_resolution_check = 0.0
+        self._last_cache_save = time.monotonic()
+        self._setup_crop_recording()
+        self._setup_result_cache()
+        self._setup_metrics()
+        self._setup_memory()
+
+    def _cache_version(self) -> str:
+        """识别缓存版本：模板内容 + 标签表 + 识别配置"""
+        digest = hashlib.blake2b(digest_size=16)
+        if self.template_pack is not None:
+            digest.update(self.template_pack.content_hash.encode())
+        else:
+            for bank in self.template_bank:
+                for template in bank.templates:
+                    digest.update(np.ascontiguousarray(template).data)
+        digest.update(json.dumps({
+            "labels": self.catalog.labels,
+            "recognition": self.settings.get('recognition', default={}),
+        }, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _setup_result_cache(self) -> None:
+        """按配置创建识别缓存并从磁盘加载"""
+        old_cache = self.image_recognition.result_cache
+        if old_cache is not None:
+            old_cache.save()
+        if not self.settings.get('recognition', 'cache_enabled', True):
+            self.image_recognition.result_cache = None
+            return
+        cache = RecognitionCache(
+            self.settings.get_path('cache') / 'recognition' / f"{resolution_name(*self.resolution)}.npz",
+            self._cache_version(),
+            self.settings.get('recognition', 'cache_max_entries', 8192)
+        )
+        cache.load()
+        self.image_recognition.result_cache = cache
+
+    def save_result_cache(self) -> None:
+        """保存识别缓存并输出命中率"""
+        cache = self.image_recognition.result_cache
+        if cache is None:
+            return
+        cache.save()
+        stats = cache.stats()
+        self.logger.info(f"识别缓存: 命中率 {stats['hit_rate']:.1%} "
+                         f"({stats['hits']}/{stats['hits'] + stats['misses']}), {stats['entries']} 条")
 
-    def _load_templates(self) -> Dict:
-        """加载所有模板图片"""
+    def _create_smoother(self) -> Optional[ResultSmoother]:
+        """按配置创建识别结果平滑器"""
+        if not self.settings.get('recognition', 'smoothing_enabled', True):
+            return None
+        return ResultSmoother(
+            len(self.catalog.regions),
+            self.settings.get('recognition', 'smoothing_window', 5),
+            self.settings.get('recognition', 'smoothing_votes', 3),
+            self.settings.get('recognition', 'smoothing_margin', 0.15)
+        )
+
+    def _create_frame_gate(self, gated_states=(STATIC, INVALID)) -> Optional[FrameGate]:
+        """按配置创建画面有效性判定，gated_states 为消费方会拦截的状态"""
+        gate = self.settings.get('frame_gate', default={}) or {}
+        if not gate.get('enabled', False):
+            return None
+        return FrameGate(
+            gate.get('sample_size', (32, 18)),
+            gate.get('anchors', []),
+            gate.get('invalid_std', 3.0),
+            gate.get('dark_level', 16.0),
+            gate.get('static_diff', 1.0),
+            gate.get('anchor_diff', 12.0),
+            gated_states
+        )
+
+    def _gate_backoff(self, gate: FrameGate, base: float) -> float:
+        """被拦截后的退避时间"""
+        return gate.backoff(base, self.settings.get('frame_gate', 'max_backoff', 8.0))
+
+    def wake_gated(self) -> None:
+        """唤醒退避中的姿势线程与背包识别（有用户输入，画面很可能即将变化）"""
+        for gate in (self.pose_gate, self.recognition_gate):
+            if gate is not None:
+                gate.wake()
+
+    def save_gate_report(self) -> None:
+        """输出画面判定的停留时间统计"""
+        for name, gate in (("姿势", self.pose_gate), ("背包识别", self.recognition_gate)):
+            if gate is not None:
+                self.logger.info(f"{name}画面判定: {gate.report()}")
+
+    def _setup_engine(self) -> None:
+        """recognition.engine 为 process 时启动多进程识别引擎（需要模板包）"""
+        self._close_engine()
+        if self.settings.get('recognition', 'engine', 'thread') != 'process':
+            return
+        if self.template_pack is None:
+            self.logger.warning("多进程识别需要模板包，使用线程池")
+            return
+        try:
+            from ..core.process_engine import ProcessRecognitionEngine
+            self.image_recognition.engine = ProcessRecognitionEngine(
+                self.template_pack.path,
+                self.settings.get('recognition', 'channel_modes', {}) or {},
+                self.settings.get('recognition', 'masked_categories', []) or [],
+                self.settings.get('recognition', 'masked_threshold', None),
+                self.settings.get('recognition', 'engine_workers', 0)
+            )
+        except Exception as e:
+            self.logger.error(f"启动多进程识别引擎失败，使用线程池: {e}")
+
+    def _close_engine(self) -> None:
+        engine = self.image_recognition.engine
+        if engine is not None:
+            self.image_recognition.engine = None
+            engine.close()
+
+    def _setup_roi_calibration(self) -> None:
+        """按配置加载当前分辨率的区域校准表并应用到标签目录"""
+        if self.roi_calibration is not None:
+            self.roi_calibration.save()
+        if not self.settings.get('recognition', 'roi_calibration', True):
+            self.roi_calibration = None
+            return
+        self.roi_calibration = RoiCalibration(
+            self.settings.get_path('cache') / 'roi' / f"{resolution_name(*self.resolution)}.json",
+            self.settings.get('recognition', 'roi_scales', [1.0]),
+            self.settings.get('recognition', 'roi_pad', 0),
+            self.settings.get('recognition', 'roi_margin', 2),
+            self.settings.get('recognition', 'roi_min_score', 0.8)
+        )
+        if self.roi_calibration.load():
+            self.roi_calibration.apply(self.catalog)
+
+    def _revalidate_roi(self, region_id: int, frame: Optional[np.ndarray], label_id: int,
+                        score: float, threshold: float) -> tuple:
+        """
+        校验区域识别结果的可信度
+        未校准的区域首次识别到界面元素时做一次宽窗口多尺度校准；已校准区域分数
+        低于 roi_min_score 时回退到宽窗口确认，元素仍在则重新校准。
+        Returns:
+            tuple: (标签编号, 匹配分数)
+        """
+        calibration = self.roi_calibration
+        if calibration is None or frame is None or label_id == UNSET_ID:
+            return label_id, score
+        if not self.catalog.region_calibrated[region_id]:
+            if label_id != NONE_ID:
+                calibration.calibrate(self.catalog, region_id, frame, self.template_bank, threshold)
+            return label_id, score
+        if score >= calibration.min_score:
+            return label_id, score
+
+        # 紧凑区域置信度下降：先用宽窗口确认元素是否真的不在（结果可被识别缓存命中）
+        wide_id, wide_score = self.image_recognition.identify_rect(
+            self.catalog, int(self.catalog.region_categories[region_id]),
+            self.catalog.wide_rects[region_id], self.template_bank, frame, threshold,
+            self.catalog.regions[region_id])
+        if wide_id == NONE_ID:
+            return label_id, score
+        calibration.invalidate(self.catalog, region_id)
+        if calibration.calibrate(self.catalog, region_id, frame, self.template_bank, threshold) is None:
+            return wide_id, wide_score
+        return self.image_recognition.process_region_id(region_id, self.catalog, self.template_bank,
+                                                        frame, threshold)
+
+    def _capture_burst(self) -> list:
+        """怀疑结果变化时连续抓取几帧新画面用于投票"""
+        count = self.settings.get('recognition', 'burst_frames', 3)
+        if count <= 0:
+            return []
+        if self.smoother is not None:
+            # 连拍帧数少于剩余票数时一次 Tab 无法确认变化，至少补足剩余票数
+            count = max(count, self.smoother.confirm_frames)
+        return self.image_recognition.capture_burst(
+            count, self.settings.get('recognition', 'burst_interval', 0.01))
+
+    def _confirm_suspects(self, stable: np.ndarray, suspects: list) -> None:
+        """对怀疑变化的区域在连拍帧上重新识别并投票，原地更新稳定结果"""
+        frames = self._capture_burst()
+        threshold = self.settings.get('recognition', 'threshold', 0.5)
+        for frame in frames:
+            for region_id in suspects:
+                label_id, score = self.image_recognition.process_region_id(
+                    region_id, self.catalog, self.template_bank, frame, threshold)
+                stable[region_id] = self.smoother.observe(region_id, label_id, score)
+
+    def save_smoother_stats(self) -> None:
+        """输出原始结果与稳定结果的翻转次数"""
+        if self.smoother is None:
+            return
+        stats = self.smoother.stats()
+        self.logger.info(f"识别结果翻转: 原始 {stats['raw_flips']} 次, 平滑后 {stats['stable_flips']} 次")
+
+    def save_capture_rate_report(self) -> None:
+        """输出按需截图频率的统计"""
+        try:
+            from ...screen_capture.capture_manager import CaptureManager
+            report = CaptureManager.get_instance().rate_report()
+        except Exception as e:
+            self.logger.error(f"获取截图频率统计失败: {e}")
+            return
+        if report:
+            self.logger.info(f"截图频率分布:\n{report}")
+        selection = CaptureManager.get_instance().get_selection()
+        health = selection['health']
+        if health:
+            self.logger.info(f"截图后端 {selection['method']}: 截图 {health['attempts']} 次, "
+                             f"暂无新画面 {health['idle']} 次, 失败 {health['failures']} 次, "
+                             f"成功率 {health['success_rate']:.1%}")
+
+    def report_capture_backend(self) -> None:
+        """输出当前截图后端及选择原因（首次调用时触发自动选择测速）"""
+        try:
+            from ...screen_capture.capture_manager import CaptureManager
+            manager = CaptureManager.get_instance()
+            manager.capture_method  # 确保后端已创建
+            selection = manager.get_selection()
+        except Exception as e:
+            self.logger.error(f"获取截图后端失败: {e}")
+            return
+        self.logger.info(f"截图后端: {selection['method']}（{selection['reason']}）")
+
+    def _setup_crop_recording(self) -> None:
+        """按配置开启区域截图记录（用于 channel_validation 离线验证）"""
+        if self.settings.get('recognition', 'record_crops', False):
+            self.image_recognition.crop_record_dir = (
+                self.settings.get_path('cache') / 'crops' / resolution_name(*self.resolution))
+        else:
+            self.image_recognition.crop_record_dir = None
+
+    def _resolve_template_dir(self, width: int, height: int):
+        """获取分辨率对应的模板目录，没有手工模板时自动缩放生成"""
+        templates_root = self.settings.get_path('templates')
+        try:
+            return resolve_template_dir(templates_root, self.settings.get_path('cache') / 'templates',
+                                        width, height)
+        except Exception as e:
+            self.logger.error(f"生成 {width}x{height} 模板集失败: {e}")
+            return templates_root / resolution_name(width, height)
+
+    def apply_resolution(self, width: int, height: int) -> None:
+        """切换分辨率：就地重建模板与区域计划，不重启工作线程"""
+        self.logger.info(f"分辨率变化: {self.resolution[0]}x{self.resolution[1]} -> {width}x{height}")
+        self.resolution = (width, height)
+        self.file_path = self._resolve_template_dir(width, height)
+        self.template_pack = self._load_pack()
+        self.config = self._load_config()
+        regions, shoot_pixel = compile_regions(self.config, width, height)
+
+        self.catalog.template_dir = self.file_path / 'weapon_templates'
+        self.template_bank = self._load_template_bank()
+        self.catalog.set_regions(regions)
+        if self.smoother is not None:
+            self.smoother.resize(len(self.catalog.regions))
+        self.regions, self.shoot_pixel = regions, shoot_pixel
+        self._setup_roi_calibration()
+        for gate in (self.pose_gate, self.recognition_gate):
+            if gate is not None:
+                gate.reset()
+        if self.image_recognition.engine is not None:
+            self._setup_engine()
+        self.state.label_ids = None
+        self.state.results = {}
+        self._setup_crop_recording()
+        self._setup_result_cache()
+
+        self.settings.set('screen', 'width', width)
+        self.settings.set('screen', 'height', height)
+        self.logger.info("区域计划已重建")
+
+    def check_resolution(self) -> None:
+        """根据最近一帧的尺寸检测分辨率变化（宽度允许行对齐带来的误差）"""
+        frame_size = self.image_recognition.frame_size
+        if frame_size is None:
+            return
+        width, height = frame_size
+        if height != self.resolution[1] or abs(width - self.resolution[0]) > self.RESOLUTION_WIDTH_TOLERANCE:
+            try:
+                self.apply_resolution(width, height)
+            except Exception as e:
+                self.logger.error(f"切换分辨率失败: {e}")
+                self.resolution = (width, height)
+
+    def _load_pack(self) -> Optional[TemplatePack]:
+        """加载编译后的模板包，失败时返回None并回退到逐个读取PNG"""
+        if not self.settings.get('recognition', 'template_pack', True):
+            return None
+        try:
+            return TemplatePack.load_or_build(self.file_path)
+        except Exception as e:
+            self.logger.warning(f"模板包不可用，逐个读取模板图片: {e}")
+            return None
+
+    def _load_template_bank(self) -> List[CategoryTemplates]:
+        """加载所有模板图片，构建按类别编号索引的模板库
+
+        各类别模板按 recognition.channel_modes 中配置的通道模式预先转换，
+        recognition.masked_categories 中的类别额外预计算掩码匹配统计量
+        """
         self.logger.info("加载模板图片")
-        template_dirs = {
-            "poses": f"{self.file_path}/weapon_templates/poses/",
-            "weapons": f"{self.file_path}/weapon_templates/weapons/",
-            "muzzles": f"{self.file_path}/weapon_templates/muzzles/",
-            "grips": f"{self.file_path}/weapon_templates/grips/",
-            "scopes": f"{self.file_path}/weapon_templates/scopes/",
-            "stocks": f"{self.file_path}/weapon_templates/stocks/",
-            "bag": f"{self.file_path}/weapon_templates/bag/",
-            "car": f"{self.file_path}/weapon_templates/car/",
-            "shoot": f"{self.file_path}/weapon_templates/shoot/"
-        }
+        channel_modes = self.settings.get('recognition', 'channel_modes', {}) or {}
+        masked_categories = set(self.settings.get('recognition', 'masked_categories', []) or [])
+        masked_threshold = self.settings.get('recognition', 'masked_threshold', None)
+        template_bank = []
+        for category_id, category in enumerate(self.catalog.categories):
+            mode = channel_modes.get(category, "bgr")
+            if mode not in CHANNEL_MODES:
+                self.logger.warning(f"未知的通道模式 {category}: {mode}，使用 bgr")
+                mode = "bgr"
+            # (标签编号, BGR模板, 转换后模板, 掩码)
+            if self.template_pack is not None:
+                sources = self.template_pack.sources(category, self.catalog.category_label_names(category_id),
+                                                     mode)
+            else:
+                sources = []
+                for label_id, template_path in self.catalog.template_paths(category):
+                    # 与打包时相同按原样解码，带透明通道的模板才能由 alpha 生成掩码
+                    try:
+                        decoded = decode_template(template_path.read_bytes())
+                    except OSError as e:
+                        self.logger.error(f"无法读取模板: {template_path}: {e}")
+                        continue
+                    if decoded is None:
+                        self.logger.error(f"无法解码模板: {template_path}")
+                        continue
+                    template, mask = decoded
+                    sources.append((label_id, template, convert_channels(template, mode), mask))
 
-        templates = {}
-        for category, path in template_dirs.items():
-            templates[category] = {}
-            names = get_attribute_keys(category)
-            for template_name in names:
-                template_path = f"{path}{template_name}.png"
-                # 使用实例方法而不是静态方法
-                template = self.image_recognition.img_read(template_path)
-                if template is not None:
-                    templates[category][template_name] = template
+            template_bank.append(build_category_bank(sources, mode, category in masked_categories,
+                                                     masked_threshold))
         self.logger.info("模板图片加载完成")
-        return templates
+        return template_bank
 
     def _load_config(self) -> Dict:
         """加载区域配置"""
+        if self.template_pack is not None:
+            return self.template_pack.config
         self.logger.info("加载识别配置文件")
         config_path = f"{self.file_path}/config.json"
         with open(config_path, 'r', encoding='utf-8') as file:
@@ -147,8 +500,32 @@ class PubgCore():
     def on_click(self, x: int, y: int, button, pressed: bool) -> None:
         """处理鼠标点击事件"""
         if button == mouse.Button.right:
+            self.wake_gated()
+            self.image_recognition.demand_capture()
             self.identify_shoot()
 
+    def identify_region(self, region: str, frame: Optional[np.ndarray] = None, smooth: bool = True) -> str:
+        """识别单个命名区域，返回标签名（frame 为None时自动截图，smooth 为False时返回原始结果）"""
+        region_id = self.catalog.region_ids.get(region)
+        if region_id is None:
+            return 'none'
+        threshold = self.settings.get('recognition', 'threshold', 0.5)
+        with self.perf.timer("match"):
+            label_id, score = self.image_recognition.process_region_id(region_id, self.catalog,
+                                                                       self.template_bank, frame, threshold)
+        label_id, score = self._revalidate_roi(region_id, frame if frame is not None
+                                               else self.image_recognition.frame_cache,
+                                               label_id, score, threshold)
+        if smooth and self.smoother is not None:
+            suspect = self.smoother.is_suspect(region_id, label_id)
+            label_id = self.smoother.observe(region_id, label_id, score)
+            if suspect:
+                ids = self.catalog.new_region_array()
+                ids[region_id] = label_id
+                self._confirm_suspects(ids, [region_id])
+                label_id = int(ids[region_id])
+        return self.catalog.label_name(label_id)
+
     @monitor_results
     def identify_shoot(self) -> None:
         """识别开火状态"""
@@ -156,18 +533,21 @@ class PubgCore():
             return
         
         try:
-            shoot_category, shoot_result = self.image_recognition.process_region(
-                "shoot",
-                self.templates["shoot"],
+            label_id, _ = self.image_recognition.identify_rect(
+                self.catalog,
+                self.catalog.category_ids["shoot"],
                 [
-                    self.shoot_pixel['x'], 
+                    self.shoot_pixel['x'],
                     self.shoot_pixel['y'],
                     26,
                     15
-                ]
+                ],
+                self.template_bank,
+                region_name="shoot"
             )
+            shoot_result = self.catalog.label_name(label_id)
             self.state.right_button_pressed = (shoot_result == 'shoot')
-            self.state.results[shoot_category] = shoot_result
+            self.state.results["shoot"] = shoot_result
         except Exception as e:
             print(f"识别开火状态失败: {e}")
             self.state.right_button_pressed = False
@@ -177,12 +557,16 @@ class PubgCore():
         """持续识别姿势"""
         try:
             while self.state.get_off_on_flag():
-                pose_category, pose_result = self.image_recognition.process_region(
-                    "poses",
-                    self.templates["poses"],
-                    region
-                )
-                self.state.results[pose_category] = pose_result
+                frame = self.image_recognition.capture_raw()
+                # 加载、切屏、黑屏或画面静止时不做匹配，逐步拉长检查间隔
+                if self.pose_gate is not None:
+                    gate_state = self.pose_gate.classify(frame)
+                    if gate_state != ACTIVE:
+                        self.skipped_matches.inc(gate_state)
+                        self.pose_gate.wait(self._gate_backoff(self.pose_gate, 1.0))
+                        continue
+                # 分辨率变化后区域会被重建，每次按名称读取最新区域
+                self.state.results["poses"] = self.identify_region("poses", frame)
                 time.sleep(1)
         except Exception as e:
             self.logger.error(f"姿势识别线程异常: {e}")
@@ -191,6 +575,11 @@ class PubgCore():
 
     def start(self) -> None:
         self.state.set_off_on_flag(True)  # 使用setter方法
+        self._setup_engine()
+        self._setup_results_block()
+        self._setup_state_server()
+        self._setup_metrics_server()
+        self.report_capture_backend()
 
         # 启动鼠标监听
         self.mouse_listener = mouse.Listener(
@@ -216,6 +605,7 @@ class PubgCore():
 
             # 1. 设置停止标志
             self.state.set_off_on_flag(False)
+            self.wake_gated()
             self.logger.info("停止标志已设置")
             self.logger.close_progress(1)
             
@@ -247,6 +637,16 @@ class PubgCore():
             self.logger.close_progress(5)
 
             # 6. 最终清理
+            self._close_engine()
+            self._close_results_block()
+            self._close_state_server()
+            self._close_metrics_server()
+            self.save_result_cache()
+            self.save_smoother_stats()
+            self.save_capture_rate_report()
+            self.save_gate_report()
+            if self.roi_calibration is not None:
+                self.roi_calibration.save()
             self.logger.info("停止过程完成")
             self.logger.close_progress(6)
 
@@ -260,35 +660,399 @@ class PubgCore():
 
     def write_files(self, results: Dict) -> None:
         """将识别结果写入文件"""
+        with self.tracer.span("write_files", frame_seq=self.image_recognition.frame_seq) as span, \
+                self.perf.timer("write"):
+            span.set(output_seq=self._write_files(results))
+
+    def _write_files(self, results: Dict) -> int:
+        """写出结果，返回本次结果序号"""
         temp = self.settings.get_path('temp')
-        # 写入 weapon.lua
-        with open(f"{temp}/weapon.lua", "w", encoding="utf-8") as f:
-            f.write(f'weapon_name = "{results.get("weapons_name_" + self.state.current_weapon, "")}"\n')
-            f.write(f'muzzles = "{results.get("muzzles_" + self.state.current_weapon, "")}"\n')
-            f.write(f'grips = "{results.get("grips_" + self.state.current_weapon, "")}"\n')
-            f.write(f'scopes = "{results.get("scopes_" + self.state.current_weapon, "")}"\n')
-            f.write(f'stocks = "{results.get("stocks_" + self.state.current_weapon, "")}"\n')
-            f.write(f'poses = "{results.get("poses", "")}"\n')
-            f.write(f'scope_zoom = "{results.get("scope_zoom", "1")}"\n')
-            f.write(f'bag = "{results.get("bag", "none")}"\n')
-            f.write(f'car = "{results.get("car", "none")}"\n')
-            f.write(f'shoot = "{results.get("shoot", "none")}"\n')
-
-        # 写入 results.json
-        results_json = {
-            "weapon_name": translate_name(results.get("weapons_name_" + self.state.current_weapon, "")),
-            "muzzles": translate_name(results.get("muzzles_" + self.state.current_weapon, "")),
-            "grips": translate_name(results.get("grips_" + self.state.current_weapon, "")),
-            "scopes": translate_name(results.get("scopes_" + self.state.current_weapon, "")),
-            "stocks": translate_name(results.get("stocks_" + self.state.current_weapon, "")),
-            "poses": translate_name(results.get("poses", "")),
-            "bag": translate_name(results.get("bag", "none")),
-            "car": translate_name(results.get("car", "none")),
-            "shoot": translate_name(results.get("shoot", "none"))
-        }
+        catalog = self.catalog
+        weapon = self.state.current_weapon
+        # (输出字段, 结果键, 默认值)
+        fields = [
+            ("weapon_name", "weapons_name_" + weapon, ""),
+            ("muzzles", "muzzles_" + weapon, ""),
+            ("grips", "grips_" + weapon, ""),
+            ("scopes", "scopes_" + weapon, ""),
+            ("stocks", "stocks_" + weapon, ""),
+            ("poses", "poses", ""),
+            ("scope_zoom", "scope_zoom", "1"),
+            ("bag", "bag", "none"),
+            ("car", "car", "none"),
+            ("shoot", "shoot", "none"),
+        ]
+
+        # 当前配装的压枪曲线（按配装缓存，weapons.json 修改后自动重算）
+        values = {field: results.get(key, default) for field, key, default in fields}
+        try:
+            zoom = float(values["scope_zoom"])
+        except (TypeError, ValueError):
+            zoom = 1.0
+        curve = self.recoil_tables.curve(Loadout(
+            values["weapon_name"], values["muzzles"], values["grips"], values["stocks"],
+            values["scopes"], values["poses"], zoom))
+
+        # 多个线程都会写出结果，序号递增与写文件放在同一把锁内，保证序号与内容一致
+        with self._output_lock:
+            self.output_seq += 1
+            capture_time, write_time = self._output_times()
+            stamps = (("seq", self.output_seq), ("capture_time", capture_time), ("write_time", write_time))
+
+            # 写入 weapon.lua
+            with open(f"{temp}/weapon.lua", "w", encoding="utf-8") as f:
+                f.write("".join(
+                    f'{field} = {catalog.lua_literal(results.get(key, default))}\n'
+                    for field, key, default in fields
+                ))
+                f.write(curve.lua())
+                f.write("".join(f'output_{name} = {value}\n' for name, value in stamps))
+
+            # 写入 results.json
+            results_json = {
+                field: catalog.display_name(results.get(key, default))
+                for field, key, default in fields
+                if field != "scope_zoom"
+            }
+            results_json.update(stamps)
+
+            with open(f"{temp}/results.json", 'w', encoding='utf-8') as f:
+                json.dump(results_json, f, ensure_ascii=False)
+
+            if self.results_block is not None:
+                self.results_block.publish(values, zoom, self.output_seq, capture_time, write_time)
+            if self.state_server is not None:
+                self.state_server.publish(self.output_seq, dict(values, capture_time=capture_time,
+                                                                write_time=write_time))
+
+            # 最后写序号文件：读取方看到新序号时，完整结果已经写完
+            with open(f"{temp}/{self.SEQ_FILE}", 'w', encoding='utf-8') as f:
+                f.write(str(self.output_seq))
+            self.file_writes.inc()
+
+            pressed_at = self._tab_pressed_at
+            if pressed_at is not None and not self.state.is_recognizing:
+                self._tab_pressed_at = None
+                self.perf.record("tab_to_output", time.monotonic() - pressed_at)
+            return self.output_seq
+
+    def perf_snapshot(self) -> Dict:
+        """性能页使用的快照：阶段耗时、截图帧率与耗时、缓存命中率、任务队列与进程资源"""
+        snapshot = self.perf.snapshot()
+        snapshot["queue_depth"] = self.image_recognition.queue_depth
+
+        caches = {}
+        cache = self.image_recognition.result_cache
+        if cache is not None:
+            caches["recognition"] = cache.stats()
+        tables = self.recoil_tables
+        total = tables.hits + tables.misses
+        caches["recoil"] = {"hits": tables.hits, "misses": tables.misses,
+                            "hit_rate": tables.hits / total if total else 0.0}
+        snapshot["caches"] = caches
+        snapshot["memory"] = self.memory.report()
+
+        from ...screen_capture.capture_manager import CaptureManager
+        capture = CaptureManager.get_instance().active_capture()
+        if capture is not None:
+            frame = capture.latest_frame
+            fps = self._frame_rate.update(capture.method, frame.seq) if frame is not None else 0.0
+            snapshot["capture"] = {
+                "method": capture.method,
+                "fps": fps,
+                "target_fps": capture.get_fps(),
+                "latency": latency_summary(tuple(capture.health.latencies)),
+                "health": capture.health.stats(),
+            }
+        return snapshot
+
+    def _setup_metrics(self) -> None:
+        """创建核心使用的指标并注册导出时读取的采集函数"""
+        registry = MetricsRegistry.get_instance()
+        self.file_writes = registry.counter("file_writes_total", "结果写出次数")
+        self.ui_emits = registry.counter("ui_emits_total", "界面更新次数")
+        self.skipped_matches = registry.counter("matches_skipped_total", "未做模板匹配的次数", ("reason",))
+        registry.gauge("queue_depth", "已提交、尚未完成的区域识别任务数",
+                       getter=lambda: self.image_recognition.queue_depth)
+        registry.gauge("output_seq", "最近写出的结果序号", getter=lambda: self.output_seq)
+        registry.gauge("state_clients", "状态订阅客户端数",
+                       getter=lambda: len(self.state_server.stats()) if self.state_server else 0)
+        registry.register_collector("capture", self._collect_capture_metrics)
+        registry.register_collector("process", self._collect_process_metrics)
+        registry.register_collector("memory", self._collect_memory_metrics)
+
+    @staticmethod
+    def _collect_capture_metrics() -> List[MetricFamily]:
+        """按截图后端汇总当前后端与各截图会话的运行状况"""
+        from ...screen_capture.capture_manager import CaptureManager
+        manager = CaptureManager.get_instance()
+        captures = [session.capture for session in manager.sessions()]
+        if manager.active_capture() is not None:
+            captures.append(manager.active_capture())
+
+        attempts = MetricFamily("capture_attempts_total", "counter", "实际截图次数（包括暂无新画面）")
+        failures = MetricFamily("capture_failures_total", "counter", "截图失败次数")
+        frames = MetricFamily("capture_frames_total", "counter", "返回的帧数（fresh 为新截取，cache 为缓存帧）")
+        latency = MetricFamily("capture_latency_seconds", "summary", "成功截图的耗时（秒，分位数取最近样本）")
+        totals: Dict[str, List] = {}
+        for capture in captures:
+            health = capture.health
+            total = totals.setdefault(capture.method, [0, 0, 0, 0.0, 0, [], 0])
+            total[0] += health.attempts
+            total[1] += health.failures
+            total[2] += health.cached
+            total[3] += health.latency_sum
+            total[4] += health.timed
+            total[5].extend(tuple(health.latencies))
+            total[6] += health.idle
+        for backend, (attempt_count, failure_count, cached, latency_sum, timed, samples, idle) in totals.items():
+            labels = {"backend": backend}
+            attempts.add(attempt_count, labels)
+            failures.add(failure_count, labels)
+            frames.add(attempt_count - failure_count - idle, dict(labels, source="fresh"))
+            frames.add(cached, dict(labels, source="cache"))
+            if samples:
+                for q in (0.5, 0.9, 0.99):
+                    latency.add(float(np.quantile(samples, q)) / 1000.0, dict(labels, quantile=str(q)))
+            latency.add(latency_sum, labels, "_sum")
+            latency.add(timed, labels, "_count")
+        return [attempts, failures, frames, latency]
+
+    @staticmethod
+    def _collect_process_metrics() -> List[MetricFamily]:
+        times = os.times()
+        cpu = MetricFamily("process_cpu_seconds_total", "counter", "进程累计 CPU 时间（秒）")
+        cpu.add(times.user + times.system)
+        rss = MetricFamily("process_resident_memory_bytes", "gauge", "进程常驻内存（字节）")
+        rss.add(process_rss())
+        return [cpu, rss]
+
+    @staticmethod
+    def _collect_memory_metrics() -> List[MetricFamily]:
+        family = MetricFamily("memory_bytes", "gauge", "各子系统持有的内存（字节，按底层缓冲区去重）")
+        for name, entry in MemoryLedger.get_instance().report().items():
+            family.add(entry["bytes"], {"subsystem": name})
+        return [family]
+
+    def _setup_metrics_server(self) -> None:
+        """按配置启动本机指标端点"""
+        self._close_metrics_server()
+        config = self.settings.get('metrics', default={}) or {}
+        if not config.get('enabled', False):
+            return
+        server = MetricsServer(MetricsRegistry.get_instance(), config.get('host', '127.0.0.1'),
+                               config.get('port', 47801))
+        try:
+            server.start()
+        except Exception as e:
+            self.logger.error(f"启动指标端点失败: {e}")
+            return
+        self.metrics_server = server
+
+    def _close_metrics_server(self) -> None:
+        server, self.metrics_server = self.metrics_server, None
+        if server is not None:
+            server.stop()
+
+    def _setup_memory(self) -> None:
+        """登记各子系统的内存占用，按配置设置预算并开启 tracemalloc
+
+        先登记的子系统优先计入共享的缓冲区（同一帧被识别与截图同时引用时计入 frames）
+        """
+        config = self.settings.get('memory', default={}) or {}
+        self.memory = MemoryLedger.get_instance()
+        self.memory.register("frames", self._held_frames, self._evict_frames)
+        self.memory.register("templates", lambda: self.template_bank)
+        self.memory.register("caches", self._held_caches, self._evict_caches)
+        self.memory.set_budgets(config.get('budgets_mb', {}) or {})
+        self.memory_check_interval = float(config.get('check_interval', 10.0))
+        self._last_memory_check = time.monotonic()
+        if config.get('tracemalloc', False):
+            self.memory.snapshots.start(config.get('tracemalloc_frames', 1))
+
+    def _held_frames(self) -> list:
+        """识别模块缓存的帧与各截图实现（含截图会话）持有的帧"""
+        from ...screen_capture.capture_manager import CaptureManager
+        manager = CaptureManager.get_instance()
+        held = [self.image_recognition.frame_cache]
+        captures = [session.capture for session in manager.sessions()]
+        if manager.active_capture() is not None:
+            captures.append(manager.active_capture())
+        for capture in captures:
+            held.extend(capture.held_frames())
+        return held
+
+    def _evict_frames(self, budget: int) -> None:
+        """不在识别时丢弃识别模块缓存的帧（截图实现持有的最近一帧用于判断新旧，保留）"""
+        if not self.state.is_recognizing:
+            self.image_recognition.frame_cache = None
 
-        with open(f"{temp}/results.json", 'w', encoding='utf-8') as f:
-            json.dump(results_json, f, ensure_ascii=False)
+    def _held_caches(self) -> int:
+        cache = self.image_recognition.result_cache
+        return cache.nbytes() if cache is not None else 0
+
+    def _evict_caches(self, budget: int) -> None:
+        """识别缓存按预算淘汰最久未使用的条目"""
+        cache = self.image_recognition.result_cache
+        if cache is not None:
+            removed = cache.trim(budget // cache.ENTRY_BYTES)
+            self.logger.info(f"识别缓存淘汰 {removed} 条")
+
+    def memory_report(self, snapshot: bool = False) -> Dict:
+        """
+        内存占用报告
+        Args:
+            snapshot: 是否拍摄 tracemalloc 快照并与上一次快照对比
+        Returns:
+            Dict: {"subsystems": {名称: {"bytes", "budget"}}, "rss": 常驻内存字节数,
+                   "tracemalloc": 已跟踪字节数, "growth": 增长最多的位置}
+        """
+        report = {"subsystems": self.memory.report(), "rss": process_rss()}
+        if snapshot:
+            report["tracemalloc"] = self.memory.snapshots.take()
+            report["growth"] = self.memory.snapshots.diff(
+                self.settings.get('memory', 'tracemalloc_top', 10))
+        return report
+
+    def log_memory_report(self) -> None:
+        """输出内存占用与两次快照之间增长最多的位置到日志"""
+        report = self.memory_report(snapshot=True)
+        lines = [f"常驻内存 {report['rss'] / MB:.1f} MB，"
+                 f"Python 已跟踪 {report['tracemalloc']['current'] / MB:.1f} MB"]
+        for name, entry in report["subsystems"].items():
+            budget = entry["budget"]
+            lines.append(f"  {name}: {entry['bytes'] / MB:.1f} MB"
+                         + (f" / 预算 {budget / MB:.1f} MB" if budget is not None else ""))
+        if report["growth"]:
+            lines.append("与上次快照相比增长最多:")
+            lines.extend(f"  {item['size_diff'] / 1024:+.1f} KB ({item['count_diff']:+d}) {item['location']}"
+                         for item in report["growth"])
+        else:
+            lines.append("已拍摄 tracemalloc 快照，再次拍摄后显示增长")
+        self.logger.info("\n".join(lines))
+
+    def _setup_results_block(self) -> None:
+        """按配置创建共享内存结果块"""
+        self._close_results_block()
+        if not self.settings.get('output', 'shared_memory', False):
+            return
+        try:
+            block = ResultsBlock(self.catalog, self.settings.get('output', 'shm_name', RESULTS_BLOCK_NAME))
+        except Exception as e:
+            self.logger.error(f"创建共享内存结果块失败: {e}")
+            return
+        with self._output_lock:
+            self.results_block = block
+        self.logger.info(f"共享内存结果块已创建: {block.name}")
+
+    def _close_results_block(self) -> None:
+        with self._output_lock:
+            block, self.results_block = self.results_block, None
+        if block is not None:
+            block.close()
+
+    def _setup_state_server(self) -> None:
+        """按配置启动本机状态订阅服务"""
+        self._close_state_server()
+        api = self.settings.get('api', default={}) or {}
+        if not api.get('enabled', False):
+            return
+        server = StateServer(self.handle_api_command, api.get('host', '127.0.0.1'),
+                             api.get('port', 47800), api.get('max_pending', 65536))
+        try:
+            server.start()
+        except Exception as e:
+            self.logger.error(f"启动状态订阅服务失败: {e}")
+            return
+        token_path = self.settings.get_path('temp') / self.API_TOKEN_FILE
+        try:
+            token_path.parent.mkdir(parents=True, exist_ok=True)
+            # 只允许当前用户读写（Windows 上由所在目录的权限决定）
+            fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(server.token)
+        except OSError as e:
+            self.logger.error(f"写入订阅接口令牌失败，控制命令不可用: {e}")
+        self.state_server = server
+
+    def _close_state_server(self) -> None:
+        server, self.state_server = self.state_server, None
+        if server is None:
+            return
+        try:
+            (self.settings.get_path('temp') / self.API_TOKEN_FILE).unlink()
+        except OSError:
+            pass
+        for client in server.stats():
+            self.logger.info(f"订阅客户端 {client['peer']}: 发送 {client['sent']} 条, "
+                             f"丢弃 {client['dropped']} 条, 补发 {client['resyncs']} 次, "
+                             f"缓冲峰值 {client['peak_buffered']} 字节")
+        server.stop()
+
+    def handle_api_command(self, message: Dict) -> Dict:
+        """
+        处理订阅接口的控制命令（在服务的命令线程中依次执行，不占用事件循环）
+            start: 开始一次背包识别（相当于按 Tab 后识别到背包）
+            stop:  结束识别（相当于按 Esc）
+            fps:   设置截图帧率 {"cmd": "fps", "value": 30}
+            memory: 内存占用报告，{"cmd": "memory", "snapshot": true} 同时对比 tracemalloc 快照
+            trace: 导出追踪记录，返回文件路径
+        """
+        command = message.get('cmd')
+        if command == 'start':
+            self.state.is_recognizing = True
+            self.state.bag_open = True
+            self.wake_gated()
+            return {}
+        if command == 'stop':
+            self.close_recognition(None)
+            return {}
+        if command == 'fps':
+            from ...screen_capture.capture_manager import CaptureManager
+            fps = int(message['value'])
+            if fps <= 0:
+                raise ValueError(f"无效帧率: {fps}")
+            CaptureManager.get_instance().set_fps(fps)
+            return {'fps': fps}
+        if command == 'memory':
+            return self.memory_report(bool(message.get('snapshot', False)))
+        if command == 'trace':
+            path = self.dump_trace()
+            if path is None:
+                raise ValueError("追踪未开启（trace.enabled）")
+            return {'path': str(path)}
+        raise ValueError(f"未知命令: {command}")
+
+    def dump_trace(self) -> Optional[Path]:
+        """把追踪记录导出到 logs/trace_时间.json（可在 Perfetto 中打开），未开启追踪时返回None"""
+        if not self.tracer.enabled and not len(self.tracer):
+            self.logger.warning("追踪未开启，请在配置中设置 trace.enabled")
+            return None
+        path = self.settings.get_path('logs') / time.strftime("trace_%Y%m%d_%H%M%S.json")
+        try:
+            count = self.tracer.dump(path)
+        except OSError as e:
+            self.logger.error(f"导出追踪记录失败: {e}")
+            return None
+        self.logger.info(f"已导出 {count} 条追踪记录: {path}")
+        return path
+
+    def _output_times(self) -> Tuple[int, int]:
+        """结果所用画面的截取时刻与当前时刻（Unix 毫秒），没有画面时截取时刻为0"""
+        now = time.time()
+        frame_timestamp = self.image_recognition.frame_timestamp
+        if frame_timestamp is None:
+            return 0, int(now * 1000)
+        capture_time = now - (time.monotonic() - frame_timestamp)
+        return int(capture_time * 1000), int(now * 1000)
+
+    def _load_output_seq(self) -> int:
+        """读取上次运行写出的序号，重启后序号继续递增"""
+        try:
+            with open(self.settings.get_path('temp') / self.SEQ_FILE, 'r', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
 
     def init_pubg(self) -> None:
         """主识别循环"""
@@ -310,10 +1074,27 @@ class PubgCore():
                     self.handle_weapon_change()
                     self.display_results()
 
+            now = time.monotonic()
+            if now - self._last_resolution_check >= self.RESOLUTION_CHECK_INTERVAL:
+                self._last_resolution_check = now
+                self.check_resolution()
+            if now - self._last_cache_save >= self.CACHE_SAVE_INTERVAL:
+                self._last_cache_save = now
+                cache = self.image_recognition.result_cache
+                if cache is not None:
+                    cache.save()
+                if self.roi_calibration is not None:
+                    self.roi_calibration.save()
+            if now - self._last_memory_check >= self.memory_check_interval:
+                self._last_memory_check = now
+                self.memory.check_budgets()
+
             if self.state.is_recognizing:
-                self.logger.info("正在识别中")
-                self.process_recognition()
-                self.logger.info("识别完成")
+                frame = self._recognition_frame()
+                if frame is not None:
+                    self.logger.info("正在识别中")
+                    self.process_recognition(frame)
+                    self.logger.info("识别完成")
 
             if self.state.right_button_pressed:
                 self.logger.info("右键开镜，正在压枪中")
@@ -326,28 +1107,86 @@ class PubgCore():
         self.logger.info("主线程结束，关闭自动识别")
         self.logger.close_progress(6)
 
+    def _recognition_frame(self) -> Optional[np.ndarray]:
+        """截取用于背包识别的画面；无效画面（黑屏、加载）返回None，保持识别状态待下次重试
+
+        退避不在主循环中睡眠（否则等待期间检测不到 1/2 切枪）：只记录下次重试的时刻，
+        在此之前直接返回None，按键或点击唤醒时立即重试
+        """
+        gate = self.recognition_gate
+        if gate is not None and time.monotonic() < self._recognition_retry_at and not gate.woken():
+            return None
+        self.image_recognition.demand_capture()
+        frame = self.image_recognition.capture_raw()
+        if gate is not None and gate.classify(frame) == INVALID:
+            self.skipped_matches.inc(INVALID)
+            self._recognition_retry_at = time.monotonic() + self._gate_backoff(gate, 0.05)
+            return None
+        self._recognition_retry_at = 0.0
+        return frame
+
+    @traced()
     @monitor_results
-    def process_recognition(self) -> None:
-        """处理识别逻辑"""
+    def process_recognition(self, frame: Optional[np.ndarray] = None) -> None:
+        """处理识别逻辑（frame 为None时自动截图）"""
         extends = ['poses', 'bag', 'shoot']
-        self.state.results = self.image_recognition.batch_process_regions(self.regions, self.templates, extends)
+        if frame is None:
+            self.image_recognition.demand_capture()
+        with self.perf.timer("match"):
+            label_ids, scores = self.image_recognition.batch_process_region_ids(
+                self.catalog, self.template_bank, extends, return_scores=True, frame=frame)
+        if self.roi_calibration is not None:
+            frame = self.image_recognition.frame_cache if frame is None else frame
+            threshold = self.settings.get('recognition', 'threshold', 0.5)
+            for region_id in np.flatnonzero(label_ids != UNSET_ID).tolist():
+                label_ids[region_id], scores[region_id] = self._revalidate_roi(
+                    region_id, frame, int(label_ids[region_id]), float(scores[region_id]), threshold)
+        if self.smoother is not None:
+            # 与稳定结果不同的区域先不采信，连拍几帧投票确认
+            suspects = self.smoother.suspects(label_ids)
+            label_ids = self.smoother.observe_all(label_ids, scores)
+            if suspects:
+                self._confirm_suspects(label_ids, suspects)
+        self.state.label_ids = label_ids
+        self.state.results = self.catalog.to_results(self.state.label_ids)
         self.state.current_scope = self.state.results.get('scopes_' + self.state.current_weapon,
                                                           self.state.current_scope)
         self.state.is_recognizing = False
 
+    @traced()
     @monitor_results
     def toggle_recognition(self, event) -> None:
-        """切换识别状态"""
-        time.sleep(0.1)
-        bag_category, bag_result = self.image_recognition.process_region("bag", self.templates["bag"],
-                                                                         self.regions['bag'])
-        self.state.results[bag_category] = bag_result
-        self.state.is_recognizing = (bag_result == 'bag')
+        """切换识别状态
+
+        不再固定等待背包界面渲染：从按键时刻之后截到的帧开始逐帧识别背包区域，
+        按上一次的背包状态等待预期的切换（关闭→打开或打开→关闭），
+        确认切换或超过 recognition.tab_wait_timeout 为止。每次 Tab 都会改变背包状态，
+        逐帧确认由 tab_confirm_frames 负责，不经过结果平滑（否则每次切换都被当作可疑结果）
+        """
+        pressed_at = time.monotonic()
+        was_open = self.state.bag_open
+        if was_open:
+            self.state.is_recognizing = False  # 正在关闭的背包不再识别
+        self.wake_gated()
+        self.image_recognition.demand_capture()
+        bag_result = wait_bag_transition(
+            was_open, self.image_recognition.wait_frame,
+            lambda image: self.identify_region("bag", image, smooth=False),
+            pressed_at, self.settings.get('recognition', 'tab_wait_timeout', 0.3),
+            self.settings.get('recognition', 'tab_confirm_frames', 1))
+        self.state.results["bag"] = bag_result
+        self.state.bag_open = (bag_result == 'bag')
+        self.state.is_recognizing = self.state.bag_open
+        # 识别到背包时，Tab 到输出的耗时在整屏识别结果写出时才记录
+        self._tab_pressed_at = pressed_at
 
     @monitor_results
     def close_recognition(self, event) -> None:
         """关闭识别"""
         self.state.is_recognizing = False
+        self.state.bag_open = False
+        self._tab_pressed_at = None
+        self.wake_gated()
         self.state.results = {}
 
     def handle_weapon_change(self) -> None:
@@ -356,6 +1195,7 @@ class PubgCore():
             self.state.scope_zoom = 1.0
         self.state.results["scope_zoom"] = self.state.scope_zoom
 
+    @traced()
     def display_results(self) -> None:
         """显示识别结果"""
         if not self.logger:
@@ -363,7 +1203,7 @@ class PubgCore():
 
         # 翻译 results 中的所有字段
         translated_results = {
-            key: translate_name(value) if value != "none" else "无"
+            key: self.catalog.display_name(value) if value != "none" else "无"
             for key, value in self.state.results.items()
         }
 
@@ -385,4 +1225,5 @@ class PubgCore():
             "results": translated_results,
             "current_weapon": self.state.current_weapon
         }
-        self.logger.update_ui(payload) 
\ No newline at end of file
+        self.logger.update_ui(payload)
+        self.ui_emits.inc()
\ No newline at end of file
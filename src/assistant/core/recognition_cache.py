@@ -0,0 +1,142 @@
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger_factory import LoggerFactory
+
+
+def crop_key(category_id: int, cropped: np.ndarray) -> int:
+    """区域截图的内容键：类别编号 + 尺寸 + 像素内容的 64 位哈希"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.array(cropped.shape, dtype=np.int32).tobytes())
+    digest.update(np.ascontiguousarray(cropped).data)
+    return int.from_bytes(digest.digest(), "little") ^ (category_id << 56)
+
+
+class RecognitionCache:
+    """跨会话的内容寻址识别缓存
+
+    以 (类别, 区域截图哈希) 为键缓存 (标签编号, 匹配分数)，LRU 淘汰，
+    条目数上限可配置，停止时持久化到磁盘。version 由模板包内容哈希与
+    识别配置共同决定，版本不一致的缓存文件在加载时直接丢弃。
+    """
+    ENTRY_BYTES = 96  # 每个条目（字典项 + 键 + 结果元组）的大致字节数
+
+    def __init__(self, path: Path, version: str, max_entries: int = 8192):
+        """
+        Args:
+            path: 缓存文件路径（.npz）
+            version: 模板与识别配置版本
+            max_entries: 最大条目数
+        """
+        self.logger = LoggerFactory.get_logger()
+        self.path = Path(path)
+        self.version = version
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+        self._lock = Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int) -> Optional[Tuple[int, float]]:
+        """查询缓存，命中时返回 (标签编号, 匹配分数)"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: int, label_id: int, score: float) -> None:
+        """写入缓存，超出上限时淘汰最久未使用的条目"""
+        with self._lock:
+            self._entries[key] = (label_id, score)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def trim(self, max_entries: int) -> int:
+        """淘汰最久未使用的条目直到不超过 max_entries 条，返回淘汰的条目数"""
+        with self._lock:
+            removed = 0
+            while len(self._entries) > max(max_entries, 0):
+                self._entries.popitem(last=False)
+                removed += 1
+            if removed:
+                self._dirty = True
+            return removed
+
+    def stats(self) -> Dict[str, float]:
+        """命中率统计"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+    def nbytes(self) -> int:
+        """缓存条目占用的大致字节数"""
+        return len(self._entries) * self.ENTRY_BYTES
+
+    def load(self) -> bool:
+        """从磁盘加载缓存，版本不一致时忽略"""
+        if not self.path.is_file():
+            return False
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["version"]) != self.version:
+                    self.logger.info("识别缓存版本已变化，丢弃旧缓存")
+                    return False
+                keys, labels, scores = data["keys"], data["labels"], data["scores"]
+            with self._lock:
+                self._entries = OrderedDict(
+                    (int(k), (int(l), float(s)))
+                    for k, l, s in zip(keys.tolist(), labels.tolist(), scores.tolist())
+                )
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._dirty = False
+            self.logger.info(f"识别缓存已加载: {len(self._entries)} 条")
+            return True
+        except Exception as e:
+            self.logger.warning(f"加载识别缓存失败: {e}")
+            return False
+
+    def save(self) -> None:
+        """持久化缓存（先写临时文件再原子替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            items = list(self._entries.items())
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.stem + ".tmp.npz")
+            np.savez(
+                tmp_path,
+                version=np.array(self.version),
+                keys=np.array([k for k, _ in items], dtype=np.uint64),
+                labels=np.array([v[0] for _, v in items], dtype=np.int16),
+                scores=np.array([v[1] for _, v in items], dtype=np.float32),
+            )
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"保存识别缓存失败: {e}")
@@ -0,0 +1,174 @@
+"""
+压枪曲线预计算
+
+weapons.json 的格式（WeaponTab 编辑的就是这些参数）:
+
+    {
+        "M416": {
+            "interval": 86,                               # 相邻两发间隔（毫秒）
+            "bullets": 40,                                # 曲线长度（发）
+            "base": 10.0,                                 # 每发基础下压量（像素）
+            "ballistic": [[10, 0.8], [40, 1.1]],          # 可选：[截止发数, 系数] 分段
+            "muzzles": {"default": 1.0, "补偿器": 0.85},   # 配件/倍镜/姿势系数，未列出的取 default
+            "poses": {"default": 1.0, "蹲": 0.8, "趴": 0.6},
+            "grips": {...}, "stocks": {...}, "scopes": {...}
+        }
+    }
+
+系数参数写成数字时对所有取值生效。最终每发下压量为
+base × 分段系数 × 各配件系数 × 倍镜系数 × 姿势系数 × scope_zoom，
+累计误差后取整，保证整条曲线的总位移不因取整而漂移。
+"""
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ..utils.logger_factory import LoggerFactory
+
+FACTOR_KEYS = ("muzzles", "grips", "stocks", "scopes", "poses")
+
+
+class Loadout(NamedTuple):
+    """决定压枪曲线的全部输入"""
+    weapon: str
+    muzzles: str
+    grips: str
+    stocks: str
+    scopes: str
+    poses: str
+    scope_zoom: float
+
+
+@dataclass(frozen=True)
+class RecoilCurve:
+    """一套配装的压枪曲线"""
+    interval: int  # 相邻两发间隔（毫秒）
+    steps: Tuple[int, ...]  # 每发下压量（像素）
+
+    def lua(self) -> str:
+        """平铺的 Lua 表，宏在开火循环中按下标直接取值"""
+        return (f"recoil_interval = {self.interval}\n"
+                f"recoil_curve = {{{', '.join(map(str, self.steps))}}}\n")
+
+
+EMPTY_CURVE = RecoilCurve(0, ())
+
+
+def quantize(values: List[float]) -> Tuple[int, ...]:
+    """逐发取整并把舍入误差带到下一发"""
+    steps = []
+    carry = 0.0
+    for value in values:
+        carry += value
+        step = int(round(carry))
+        steps.append(step)
+        carry -= step
+    return tuple(steps)
+
+
+class RecoilTables:
+    """按配装缓存的压枪曲线，weapons.json 变化时自动失效
+
+    主循环、姿态线程与鼠标回调都会写出结果，缓存的读写与重新加载在同一把锁内进行。
+    """
+
+    def __init__(self, path: Path, display_name: Optional[Callable[[str], str]] = None,
+                 max_entries: int = 256):
+        """
+        Args:
+            path: weapons.json 路径
+            display_name: 标签名转显示名称（weapons.json 可使用任一种名称）
+            max_entries: 最多缓存的配装数
+        """
+        self.logger = LoggerFactory.get_logger()
+        self.path = Path(path)
+        self.display_name = display_name
+        self.max_entries = max_entries
+        self.weapons: Dict[str, dict] = {}
+        self._stamp = None
+        self._curves: 'OrderedDict[Loadout, RecoilCurve]' = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def reload_if_changed(self) -> bool:
+        """weapons.json 修改时间或大小变化时重新加载并清空缓存"""
+        with self._lock:
+            return self._reload_if_changed()
+
+    def _reload_if_changed(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        self._curves.clear()
+        self.weapons = {}
+        if stamp is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.weapons = json.load(f)
+            except Exception as e:
+                self.logger.error(f"加载武器参数失败: {e}")
+        return True
+
+    def curve(self, loadout: Loadout) -> RecoilCurve:
+        """获取配装的压枪曲线（命中缓存时不重新计算）"""
+        with self._lock:
+            self._reload_if_changed()
+            curve = self._curves.get(loadout)
+            if curve is not None:
+                self.hits += 1
+                self._curves.move_to_end(loadout)
+                return curve
+            self.misses += 1
+            curve = self._compute(loadout)
+            self._curves[loadout] = curve
+            if len(self._curves) > self.max_entries:
+                self._curves.popitem(last=False)
+            return curve
+
+    def _lookup(self, table: dict, name: str):
+        """按标签名或显示名称查找"""
+        if name in table:
+            return table[name]
+        if self.display_name is not None:
+            return table.get(self.display_name(name))
+        return None
+
+    def _factor(self, value, name: str) -> float:
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, dict):
+            factor = self._lookup(value, name) if name else None
+            return float(factor if factor is not None else value.get("default", 1.0))
+        return 1.0
+
+    @staticmethod
+    def _ballistic(segments, index: int) -> float:
+        """第 index 发（从1开始）所在分段的系数"""
+        if not segments:
+            return 1.0
+        for limit, factor in segments:
+            if index <= limit:
+                return float(factor)
+        return float(segments[-1][1])
+
+    def _compute(self, loadout: Loadout) -> RecoilCurve:
+        params = self._lookup(self.weapons, loadout.weapon) if loadout.weapon else None
+        if not isinstance(params, dict):
+            return EMPTY_CURVE
+        scale = float(params.get("base", 0.0)) * float(loadout.scope_zoom)
+        for key in FACTOR_KEYS:
+            scale *= self._factor(params.get(key), getattr(loadout, key))
+        bullets = int(params.get("bullets", 0))
+        segments = params.get("ballistic") or []
+        values = [scale * self._ballistic(segments, i) for i in range(1, bullets + 1)]
+        return RecoilCurve(int(params.get("interval", 0)), quantize(values))
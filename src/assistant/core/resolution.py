@@ -0,0 +1,169 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .template_pack import source_fingerprint
+from ..utils.constants import TEMPLATE_CATEGORIES
+from ..utils.logger_factory import LoggerFactory
+
+GENERATED_MARKER = "generated.json"
+
+
+def resolution_name(width: int, height: int) -> str:
+    """分辨率目录名，例如 2560x1440 -> 25601440"""
+    return f"{width}{height}"
+
+
+def config_resolution(config: Dict, default: Tuple[int, int]) -> Tuple[int, int]:
+    """获取区域配置所对应的分辨率"""
+    reference = config.get("reference") or {}
+    return int(reference.get("width", default[0])), int(reference.get("height", default[1]))
+
+
+def normalize_regions(regions: Dict[str, List[int]], width: int, height: int) -> Dict[str, List[float]]:
+    """将绝对像素区域转换为归一化坐标 [x, y, w, h]（0~1）"""
+    return {
+        name: [round(x / width, 6), round(y / height, 6), round(w / width, 6), round(h / height, 6)]
+        for name, (x, y, w, h) in regions.items()
+    }
+
+
+def denormalize_regions(regions: Dict[str, List[float]], width: int, height: int) -> Dict[str, List[int]]:
+    """将归一化区域转换为指定分辨率下的像素区域"""
+    return {
+        name: [int(round(x * width)), int(round(y * height)),
+               max(1, int(round(w * width))), max(1, int(round(h * height)))]
+        for name, (x, y, w, h) in regions.items()
+    }
+
+
+def compile_regions(config: Dict, width: int, height: int) -> Tuple[Dict[str, List[int]], Dict[str, int]]:
+    """根据区域配置生成当前分辨率下的像素区域与开火检测像素
+
+    config.json 中 "normalized": true 时 regions/shoot_pixel 为归一化坐标，
+    否则为 "reference" 分辨率（缺省即当前分辨率）下的像素坐标，按比例换算。
+
+    Returns:
+        Tuple[Dict, Dict]: (区域 {名称: [x, y, w, h]}, 开火像素 {'x': x, 'y': y})
+    """
+    shoot = config.get("shoot_pixel", {"x": 0, "y": 0})
+    if config.get("normalized"):
+        regions = denormalize_regions(config["regions"], width, height)
+        return regions, {"x": int(round(shoot["x"] * width)), "y": int(round(shoot["y"] * height))}
+
+    ref_w, ref_h = config_resolution(config, (width, height))
+    if (ref_w, ref_h) == (width, height):
+        return dict(config["regions"]), dict(shoot)
+    regions = denormalize_regions(normalize_regions(config["regions"], ref_w, ref_h), width, height)
+    return regions, {"x": int(round(shoot["x"] * width / ref_w)), "y": int(round(shoot["y"] * height / ref_h))}
+
+
+def find_reference_set(templates_root: Path, width: int, height: int) -> Optional[Path]:
+    """选择用于缩放的参考模板集
+
+    优先同宽高比、其次分辨率不低于目标（缩小比放大保真）、最后高度最接近。
+    """
+    candidates = []
+    for folder in Path(templates_root).iterdir():
+        config_path = folder / "config.json"
+        if not config_path.is_file() or (folder / GENERATED_MARKER).is_file():
+            continue
+        with open(config_path, "r", encoding="utf-8") as f:
+            ref_w, ref_h = config_resolution(json.load(f), _parse_name(folder.name))
+        if not ref_w or not ref_h:
+            continue
+        aspect_diff = abs(ref_w / ref_h - width / height)
+        candidates.append((round(aspect_diff, 3), ref_h < height, abs(ref_h - height), folder))
+    return min(candidates)[3] if candidates else None
+
+
+def _parse_name(name: str) -> Tuple[int, int]:
+    """从目录名解析分辨率，无法解析时返回 (0, 0)"""
+    for split in (4, 3):
+        width, height = name[:split], name[split:]
+        if width.isdigit() and height.isdigit() and 3 <= len(height) <= 4:
+            if 1.0 <= int(width) / int(height) <= 4.0:
+                return int(width), int(height)
+    return 0, 0
+
+
+def generate_template_set(source_dir: Path, target_dir: Path, width: int, height: int) -> Path:
+    """从参考模板集生成目标分辨率的模板集
+
+    HUD 按屏幕高度等比缩放，模板统一使用 height / 参考高度 的比例；
+    区域写为归一化坐标，由 compile_regions 按实际分辨率换算。
+    """
+    source_dir, target_dir = Path(source_dir), Path(target_dir)
+    with open(source_dir / "config.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+    ref_w, ref_h = config_resolution(config, _parse_name(source_dir.name))
+    scale = height / ref_h
+
+    if target_dir.exists():
+        shutil.rmtree(target_dir)
+    for category in TEMPLATE_CATEGORIES:
+        out_dir = target_dir / "weapon_templates" / category
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for png in (source_dir / "weapon_templates" / category).glob("*.png"):
+            image = cv2.imdecode(np.fromfile(str(png), dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                continue
+            size = (max(1, int(round(image.shape[1] * scale))), max(1, int(round(image.shape[0] * scale))))
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+            ok, encoded = cv2.imencode(".png", cv2.resize(image, size, interpolation=interpolation))
+            if ok:
+                encoded.tofile(str(out_dir / png.name))
+
+    if config.get("normalized"):
+        regions, shoot = config["regions"], config["shoot_pixel"]
+    else:
+        regions = normalize_regions(config["regions"], ref_w, ref_h)
+        shoot = {"x": round(config["shoot_pixel"]["x"] / ref_w, 6),
+                 "y": round(config["shoot_pixel"]["y"] / ref_h, 6)}
+    generated_config = dict(config, normalized=True, regions=regions, shoot_pixel=shoot,
+                            reference={"width": width, "height": height})
+    with open(target_dir / "config.json", "w", encoding="utf-8") as f:
+        json.dump(generated_config, f, ensure_ascii=False, indent=4)
+
+    with open(target_dir / GENERATED_MARKER, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": source_dir.name,
+            "scale": scale,
+            "source_fingerprint": source_fingerprint(source_dir),
+        }, f, ensure_ascii=False, indent=4)
+    return target_dir
+
+
+def resolve_template_dir(templates_root: Path, cache_root: Path, width: int, height: int) -> Path:
+    """获取指定分辨率的模板目录
+
+    存在手工制作的目录时直接使用；否则从参考模板集缩放生成并缓存到 cache_root，
+    参考模板集变化后自动重新生成。
+
+    Raises:
+        FileNotFoundError: 没有任何可用的参考模板集
+    """
+    logger = LoggerFactory.get_logger()
+    name = resolution_name(width, height)
+    exact = Path(templates_root) / name
+    if (exact / "config.json").is_file():
+        return exact
+
+    target = Path(cache_root) / name
+    marker_path = target / GENERATED_MARKER
+    if marker_path.is_file():
+        with open(marker_path, "r", encoding="utf-8") as f:
+            marker = json.load(f)
+        source = Path(templates_root) / marker.get("source", "")
+        if source.is_dir() and source_fingerprint(source) == marker.get("source_fingerprint"):
+            return target
+
+    source = find_reference_set(templates_root, width, height)
+    if source is None:
+        raise FileNotFoundError(f"没有可用于 {width}x{height} 的参考模板: {templates_root}")
+    logger.info(f"从 {source.name} 生成 {width}x{height} 模板集")
+    return generate_template_set(source, target, width, height)
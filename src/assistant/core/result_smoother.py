@@ -0,0 +1,102 @@
+from collections import deque
+from threading import Lock
+from typing import Dict, List
+
+import numpy as np
+
+from ..utils.label_catalog import NONE_ID, UNSET_ID
+
+
+class ResultSmoother:
+    """识别结果的时间滞回与多帧投票
+
+    每个区域保留最近 window 次原始结果，稳定结果只有在以下情况才切换：
+    新标签在最近 window 次中出现至少 votes 次，或新标签的匹配分数
+    比旧标签最近一次分数高出 margin。none 的分数是低于阈值的最高分，
+    与标签的匹配分数不可比，切换到或切换出 none 只按票数。
+    同时统计原始结果与稳定结果的翻转次数。
+    """
+
+    def __init__(self, region_count: int, window: int = 5, votes: int = 3, margin: float = 0.15):
+        """
+        Args:
+            region_count: 区域数量
+            window: 投票窗口大小 M
+            votes: 切换所需票数 N
+            margin: 直接切换所需的分数优势
+        """
+        self.window = max(1, window)
+        self.votes = max(1, min(votes, self.window))
+        self.margin = margin
+        self._lock = Lock()
+        self.resize(region_count)
+
+    @property
+    def confirm_frames(self) -> int:
+        """发现变化的那一帧之后，还需多少帧一致的结果才能按票数确认切换"""
+        return self.votes - 1
+
+    def resize(self, region_count: int) -> None:
+        """区域表变化后重置全部状态"""
+        with self._lock:
+            self.history: List[deque] = [deque(maxlen=self.window) for _ in range(region_count)]
+            self.stable = np.full(region_count, UNSET_ID, dtype=np.int16)
+            self.stable_scores = np.zeros(region_count, dtype=np.float32)
+            self.last_raw = np.full(region_count, UNSET_ID, dtype=np.int16)
+            self.raw_flips = np.zeros(region_count, dtype=np.int64)
+            self.stable_flips = np.zeros(region_count, dtype=np.int64)
+
+    def is_suspect(self, region_id: int, label_id: int) -> bool:
+        """原始结果与稳定结果不同，需要更多帧确认"""
+        return label_id != UNSET_ID and self.stable[region_id] != UNSET_ID and label_id != self.stable[region_id]
+
+    def suspects(self, label_ids: np.ndarray) -> List[int]:
+        """找出原始结果与稳定结果不同的区域"""
+        mask = (label_ids != UNSET_ID) & (self.stable != UNSET_ID) & (label_ids != self.stable)
+        return np.flatnonzero(mask).tolist()
+
+    def observe(self, region_id: int, label_id: int, score: float) -> int:
+        """
+        记录一次原始结果并返回该区域的稳定结果
+        Args:
+            region_id: 区域编号
+            label_id: 原始标签编号
+            score: 匹配分数
+        Returns:
+            int: 稳定标签编号
+        """
+        if label_id == UNSET_ID:
+            return int(self.stable[region_id])
+        with self._lock:
+            if self.last_raw[region_id] != UNSET_ID and self.last_raw[region_id] != label_id:
+                self.raw_flips[region_id] += 1
+            self.last_raw[region_id] = label_id
+
+            history = self.history[region_id]
+            history.append(label_id)
+            current = self.stable[region_id]
+            if label_id == current:
+                self.stable_scores[region_id] = score
+            elif (current == UNSET_ID
+                  or sum(1 for x in history if x == label_id) >= self.votes
+                  or (label_id != NONE_ID and current != NONE_ID
+                      and score >= self.stable_scores[region_id] + self.margin)):
+                if current != UNSET_ID:
+                    self.stable_flips[region_id] += 1
+                self.stable[region_id] = label_id
+                self.stable_scores[region_id] = score
+            return int(self.stable[region_id])
+
+    def observe_all(self, label_ids: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """记录一帧全部区域的原始结果，返回稳定结果数组（未处理的区域保持 UNSET_ID）"""
+        result = np.full(len(label_ids), UNSET_ID, dtype=np.int16)
+        for region_id in np.flatnonzero(label_ids != UNSET_ID).tolist():
+            result[region_id] = self.observe(region_id, int(label_ids[region_id]), float(scores[region_id]))
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """翻转次数统计"""
+        return {
+            "raw_flips": int(self.raw_flips.sum()),
+            "stable_flips": int(self.stable_flips.sum()),
+        }
@@ -0,0 +1,186 @@
+"""
+共享内存结果块
+
+PubgCore 每次写出结果时同时发布到一块固定布局的命名共享内存，外部进程
+（悬浮窗、OBS 插件、调试工具）无需读文件即可在微秒级拿到一致的快照。
+
+布局（小端）:
+
+    偏移  类型           字段
+    0     char[4]        魔数 b"LGAR"
+    4     uint16         版本
+    6     uint16         字段数
+    8     uint32         标签表校验值（zlib.crc32，读取方据此确认编号含义一致）
+    12    4 字节填充
+    16    uint64         seqlock 计数：奇数表示正在写入
+    24    uint64         结果序号（与 weapon.lua 的 output_seq 相同）
+    32    int64          画面截取时刻（Unix 毫秒）
+    40    int64          写出时刻（Unix 毫秒）
+    48    float64        scope_zoom
+    56    int32[字段数]  各字段的标签编号，顺序见 FIELDS，-1 表示未识别
+
+写入方先把计数加一（变为奇数）、写数据、再加一（变回偶数）；读取方读计数、
+复制数据、再读计数，两次相同且为偶数时数据一致，否则重试。
+"""
+import mmap
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+from ..utils.label_catalog import LabelCatalog, UNSET_ID
+
+MAGIC = b"LGAR"
+VERSION = 1
+FIELDS = ("weapon_name", "muzzles", "grips", "scopes", "stocks", "poses", "bag", "car", "shoot")
+DEFAULT_NAME = "LogitechAssistantResults"
+
+HEADER = struct.Struct("<4sHHI4x")
+SEQ = struct.Struct("<Q")
+BODY = struct.Struct(f"<Qqqd{len(FIELDS)}i")
+SEQ_OFFSET = HEADER.size
+BODY_OFFSET = SEQ_OFFSET + SEQ.size
+BLOCK_SIZE = BODY_OFFSET + BODY.size
+
+
+def labels_crc(catalog: LabelCatalog) -> int:
+    """标签表校验值"""
+    return zlib.crc32("\n".join(catalog.labels).encode("utf-8"))
+
+
+@dataclass(frozen=True)
+class ResultsSnapshot:
+    """一份一致的结果快照"""
+    seq: int
+    capture_time: int
+    write_time: int
+    scope_zoom: float
+    label_ids: Dict[str, int]
+
+    def names(self, catalog: Optional[LabelCatalog] = None) -> Dict[str, str]:
+        """把标签编号还原为标签名（未识别为空字符串）"""
+        catalog = catalog or LabelCatalog()
+        return {field: "" if label_id == UNSET_ID else catalog.label_name(label_id)
+                for field, label_id in self.label_ids.items()}
+
+
+class ResultsBlock:
+    """结果块写入方（由 PubgCore 持有）"""
+
+    def __init__(self, catalog: LabelCatalog, name: str = DEFAULT_NAME):
+        self.catalog = catalog
+        self.name = name
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=BLOCK_SIZE)
+        except FileExistsError:
+            # 上次异常退出留下的同名块，尺寸足够时直接复用
+            self._shm = shared_memory.SharedMemory(name=name)
+            if self._shm.size < BLOCK_SIZE:
+                self._shm.close()
+                raise
+        self._buf = self._shm.buf
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, len(FIELDS), labels_crc(catalog))
+        self._seq = SEQ.unpack_from(self._buf, SEQ_OFFSET)[0] & ~1
+
+    def publish(self, values: Dict[str, str], scope_zoom: float, output_seq: int,
+                capture_time: int, write_time: int) -> None:
+        """
+        发布一份结果（调用方保证单一写入线程，PubgCore 在输出锁内调用）
+        Args:
+            values: {字段: 标签名}，空字符串表示未识别
+        """
+        ids = [UNSET_ID if not values.get(field) else self.catalog.label_id(values[field])
+               for field in FIELDS]
+        self._seq += 1
+        SEQ.pack_into(self._buf, SEQ_OFFSET, self._seq)
+        BODY.pack_into(self._buf, BODY_OFFSET, output_seq, capture_time, write_time, scope_zoom, *ids)
+        self._seq += 1
+        SEQ.pack_into(self._buf, SEQ_OFFSET, self._seq)
+
+    def close(self) -> None:
+        """关闭并删除共享内存（Windows 在最后一个句柄关闭时自动释放）"""
+        if self._shm is None:
+            return
+        self._buf = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+
+def _open_mapping(name: str) -> mmap.mmap:
+    """只读映射命名共享内存（不经过 resource_tracker，读取方退出时不会删除共享内存）"""
+    if os.name == "nt":
+        return mmap.mmap(-1, BLOCK_SIZE, tagname=name, access=mmap.ACCESS_READ)
+    fd = os.open(os.path.join("/dev/shm", name.lstrip("/")), os.O_RDONLY)
+    try:
+        return mmap.mmap(fd, BLOCK_SIZE, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+class ResultsReader:
+    """结果块读取库
+
+    用法:
+        reader = ResultsReader()
+        snapshot = reader.snapshot()
+        if snapshot is not None:
+            print(snapshot.seq, snapshot.names(reader.catalog))
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, catalog: Optional[LabelCatalog] = None):
+        """
+        Raises:
+            FileNotFoundError: 共享内存尚未创建（核心未启动）
+            ValueError: 布局与当前版本不一致（Windows 上共享内存尚未创建时也会得到空白块）
+        """
+        self._map = _open_mapping(name)
+        magic, version, field_count, crc = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or field_count != len(FIELDS):
+            self._map.close()
+            raise ValueError(f"结果块 {name} 布局不匹配: {magic!r} v{version}")
+        self.catalog = catalog or LabelCatalog()
+        self.labels_match = crc == labels_crc(self.catalog)
+
+    def snapshot(self, retries: int = 1000) -> Optional[ResultsSnapshot]:
+        """读取一致的快照；尚未发布过结果或重试次数用尽时返回None"""
+        for _ in range(retries):
+            before = SEQ.unpack_from(self._map, SEQ_OFFSET)[0]
+            if before & 1:
+                continue
+            body = BODY.unpack_from(self._map, BODY_OFFSET)
+            if SEQ.unpack_from(self._map, SEQ_OFFSET)[0] != before:
+                continue
+            if before == 0:
+                return None
+            output_seq, capture_time, write_time, scope_zoom, *ids = body
+            return ResultsSnapshot(output_seq, capture_time, write_time, scope_zoom,
+                                   dict(zip(FIELDS, ids)))
+        return None
+
+    def wait_change(self, last_seq: int, timeout: float = 1.0,
+                    poll_interval: float = 0.001) -> Optional[ResultsSnapshot]:
+        """等待结果序号大于 last_seq 的快照，超时返回None"""
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self.snapshot()
+            if snapshot is not None and snapshot.seq > last_seq:
+                return snapshot
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'ResultsReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
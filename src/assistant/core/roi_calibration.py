@@ -0,0 +1,195 @@
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from .image_recognition import CategoryTemplates, convert_channels
+from ..utils.label_catalog import LabelCatalog
+from ..utils.logger_factory import LoggerFactory
+
+
+@dataclass
+class CalibratedRoi:
+    """单个区域的校准结果"""
+    rect: List[int]  # 紧凑区域 [x, y, w, h]
+    scale: float  # 界面缩放（屏幕尺寸 / 模板尺寸）
+    score: float  # 校准时的匹配分数
+    wide: List[int]  # 校准时使用的配置区域，配置变化后校准失效
+
+
+def search_roi(
+    frame: np.ndarray,
+    rect: Sequence[int],
+    bank: CategoryTemplates,
+    scales: Sequence[float],
+    pad: int = 0,
+    margin: int = 2
+) -> Optional[CalibratedRoi]:
+    """
+    在宽窗口内做多尺度模板匹配，找到界面元素的真实位置与缩放
+    Args:
+        frame: 原始帧（BGRA/BGR）
+        rect: 配置区域 [x, y, w, h]
+        bank: 该区域所属类别的模板
+        scales: 候选缩放
+        pad: 在配置区域外额外扩展的搜索范围（像素）
+        margin: 紧凑区域四周保留的容差（像素）
+    Returns:
+        Optional[CalibratedRoi]: 最佳匹配对应的紧凑区域，没有可用模板时返回None
+    """
+    if frame is None or not bank.templates:
+        return None
+    frame_h, frame_w = frame.shape[:2]
+    x, y, w, h = (int(v) for v in rect)
+    x0, y0 = max(0, x - pad), max(0, y - pad)
+    x1, y1 = min(frame_w, x + w + pad), min(frame_h, y + h + pad)
+    window = convert_channels(frame[y0:y1, x0:x1], bank.mode)
+    if window.size == 0:
+        return None
+
+    # 同一类别的模板可能尺寸不同，紧凑区域按最大模板尺寸留足空间
+    max_h = max(t.shape[0] for t in bank.templates)
+    max_w = max(t.shape[1] for t in bank.templates)
+
+    best_score, best_loc, best_scale = -1.0, None, 1.0
+    for scale in scales:
+        # 缩放窗口而不是模板，模板库保持不变
+        scaled = window if scale == 1.0 else cv2.resize(
+            window, None, fx=1.0 / scale, fy=1.0 / scale, interpolation=cv2.INTER_AREA)
+        for template in bank.templates:
+            if template.shape[0] > scaled.shape[0] or template.shape[1] > scaled.shape[1]:
+                continue
+            _, val, _, loc = cv2.minMaxLoc(cv2.matchTemplate(scaled, template, cv2.TM_CCOEFF_NORMED))
+            if val > best_score:
+                best_score, best_loc, best_scale = float(val), loc, float(scale)
+    if best_loc is None:
+        return None
+
+    left = max(0, x0 + int(round(best_loc[0] * best_scale)) - margin)
+    top = max(0, y0 + int(round(best_loc[1] * best_scale)) - margin)
+    right = min(frame_w, left + int(np.ceil(max_w * best_scale)) + 2 * margin)
+    bottom = min(frame_h, top + int(np.ceil(max_h * best_scale)) + 2 * margin)
+    return CalibratedRoi([left, top, right - left, bottom - top], best_scale, best_score, [x, y, w, h])
+
+
+class RoiCalibration:
+    """按分辨率持久化的区域校准表
+
+    首次识别到某区域时在宽窗口内做一次多尺度搜索，记录紧凑区域与缩放并写回
+    标签目录；之后识别只在紧凑区域内匹配。紧凑区域分数低于 min_score 时
+    由调用方回退到宽窗口重新搜索。
+    """
+
+    def __init__(self, path: Path, scales: Sequence[float] = (1.0,), pad: int = 0,
+                 margin: int = 2, min_score: float = 0.8):
+        """
+        Args:
+            path: 校准文件路径（.json）
+            scales: 候选缩放
+            pad: 在配置区域外额外扩展的搜索范围（像素）
+            margin: 紧凑区域四周保留的容差（像素）
+            min_score: 紧凑区域可信的最低分数
+        """
+        self.logger = LoggerFactory.get_logger()
+        self.path = Path(path)
+        self.scales = sorted(set(float(s) for s in scales)) or [1.0]
+        self.pad = pad
+        self.margin = margin
+        self.min_score = min_score
+        self.entries: Dict[str, CalibratedRoi] = {}
+        self._lock = Lock()
+        self._dirty = False
+        self.calibrations = 0
+        self.fallbacks = 0
+
+    def calibrate(self, catalog: LabelCatalog, region_id: int, frame: np.ndarray,
+                  template_bank: List[CategoryTemplates], threshold: float) -> Optional[CalibratedRoi]:
+        """
+        对单个区域做宽窗口多尺度搜索，分数达到 threshold 时写入校准表并应用到标签目录
+        Returns:
+            Optional[CalibratedRoi]: 新的校准结果，未找到界面元素时返回None
+        """
+        bank = template_bank[int(catalog.region_categories[region_id])]
+        roi = search_roi(frame, catalog.wide_rects[region_id].tolist(), bank, self.scales,
+                         self.pad, self.margin)
+        if roi is None or roi.score < threshold:
+            return None
+        name = catalog.regions[region_id]
+        with self._lock:
+            self.entries[name] = roi
+            self._dirty = True
+            self.calibrations += 1
+        catalog.apply_roi(region_id, roi.rect, roi.scale)
+        self.logger.info(f"区域校准 {name}: {roi.rect} 缩放 {roi.scale:.2f} 分数 {roi.score:.2f}")
+        return roi
+
+    def invalidate(self, catalog: LabelCatalog, region_id: int) -> None:
+        """紧凑区域不再可信，恢复宽窗口"""
+        with self._lock:
+            if self.entries.pop(catalog.regions[region_id], None) is not None:
+                self._dirty = True
+            self.fallbacks += 1
+        catalog.reset_roi(region_id)
+
+    def apply(self, catalog: LabelCatalog) -> int:
+        """把已保存的校准结果应用到标签目录，配置区域已变化的条目丢弃
+
+        Returns:
+            int: 应用的区域数
+        """
+        applied = 0
+        with self._lock:
+            for name, roi in list(self.entries.items()):
+                region_id = catalog.region_ids.get(name)
+                if region_id is None or catalog.wide_rects[region_id].tolist() != roi.wide:
+                    del self.entries[name]
+                    self._dirty = True
+                    continue
+                catalog.apply_roi(region_id, roi.rect, roi.scale)
+                applied += 1
+        return applied
+
+    def stats(self) -> Dict[str, int]:
+        """校准统计"""
+        return {
+            "entries": len(self.entries),
+            "calibrations": self.calibrations,
+            "fallbacks": self.fallbacks,
+        }
+
+    def load(self) -> bool:
+        """从磁盘加载校准表"""
+        if not self.path.is_file():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                self.entries = {name: CalibratedRoi(**item) for name, item in data.items()}
+                self._dirty = False
+            self.logger.info(f"区域校准已加载: {len(self.entries)} 个区域")
+            return True
+        except Exception as e:
+            self.logger.warning(f"加载区域校准失败: {e}")
+            return False
+
+    def save(self) -> None:
+        """持久化校准表（先写临时文件再原子替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {name: asdict(roi) for name, roi in self.entries.items()}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"保存区域校准失败: {e}")
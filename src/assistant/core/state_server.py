@@ -0,0 +1,242 @@
+"""
+本机识别状态订阅接口
+
+核心在 127.0.0.1 上提供一个 TCP 端口，协议为逐行 JSON:
+
+    请求                                     响应
+    {"cmd": "get"}                           {"type": "state", "seq": 12, "state": {...}}
+    {"cmd": "subscribe"}                     先回一条 state，之后每次结果变化推送
+                                             {"type": "delta", "seq": 13, "changes": {...}}
+    {"cmd": "unsubscribe"}                   {"type": "result", "cmd": "unsubscribe", "ok": true}
+    {"cmd": "stats"}                         {"type": "result", "cmd": "stats", "ok": true, "clients": [...]}
+    其他命令（如 start/stop/fps）交给核心处理 {"type": "result", "cmd": ..., "ok": true/false, ...}
+
+控制命令（get/subscribe/unsubscribe/stats 以外的命令）必须带 "token" 字段，
+其值与服务的 token 一致（核心启动服务时写入 temp/api.token，只有本机用户可读）。
+收到无法解析的行时回复错误并断开连接：浏览器页面可以向本机端口发送 HTTP 请求，
+请求行不是 JSON，连接在读到请求体之前就已断开，请求体不会被当作命令执行。
+
+服务运行在独立线程的 asyncio 事件循环中，发布只是把消息投递到事件循环，
+永远不会阻塞识别线程。控制命令在单独的命令线程中按收到的顺序执行，
+处理函数可以做写文件等阻塞操作，执行期间其他客户端照常收发。每个客户端的发送缓冲超过 max_pending 字节时不再写入，
+该客户端被标记为落后并丢弃之后的增量，缓冲排空后补发一次完整状态。
+"""
+import asyncio
+import hmac
+import json
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logger_factory import LoggerFactory
+
+RESYNC_INTERVAL = 0.2  # 检查落后客户端能否补发完整状态的间隔（秒）
+READ_COMMANDS = ("get", "subscribe", "unsubscribe", "stats")  # 不需要 token 的只读命令
+
+
+@dataclass
+class ClientStats:
+    """单个客户端的发送统计"""
+    peer: str
+    subscribed: bool = False
+    lagging: bool = False
+    sent: int = 0  # 已写入的消息数
+    dropped: int = 0  # 因缓冲已满而丢弃的增量数
+    resyncs: int = 0  # 落后后补发完整状态的次数
+    buffered: int = 0  # 当前发送缓冲字节数
+    peak_buffered: int = 0  # 发送缓冲峰值
+
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        peer = writer.get_extra_info("peername")
+        self.stats = ClientStats(f"{peer[0]}:{peer[1]}" if peer else "?")
+
+    def buffered(self) -> int:
+        transport = self.writer.transport
+        return transport.get_write_buffer_size() if transport is not None else 0
+
+
+class StateServer:
+    """识别状态订阅服务"""
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 host: str = "127.0.0.1", port: int = 0, max_pending: int = 65536,
+                 token: Optional[str] = None):
+        """
+        Args:
+            handler: 处理控制命令（在命令线程中调用），返回附加到响应中的字段，出错时抛出异常
+            host: 监听地址（只应使用本机地址）
+            port: 端口，0 表示由系统分配
+            max_pending: 单个客户端允许积压的发送字节数
+            token: 控制命令所需的令牌，None 时随机生成
+        """
+        self.logger = LoggerFactory.get_logger()
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.token = token or secrets.token_hex(16)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None  # 执行控制命令
+        self._ready = threading.Event()
+        self._clients: List[_Client] = []
+        self._seq = 0
+        self._state: Dict[str, Any] = {}
+
+    def start(self) -> int:
+        """在后台线程中启动服务，返回实际监听的端口"""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="StateServer")
+        self._thread.start()
+        self._ready.wait(5.0)
+        if self._server is None:
+            raise RuntimeError(f"状态订阅服务启动失败: {self.host}:{self.port}")
+        self.logger.info(f"状态订阅服务已启动: {self.host}:{self.port}")
+        return self.port
+
+    def _run(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="StateServerCommand")
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._on_client, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.logger.error(f"状态订阅服务监听失败: {e}")
+            self._ready.set()
+            self._loop.close()
+            self._executor.shutdown(wait=False)
+            return
+        self._ready.set()
+        self._loop.call_later(RESYNC_INTERVAL, self._resync_tick)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+            self._executor.shutdown(wait=False)
+
+    def stop(self) -> None:
+        """停止服务并断开所有客户端"""
+        if self._loop is None or self._thread is None:
+            return
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5.0)
+        self._thread = None
+        self.logger.info("状态订阅服务已停止")
+
+    def publish(self, seq: int, state: Dict[str, Any]) -> None:
+        """发布新的完整状态（任意线程调用，只投递到事件循环，不等待发送）"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        loop.call_soon_threadsafe(self._broadcast, seq, dict(state))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """各客户端的发送统计"""
+        clients = list(self._clients)
+        for client in clients:
+            client.stats.buffered = client.buffered()
+        return [asdict(client.stats) for client in clients]
+
+    # 以下方法只在事件循环线程中执行
+
+    def _state_message(self) -> Dict[str, Any]:
+        return {"type": "state", "seq": self._seq, "state": self._state}
+
+    def _send(self, client: _Client, message: Dict[str, Any]) -> bool:
+        """写入一条消息；发送缓冲将超过上限时不写入并返回False"""
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        buffered = client.buffered()
+        if buffered + len(data) > self.max_pending:
+            return False
+        client.writer.write(data)
+        client.stats.sent += 1
+        client.stats.peak_buffered = max(client.stats.peak_buffered, buffered + len(data))
+        return True
+
+    def _broadcast(self, seq: int, state: Dict[str, Any]) -> None:
+        changes = {key: value for key, value in state.items() if self._state.get(key) != value}
+        self._seq, self._state = seq, state
+        message = {"type": "delta", "seq": seq, "changes": changes}
+        for client in self._clients:
+            if not client.stats.subscribed:
+                continue
+            if client.stats.lagging:
+                self._resync(client)
+            elif not self._send(client, message):
+                client.stats.lagging = True
+                client.stats.dropped += 1
+
+    def _resync(self, client: _Client) -> None:
+        """落后的客户端缓冲排空后补发完整状态，否则继续丢弃"""
+        if self._send(client, self._state_message()):
+            client.stats.lagging = False
+            client.stats.resyncs += 1
+        else:
+            client.stats.dropped += 1
+
+    def _resync_tick(self) -> None:
+        for client in self._clients:
+            if client.stats.lagging and client.buffered() == 0:
+                self._resync(client)
+        self._loop.call_later(RESYNC_INTERVAL, self._resync_tick)
+
+    async def _dispatch(self, client: _Client, message: Dict[str, Any]) -> Dict[str, Any]:
+        command = message.get("cmd")
+        if command == "get":
+            return self._state_message()
+        if command == "subscribe":
+            client.stats.subscribed = True
+            client.stats.lagging = False
+            return self._state_message()
+        result: Dict[str, Any] = {"type": "result", "cmd": command, "ok": True}
+        if command == "unsubscribe":
+            client.stats.subscribed = False
+        elif command == "stats":
+            result["clients"] = self.stats()
+        elif not hmac.compare_digest(str(message.get("token", "")), self.token):
+            result.update(ok=False, error="控制命令需要有效的 token")
+        else:
+            try:
+                result.update(await self._loop.run_in_executor(self._executor, self.handler, message) or {})
+            except Exception as e:
+                result.update(ok=False, error=str(e))
+        return result
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer)
+        self._clients.append(client)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("请求必须是 JSON 对象")
+                except ValueError as e:
+                    # 不是本协议的客户端（如浏览器发来的 HTTP 请求）：回复错误后断开
+                    self._send(client, {"type": "result", "ok": False, "error": f"无效请求: {e}"})
+                    await writer.drain()
+                    break
+                if not self._send(client, await self._dispatch(client, message)):
+                    client.stats.dropped += 1
+        except (ConnectionError, ValueError):
+            pass  # 连接断开或单行超过读取上限
+        finally:
+            self._clients.remove(client)
+            writer.close()
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .image_recognition import decode_template
+from ..utils.constants import TEMPLATE_CATEGORIES
+from ..utils.logger_factory import LoggerFactory
+
+PACK_MAGIC = b"LATPACK1"
+PACK_VERSION = 3
+PACK_PATTERN = "templates*.pack"  # 各版本的模板包（含旧版固定文件名 templates.pack）
+_ALIGN = 64
+
+# 派生形式：打包时预先计算，运行时直接映射使用
+DERIVED_FORMS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "gray": lambda img: cv2.cvtColor(img, cv2.COLOR_BGR2GRAY),
+    "b": lambda img: img[..., 0],
+    "g": lambda img: img[..., 1],
+    "r": lambda img: img[..., 2],
+}
+
+
+def _align(value: int) -> int:
+    return (value + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def source_files(source_dir: Path) -> List[Path]:
+    """获取某个分辨率目录下参与打包的源文件（config.json 与所有模板 PNG）"""
+    files = [source_dir / "config.json"]
+    for category in TEMPLATE_CATEGORIES:
+        files.extend(sorted((source_dir / "weapon_templates" / category).glob("*.png")))
+    return [f for f in files if f.is_file()]
+
+
+def source_fingerprint(source_dir: Path) -> Dict[str, List[int]]:
+    """基于文件大小与修改时间的快速指纹 {相对路径: [大小, 修改时间]}"""
+    fingerprint = {}
+    for path in source_files(source_dir):
+        stat = path.stat()
+        fingerprint[path.relative_to(source_dir).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+
+def pack_filename(fingerprint: Dict[str, List[int]]) -> str:
+    """按包版本与源文件指纹命名模板包
+
+    源文件变化后写入新文件而不是覆盖旧包：旧包可能仍被识别进程或其他实例
+    内存映射，Windows 上无法替换正在映射的文件。
+    """
+    key = json.dumps([PACK_VERSION, fingerprint], sort_keys=True).encode("utf-8")
+    return f"templates.{hashlib.blake2b(key, digest_size=8).hexdigest()}.pack"
+
+
+def remove_old_packs(source_dir: Path, keep: Path) -> None:
+    """删除其他版本的模板包（仍被映射而无法删除的留到下次）"""
+    for path in Path(source_dir).glob(PACK_PATTERN):
+        if path.name == keep.name:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class TemplatePack:
+    """编译后的模板包
+
+    文件布局：魔数 | 清单长度(uint32) | 清单JSON | 对齐填充 | 原始数组数据。
+    运行时以只读方式内存映射，各模板直接作为映射区域上的 ndarray 视图，
+    多个进程加载同一个包时共享物理页。
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: 模板包文件路径
+        Raises:
+            ValueError: 文件格式或内容哈希校验失败
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(len(PACK_MAGIC) + 4)
+            if header[:len(PACK_MAGIC)] != PACK_MAGIC:
+                raise ValueError(f"模板包格式错误: {self.path}")
+            (manifest_len,) = struct.unpack("<I", header[len(PACK_MAGIC):])
+            self.manifest = json.loads(f.read(manifest_len).decode("utf-8"))
+        blob_offset = _align(len(PACK_MAGIC) + 4 + manifest_len)
+
+        if self.manifest.get("version") != PACK_VERSION:
+            raise ValueError(f"模板包版本不匹配: {self.manifest.get('version')}")
+
+        self._mmap = np.memmap(self.path, dtype=np.uint8, mode="r")
+        self._blob = self._mmap[blob_offset:blob_offset + self.manifest["blob_size"]]
+        self._views: Dict[Tuple[str, str, str], np.ndarray] = {}
+        for entry in self.manifest["entries"]:
+            view = np.ndarray(
+                shape=tuple(entry["shape"]),
+                dtype=np.dtype(entry["dtype"]),
+                buffer=self._blob,
+                offset=entry["offset"],
+            )
+            self._views[(entry["category"], entry["label"], entry["form"])] = view
+
+    @property
+    def config(self) -> Dict:
+        """打包时的 config.json 内容"""
+        return self.manifest["config"]
+
+    @property
+    def content_hash(self) -> str:
+        """模板包内容哈希（可作为模板版本号）"""
+        return self.manifest["blob_hash"]
+
+    def verify(self) -> bool:
+        """校验数据区哈希（需要读取整个数据区，加载时不做）"""
+        return hashlib.blake2b(self._blob, digest_size=16).hexdigest() == self.manifest["blob_hash"]
+
+    def is_stale(self, source_dir: Path) -> bool:
+        """源文件是否在打包后发生了变化"""
+        return source_fingerprint(Path(source_dir)) != self.manifest["fingerprint"]
+
+    def labels(self, category: str) -> List[str]:
+        """获取类别下的模板名称"""
+        return [label for (cat, label, form) in self._views if cat == category and form == "bgr"]
+
+    def get(self, category: str, label: str, form: str = "bgr") -> Optional[np.ndarray]:
+        """获取模板（只读视图）"""
+        return self._views.get((category, label, form))
+
+    def category(self, category: str, form: str = "bgr") -> Dict[str, np.ndarray]:
+        """获取类别下全部模板 {名称: 模板}"""
+        return {label: view for (cat, label, f), view in self._views.items()
+                if cat == category and f == form}
+
+    def sources(self, category: str, labels: List[Tuple[int, str]], form: str = "bgr") -> List[Tuple]:
+        """
+        按标签顺序获取构建模板库所需的数据
+        Args:
+            category: 类别名
+            labels: [(标签编号, 标签名)]
+            form: 匹配使用的形式
+        Returns:
+            List[Tuple]: [(标签编号, BGR模板, form 模板, 掩码)]，缺失的模板为None
+        """
+        return [(label_id, self.get(category, name), self.get(category, name, form),
+                 self.get(category, name, "mask"))
+                for label_id, name in labels]
+
+    def nbytes(self) -> int:
+        """映射的数据区大小"""
+        return int(self.manifest["blob_size"])
+
+    def close(self) -> None:
+        """释放映射（外部仍持有的视图会延迟释放）"""
+        self._views.clear()
+        self._blob = None
+        self._mmap = None
+
+    @staticmethod
+    def build(source_dir: Path, pack_path: Optional[Path] = None) -> Path:
+        """将分辨率目录编译为模板包
+
+        Args:
+            source_dir: 分辨率目录（包含 config.json 与 weapon_templates）
+            pack_path: 输出路径，默认按源文件指纹命名（见 pack_filename），
+                并删除该目录下其他版本的模板包
+        Returns:
+            Path: 模板包路径
+        """
+        source_dir = Path(source_dir)
+        fingerprint = source_fingerprint(source_dir)
+        default_path = pack_path is None
+        pack_path = source_dir / pack_filename(fingerprint) if default_path else Path(pack_path)
+
+        with open(source_dir / "config.json", "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        entries, chunks, offset = [], [], 0
+        source_hashes = {}
+        for category in TEMPLATE_CATEGORIES:
+            for png in sorted((source_dir / "weapon_templates" / category).glob("*.png")):
+                raw = png.read_bytes()
+                source_hashes[png.relative_to(source_dir).as_posix()] = hashlib.sha1(raw).hexdigest()
+                decoded = decode_template(raw)
+                if decoded is None:
+                    continue
+                image, mask = decoded
+                forms = {"bgr": image}
+                forms.update({name: func(image) for name, func in DERIVED_FORMS.items()})
+                # 掩码由原始透明通道生成
+                forms["mask"] = mask
+                for form, array in forms.items():
+                    array = np.ascontiguousarray(array)
+                    entries.append({
+                        "category": category,
+                        "label": png.stem,
+                        "form": form,
+                        "offset": offset,
+                        "shape": list(array.shape),
+                        "dtype": array.dtype.str,
+                    })
+                    padded = _align(array.nbytes)
+                    chunks.append(array.tobytes() + b"\0" * (padded - array.nbytes))
+                    offset += padded
+
+        blob = b"".join(chunks)
+        manifest = {
+            "version": PACK_VERSION,
+            "fingerprint": fingerprint,
+            "source_hashes": source_hashes,
+            "config": config,
+            "entries": entries,
+            "blob_size": len(blob),
+            "blob_hash": hashlib.blake2b(blob, digest_size=16).hexdigest(),
+        }
+        manifest_bytes = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+        header = PACK_MAGIC + struct.pack("<I", len(manifest_bytes)) + manifest_bytes
+        header += b"\0" * (_align(len(header)) - len(header))
+
+        # 写入临时文件后原子替换，避免读到写了一半的包
+        tmp_path = pack_path.with_name(f"{pack_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(blob)
+        try:
+            os.replace(tmp_path, pack_path)
+        except OSError:
+            # 其他实例刚写入同名的包并已映射（Windows 上无法替换）：内容相同，使用已有的包
+            os.remove(tmp_path)
+            if not pack_path.is_file():
+                raise
+        if default_path:
+            remove_old_packs(source_dir, pack_path)
+        return pack_path
+
+    @classmethod
+    def load_or_build(cls, source_dir: Path, pack_path: Optional[Path] = None) -> 'TemplatePack':
+        """加载模板包，不存在或已过期时自动重新编译
+
+        只比较源文件指纹（大小与修改时间），不读取数据区校验哈希；
+        源文件变化后编译到新的文件名，不替换可能仍被映射的旧包。
+        """
+        logger = LoggerFactory.get_logger()
+        source_dir = Path(source_dir)
+        fingerprint = source_fingerprint(source_dir)
+        default_path = pack_path is None
+        pack_path = source_dir / pack_filename(fingerprint) if default_path else Path(pack_path)
+
+        if pack_path.is_file():
+            try:
+                pack = cls(pack_path)
+                if pack.manifest["fingerprint"] == fingerprint:
+                    return pack
+                pack.close()
+                logger.info("模板源文件已变化，重新编译模板包")
+            except Exception as e:
+                logger.warning(f"模板包无法加载，重新编译: {e}")
+
+        pack_path = cls.build(source_dir, None if default_path else pack_path)
+        logger.info(f"模板包已编译: {pack_path}")
+        return cls(pack_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行：编译指定分辨率的模板包，例如 python -m src.assistant.core.template_pack 25601440"""
+    from ...config.settings import ConfigManager
+
+    argv = sys.argv[1:] if argv is None else argv
+    settings = ConfigManager("config")
+    templates = settings.get_path('templates')
+    resolutions = argv or [p.name for p in templates.iterdir() if (p / "config.json").is_file()]
+    for resolution in resolutions:
+        pack_path = TemplatePack.build(templates / resolution)
+        pack = TemplatePack(pack_path)
+        print(f"{resolution}: {len(pack.manifest['entries'])} 项, {pack.nbytes()} 字节 -> {pack_path}")
+        pack.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+流水线追踪
+
+记录识别流水线各步骤的起止时间（线程号、帧序号等附加信息），
+保存在内存环形缓冲中，需要时导出为 Chrome trace event 格式的 JSON，
+可直接拖入 https://ui.perfetto.dev 或 chrome://tracing 查看。
+
+未启用时 span() 返回同一个空对象、traced 装饰器只多一次属性判断，开销可以忽略。
+
+用法:
+    tracer = Tracer.get_instance()
+    with tracer.span("safe_capture") as span:
+        frame = ...
+        span.set(seq=frame.seq)
+
+    @traced("write_files")
+    def write_files(self, results): ...
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class _NullSpan:
+    """未启用时使用的空 span"""
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> '_Span':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        tid = threading.get_native_id()
+        if tid not in self.tracer._thread_names:
+            # 线程可能在导出前就已退出，首次记录时保存线程名
+            self.tracer._thread_names[tid] = threading.current_thread().name
+        # deque.append 在 GIL 下是原子操作，多个线程同时记录无需加锁
+        self.tracer._events.append((self.name, self.start, end - self.start, tid, self.args))
+
+    def set(self, **args: Any) -> None:
+        """附加信息（帧序号、区域名等），导出时放在事件的 args 中"""
+        self.args.update(args)
+
+
+class Tracer:
+    """span 环形记录器（单例模式）"""
+    _instance: Optional['Tracer'] = None
+
+    @classmethod
+    def get_instance(cls) -> 'Tracer':
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, capacity: int = 50000):
+        self.enabled = False
+        self._events = deque(maxlen=capacity)
+        self._thread_names: Dict[int, str] = {}
+
+    def configure(self, enabled: bool, capacity: Optional[int] = None) -> None:
+        """开启或关闭记录；修改容量时清空已有记录"""
+        if capacity is not None and capacity != self._events.maxlen:
+            self._events = deque(maxlen=capacity)
+        self.enabled = enabled
+
+    def span(self, name: str, **args: Any):
+        """记录 with 块的起止时间"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def events(self) -> list:
+        """Chrome trace event 列表（完整事件 ph=X，时间单位为微秒）"""
+        records = tuple(self._events)
+        pid = os.getpid()
+        for thread in threading.enumerate():
+            if thread.native_id is not None:
+                self._thread_names[thread.native_id] = thread.name  # 线程可能已改名
+
+        events = []
+        for tid in sorted({record[3] for record in records}):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": self._thread_names.get(tid, f"Thread-{tid}")}})
+        for name, start, duration, tid, args in records:
+            events.append({"name": name, "cat": "pipeline", "ph": "X", "pid": pid, "tid": tid,
+                           "ts": start / 1000.0, "dur": duration / 1000.0, "args": args})
+        return events
+
+    def dump(self, path: Path) -> int:
+        """把当前环形缓冲导出为 JSON 文件，返回导出的事件数"""
+        events = self.events()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False,
+                      default=str)
+        return len(events)
+
+
+def traced(name: Optional[str] = None):
+    """装饰器：记录函数调用的起止时间"""
+
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = Tracer.get_instance()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
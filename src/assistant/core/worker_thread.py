@@ -39,5 +39,17 @@ class WorkerThread(QThread):
                 self.logger.error("线程强制终止")
         self.logger.close_progress(7)
 
+    def request_perf(self):
+        """计算一份性能快照，经 logger.perf_signal 送达"""
+        self.logger.update_perf(self.pubg_core.perf_snapshot())
+
+    def dump_trace(self):
+        """导出追踪记录（结果见日志）"""
+        self.pubg_core.dump_trace()
+
+    def memory_snapshot(self):
+        """输出内存占用报告（结果见日志）"""
+        self.pubg_core.log_memory_report()
+
     def is_alive(self):
         return self._is_running and self.isRunning()
@@ -1,12 +1,8 @@
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QIcon, QPixmap
-from PyQt5.QtWidgets import QMainWindow, QTabWidget
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget
 
-# from .tabs.weapon_tab import WeaponTab
-# from .tabs.settings_tab import SettingsTab
 from .label import FloatingLabel
-from .tabs.about_tab import AboutTab
-from .tabs.auto_tab import AutoTab
 from ... import __version__, __app_name__
 from ...assistant.utils.logger_factory import LoggerFactory
 from ...config.settings import ConfigManager
@@ -45,20 +41,62 @@ class MainWindow(QMainWindow):
         self.resize(800, 600)
 
     def _init_tabs(self):
-        """初始化标签页"""
+        """初始化标签页
+
+        先放置空白占位页，标签页在首次显示时才导入并创建
+        """
         self.tab_widget = QTabWidget()
         self.setCentralWidget(self.tab_widget)
-        
-        # 创建标签页
-        self.auto_tab = AutoTab(self.label)
-        
-        # 添加标签页
-        self.tab_widget.addTab(self.auto_tab, "自动识别")
-        # self.tab_widget.addTab(self.weapon_tab, "武器参数")
 
-        # 添加关于标签页
-        self.about_tab = AboutTab()
-        self.tab_widget.addTab(self.about_tab, "关于")
+        # (属性名, 标题, 工厂函数)
+        self._tab_factories = [
+            ("auto_tab", "自动识别", self._create_auto_tab),
+            ("weapon_tab", "武器参数", self._create_weapon_tab),
+            ("perf_tab", "性能", self._create_perf_tab),
+            ("about_tab", "关于", self._create_about_tab),
+        ]
+        for attr, title, _ in self._tab_factories:
+            setattr(self, attr, None)
+            self.tab_widget.addTab(QWidget(), title)
+
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+        self._ensure_tab(self.tab_widget.currentIndex())
+
+    def _ensure_tab(self, index: int):
+        """确保指定标签页已创建"""
+        if not 0 <= index < len(self._tab_factories):
+            return
+        attr, title, factory = self._tab_factories[index]
+        if getattr(self, attr) is not None:
+            return
+
+        tab = factory()
+        setattr(self, attr, tab)
+        self.tab_widget.blockSignals(True)
+        try:
+            placeholder = self.tab_widget.widget(index)
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, tab, title)
+            self.tab_widget.setCurrentIndex(index)
+            placeholder.deleteLater()
+        finally:
+            self.tab_widget.blockSignals(False)
+
+    def _create_auto_tab(self) -> QWidget:
+        from .tabs.auto_tab import AutoTab
+        return AutoTab(self.label)
+
+    def _create_weapon_tab(self) -> QWidget:
+        from .tabs.weapon_tab import WeaponTab
+        return WeaponTab()
+
+    def _create_perf_tab(self) -> QWidget:
+        from .tabs.perf_tab import PerfTab
+        return PerfTab(lambda: self.auto_tab.worker_thread if self.auto_tab else None)
+
+    def _create_about_tab(self) -> QWidget:
+        from .tabs.about_tab import AboutTab
+        return AboutTab()
 
     def _setup_window_properties(self):
         """设置窗口属性"""
@@ -79,9 +117,13 @@ class MainWindow(QMainWindow):
         """处理窗口关闭事件"""
         try:
             # 确保auto_tab正确关闭
-            if hasattr(self, 'auto_tab'):
+            if getattr(self, 'auto_tab', None):
                 self.auto_tab.handle_exit()
-            
+
+            # 写入尚未保存的武器参数
+            if getattr(self, 'weapon_tab', None):
+                self.weapon_tab.close_writer()
+
             # 隐藏浮动标签
             if self.label:
                 self.label.setVisible(False)
@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QLabel, QCheckBox, QPushButton, QTextBrowser, QGroupBox, QProgressDialog,
                              QComboBox, QMessageBox, QSlider)
 
-from ...core.worker_thread import WorkerThread
+from ...core.memory_report import MemoryLedger
 from ...ui.label import FloatingLabel
 from ...utils.logger_factory import LoggerFactory
 from ....config.settings import ConfigManager
@@ -19,7 +19,8 @@ class AutoTab(QWidget):
         self.logger = LoggerFactory.get_logger()
         self.label = label
 
-        self.worker_thread = WorkerThread()
+        # 工作线程（及其 PubgCore、cv2、键鼠钩子）在首次开启时才创建
+        self.worker_thread = None
 
         self.is_processing = False
         self.is_switching = False
@@ -88,6 +89,12 @@ class AutoTab(QWidget):
         log_group = QGroupBox("日志")
         log_layout = QVBoxLayout()
         self.text_browser = QTextBrowser()
+        # 限制保留的日志行数，超出时自动删除最早的行
+        self.text_browser.document().setMaximumBlockCount(
+            int(self.settings.get('memory', 'log_view_max_lines', 5000)))
+        # QTextDocument 以 UTF-16 保存文字，按每字符2字节估算（只读取字符数，不修改控件）
+        MemoryLedger.get_instance().register(
+            "log_view", lambda: self.text_browser.document().characterCount() * 2)
         log_layout.addWidget(self.text_browser)
         log_group.setLayout(log_layout)
         main_layout.addWidget(log_group, 1, 2, 3, 1)  # 日志区域跨3行
@@ -160,7 +167,7 @@ class AutoTab(QWidget):
 
         # 获取所有可用的截图方式
         capture_methods = self.capture_manager.get_capture_methods()
-        for method_id, method_class in capture_methods.items():
+        for method_id in capture_methods:
             self.capture_combo.addItem(method_id, method_id)
         # 设置当前选中的截图方式
         current_method = self.capture_manager.get_method()
@@ -288,6 +295,27 @@ class AutoTab(QWidget):
             label.setText(value)
 
 
+    def ensure_worker_thread(self):
+        """首次使用时创建工作线程
+
+        core.mode 为 process 时改用子进程中的核心（由 main.py 启动时预先拉起），
+        两者的 start/stop_signal/is_alive/isRunning 接口一致
+        """
+        if self.worker_thread is None:
+            if self.settings.get('core', 'mode', 'thread') == 'process':
+                from ...core.core_process import CoreProcess
+                self.worker_thread = CoreProcess.get_instance()
+            else:
+                from ...core.worker_thread import WorkerThread
+                self.worker_thread = WorkerThread()
+        return self.worker_thread
+
+    def _forward_capture_setting(self, name: str, value):
+        """核心在子进程中运行时，把截图设置同步过去"""
+        set_value = getattr(self.worker_thread, f"set_{name}", None)
+        if set_value is not None:
+            set_value(value)
+
     def switch_button_clicked(self, checked: bool):
         """处理开关按钮点击"""
         if self.is_switching:  # 如果正在切换中，忽略点击
@@ -307,6 +335,7 @@ class AutoTab(QWidget):
                 self.capture_combo.setDisabled(True)
                 self.fps_slider.setDisabled(True)
                 # 直接启动工作线程
+                self.ensure_worker_thread()
                 if not self.worker_thread.is_alive():
                     self.worker_thread.start()
                 # self.process_manager.start()
@@ -315,7 +344,7 @@ class AutoTab(QWidget):
             else:
                 self.capture_combo.setDisabled(False)
                 self.fps_slider.setDisabled(False)
-                if self.worker_thread.is_alive():
+                if self.worker_thread and self.worker_thread.is_alive():
                     # 创建关闭进度对话框
                     self.close_progress = QProgressDialog("正在关闭...", None, 0, 7, self)
                     # 设置进度条窗口名字
@@ -416,6 +445,7 @@ class AutoTab(QWidget):
         try:
             method = self.capture_combo.currentData()
             self.capture_manager.set_method(method)
+            self._forward_capture_setting("method", method)
             self.logger.info(f"截图方式已更改为: {method}")
         except Exception as e:
             self.logger.error(f"更改截图方式时出错: {e}")
@@ -429,6 +459,7 @@ class AutoTab(QWidget):
         try:
             value = self.fps_slider.value()
             self.capture_manager.set_fps(value)
+            self._forward_capture_setting("fps", value)
             self.logger.info(f"FPS已更改为: {value}")
         except Exception as e:
             self.logger.error(f"更改FPS时出错: {e}")
@@ -0,0 +1,248 @@
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QGroupBox,
+                             QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QAbstractItemView)
+
+from ...core.memory_report import MB, MemoryLedger
+from ...utils.logger_factory import LoggerFactory
+from ....config.settings import ConfigManager
+
+# (快照中的阶段名, 显示名称)
+STAGES = [
+    ("capture", "截图"),
+    ("match", "识别"),
+    ("write", "写出"),
+    ("tab_to_output", "Tab 到输出"),
+]
+CACHES = [
+    ("recognition", "识别缓存"),
+    ("recoil", "压枪曲线缓存"),
+]
+# (内存统计中的子系统名, 显示名称)
+MEMORY_SUBSYSTEMS = [
+    ("frames", "截图帧"),
+    ("templates", "模板库"),
+    ("caches", "识别缓存"),
+    ("log_view", "日志显示"),
+]
+MAX_THREAD_ROWS = 12
+
+
+class PerfTab(QWidget):
+    """性能标签页：实时显示截图帧率、各阶段耗时、缓存命中率与资源占用
+
+    只在标签页可见时按 perf.refresh_hz 请求快照；快照在核心的命令线程
+    （子进程模式）或界面线程（线程模式）中计算，识别线程只负责追加耗时样本。
+    """
+
+    def __init__(self, worker_source: Callable[[], Optional[object]]):
+        """
+        Args:
+            worker_source: 返回当前工作线程或核心进程代理（尚未创建时返回None）
+        """
+        super().__init__()
+        self.settings = ConfigManager("config")
+        self.logger = LoggerFactory.get_logger()
+        self.worker_source = worker_source
+
+        self.logger.perf_signal.connect(self.on_perf_update)
+
+        refresh_hz = max(float(self.settings.get('perf', 'refresh_hz', 4)), 0.5)
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(1000 / refresh_hz))
+        self.timer.timeout.connect(self.request_snapshot)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(10)
+
+        # 截图
+        capture_group = QGroupBox("截图")
+        capture_layout = QGridLayout()
+        self.method_label = QLabel("-")
+        self.fps_label = QLabel("-")
+        self.success_label = QLabel("-")
+        for row, (title, label) in enumerate([("后端", self.method_label),
+                                              ("实际帧率 / 目标", self.fps_label),
+                                              ("成功率", self.success_label)]):
+            capture_layout.addWidget(QLabel(title), row, 0)
+            capture_layout.addWidget(label, row, 1)
+        capture_group.setLayout(capture_layout)
+        layout.addWidget(capture_group)
+
+        # 阶段耗时
+        stage_group = QGroupBox("阶段耗时（毫秒，最近样本）")
+        stage_layout = QVBoxLayout()
+        self.stage_table = self._create_table(["阶段", "次数", "P50", "P90", "P99"], len(STAGES))
+        for row, (_, title) in enumerate(STAGES):
+            self.stage_table.setItem(row, 0, QTableWidgetItem(title))
+        stage_layout.addWidget(self.stage_table)
+        stage_group.setLayout(stage_layout)
+        layout.addWidget(stage_group)
+
+        # 缓存、队列与进程
+        status_group = QGroupBox("缓存与资源")
+        status_layout = QGridLayout()
+        self.cache_labels: Dict[str, QLabel] = {}
+        rows = [(title, self.cache_labels.setdefault(name, QLabel("-"))) for name, title in CACHES]
+        self.queue_label = QLabel("-")
+        self.cpu_label = QLabel("-")
+        self.rss_label = QLabel("-")
+        rows += [("识别任务队列", self.queue_label), ("进程 CPU", self.cpu_label),
+                 ("常驻内存", self.rss_label)]
+        for row, (title, label) in enumerate(rows):
+            status_layout.addWidget(QLabel(title), row, 0)
+            status_layout.addWidget(label, row, 1)
+        status_group.setLayout(status_layout)
+        layout.addWidget(status_group)
+
+        # 线程 CPU
+        thread_group = QGroupBox("线程 CPU")
+        thread_layout = QVBoxLayout()
+        self.thread_table = self._create_table(["线程", "CPU %", "累计 CPU 秒"], 0)
+        thread_layout.addWidget(self.thread_table)
+        thread_group.setLayout(thread_layout)
+        layout.addWidget(thread_group)
+
+        # 内存占用
+        memory_group = QGroupBox("内存占用（MB）")
+        memory_layout = QVBoxLayout()
+        self.memory_table = self._create_table(["子系统", "占用", "预算"], len(MEMORY_SUBSYSTEMS))
+        for row, (_, title) in enumerate(MEMORY_SUBSYSTEMS):
+            self.memory_table.setItem(row, 0, QTableWidgetItem(title))
+        memory_layout.addWidget(self.memory_table)
+        memory_group.setLayout(memory_layout)
+        layout.addWidget(memory_group)
+
+        # 导出追踪记录（需要在配置中开启 trace.enabled）与内存快照
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.memory_button = QPushButton("内存快照")
+        self.memory_button.setToolTip("输出各子系统内存占用，并与上一次快照对比 Python 内存增长最多的位置")
+        self.memory_button.clicked.connect(self.memory_snapshot)
+        button_layout.addWidget(self.memory_button)
+        self.trace_button = QPushButton("导出追踪")
+        self.trace_button.setToolTip("把最近的流水线追踪记录导出到 logs 目录，可在 Perfetto 中打开")
+        self.trace_button.clicked.connect(self.dump_trace)
+        button_layout.addWidget(self.trace_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    @staticmethod
+    def _create_table(headers: List[str], rows: int) -> QTableWidget:
+        table = QTableWidget(rows, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.NoSelection)
+        return table
+
+    @staticmethod
+    def _set_cell(table: QTableWidget, row: int, column: int, text: str):
+        """更新单元格文字（复用已有的单元格）"""
+        item = table.item(row, column)
+        if item is None:
+            table.setItem(row, column, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.request_snapshot()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def request_snapshot(self):
+        """请求一份性能快照（结果经 logger.perf_signal 异步送达）"""
+        worker = self.worker_source()
+        try:
+            if worker is None:
+                # 核心尚未创建：只显示界面进程自身的资源占用
+                from ...core.perf_stats import PerfStats
+                self.logger.update_perf(PerfStats.get_instance().snapshot())
+            elif hasattr(worker, 'request_perf'):
+                worker.request_perf()
+        except Exception as e:
+            self.timer.stop()
+            self.logger.error(f"获取性能数据失败: {e}")
+
+    def dump_trace(self):
+        """通知核心导出追踪记录（路径输出到日志）"""
+        worker = self.worker_source()
+        if worker is None or not hasattr(worker, 'dump_trace'):
+            self.logger.warning("核心尚未启动，没有追踪记录")
+            return
+        worker.dump_trace()
+
+    def memory_snapshot(self):
+        """通知核心输出内存占用报告（结果输出到日志）"""
+        worker = self.worker_source()
+        if worker is None or not hasattr(worker, 'memory_snapshot'):
+            self.logger.warning("核心尚未启动，没有内存统计")
+            return
+        worker.memory_snapshot()
+
+    def on_perf_update(self, data: dict):
+        """刷新显示"""
+        if not self.isVisible():
+            return
+        capture = data.get("capture")
+        if capture:
+            health = capture.get("health", {})
+            self.method_label.setText(capture["method"])
+            self.fps_label.setText(f"{capture['fps']:.1f} / {capture['target_fps']}")
+            self.success_label.setText(f"{health.get('success_rate', 0.0):.1%}"
+                                       f"（失败 {health.get('failures', 0)} 次）")
+        else:
+            for label in (self.method_label, self.fps_label, self.success_label):
+                label.setText("-")
+
+        stages = dict(data.get("stages", {}))
+        if capture:
+            stages["capture"] = capture["latency"]
+        for row, (name, _) in enumerate(STAGES):
+            summary = stages.get(name)
+            cells = (["-"] * 4 if not summary else
+                     [str(summary.get("total", summary["count"]))] +
+                     [f"{summary[key]:.2f}" for key in ("p50", "p90", "p99")])
+            for column, text in enumerate(cells, start=1):
+                self._set_cell(self.stage_table, row, column, text)
+
+        caches = data.get("caches", {})
+        for name, label in self.cache_labels.items():
+            stats = caches.get(name)
+            label.setText("-" if stats is None else
+                          f"{stats['hit_rate']:.1%}（命中 {stats['hits']} / 未命中 {stats['misses']}）")
+        self.queue_label.setText(str(data["queue_depth"]) if "queue_depth" in data else "-")
+
+        process = data.get("process", {})
+        if process:
+            self.cpu_label.setText(f"{process['cpu_percent']:.1f}%"
+                                   f"（{process['cpu_count']} 核，pid {process['pid']}）")
+            self.rss_label.setText(f"{process['rss'] / 1024 / 1024:.1f} MB")
+        # 核心没有统计的子系统由界面进程自己统计（子进程模式下日志显示在界面进程中）
+        memory = dict(data.get("memory", {}))
+        missing = [name for name, _ in MEMORY_SUBSYSTEMS if name not in memory]
+        if missing:
+            memory.update(MemoryLedger.get_instance().report(missing))
+        for row, (name, _) in enumerate(MEMORY_SUBSYSTEMS):
+            entry = memory.get(name)
+            budget = entry["budget"] if entry else None
+            self._set_cell(self.memory_table, row, 1, f"{entry['bytes'] / MB:.1f}" if entry else "-")
+            self._set_cell(self.memory_table, row, 2, f"{budget / MB:.1f}" if budget is not None else "-")
+
+        threads = process.get("threads", [])[:MAX_THREAD_ROWS]
+        self.thread_table.setRowCount(len(threads))
+        for row, thread in enumerate(threads):
+            self._set_cell(self.thread_table, row, 0, f"{thread['name']} ({thread['id']})")
+            self._set_cell(self.thread_table, row, 1, f"{thread['cpu_percent']:.1f}")
+            self._set_cell(self.thread_table, row, 2, f"{thread['cpu_time']:.2f}")
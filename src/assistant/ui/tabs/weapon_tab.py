@@ -1,61 +1,67 @@
 import json
-import os
+from typing import List, Tuple
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QComboBox, QPushButton,
     QGroupBox, QScrollArea, QDoubleSpinBox
 )
 
-from ....config.settings import Settings
+from ....assistant.utils.json_writer import DebouncedJsonWriter
+from ....assistant.utils.logger_factory import LoggerFactory
+from ....config.settings import ConfigManager
+
+# 不在数值框中编辑的参数（ballistic 为分段列表）
+SKIPPED_PARAMS = ('default', 'burst', 'ballistic')
 
 
 class WeaponTab(QWidget):
     """武器参数配置标签页"""
+    # 后台写入结果 (是否成功, 错误信息)，由写入线程发出、排队到界面线程处理
+    save_finished = pyqtSignal(bool, str)
 
-    def __init__(self, settings: Settings):
+    def __init__(self):
         super().__init__()
-        self.settings = settings
+        self.settings = ConfigManager("config")
+        self.logger = LoggerFactory.get_logger()
         self.weapons_data = {}
+        self.current_weapon = None
+        # 参数行控件池：切换武器时复用，只在参数比之前多时新建
+        self._rows: List[Tuple[QLabel, QDoubleSpinBox]] = []
+        self._row_params: List[str] = []  # 当前显示的各行对应的参数名
 
         # 使用配置的路径
         config_path = self.settings.get_path('config')
         self.weapons_file = config_path / 'weapons.json'
+        # 修改按字段记录，停止调节后在后台合并写回；重置放弃尚未写入的修改
+        self.writer = DebouncedJsonWriter(
+            self.weapons_file,
+            on_error=lambda e: self.save_finished.emit(False, str(e)),
+            on_written=lambda: self.save_finished.emit(True, ""))
+        self.save_finished.connect(self._on_save_finished)
 
         self._load_weapons_data()
         self._init_ui()
 
     def _load_weapons_data(self):
         """加载武器配置数据"""
-        try:
-            # 获取项目根目录
-            current_dir = os.path.dirname(os.path.abspath(__file__))  # tabs目录
-            src_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))  # src的父目录
-
-            config_path = os.path.join(
-                src_dir,
-                'resources',
-                'config',
-                'weapons.json'
-            )
-
-            # 如果文件不存在，尝试创建目录
-            os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        self.weapons_data = self._read_weapons_file()
 
-            if not os.path.exists(config_path):
-                print(f"配置文件不存在: {config_path}")
-                # 可以在这里添加创建默认配置文件的逻辑
-                self.weapons_data = {}
-                return
+    def _read_weapons_file(self) -> dict:
+        """读取 weapons.json，失败时返回空字典"""
+        try:
+            if not self.weapons_file.exists():
+                print(f"配置文件不存在: {self.weapons_file}")
+                return {}
 
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.weapons_data = json.load(f)
+            with open(self.weapons_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
 
         except Exception as e:
             print(f"加载武器数据失败: {e}")
-            print(f"尝试加载的路径: {config_path}")  # 添加路径调试信息
-            self.weapons_data = {}
+            print(f"尝试加载的路径: {self.weapons_file}")
+            return {}
 
     def _init_ui(self):
         """初始化UI"""
@@ -123,111 +129,120 @@ class WeaponTab(QWidget):
         reset_btn = QPushButton("重置")
         reset_btn.clicked.connect(self._reset_weapon_params)
 
+        # 保存结果
+        self.status_label = QLabel()
+
+        button_layout.addWidget(self.status_label)
         button_layout.addStretch()
         button_layout.addWidget(save_btn)
         button_layout.addWidget(reset_btn)
 
         layout.addLayout(button_layout)
 
-    def _create_param_spinbox(self, value):
+    def _create_param_spinbox(self) -> QDoubleSpinBox:
         """创建参数调节框"""
         spinbox = QDoubleSpinBox()
         spinbox.setRange(0, 100)
         spinbox.setDecimals(2)
         spinbox.setSingleStep(0.1)
+        return spinbox
 
-        # 处理不同类型的值
+    @staticmethod
+    def _param_value(value) -> float:
+        """参数在调节框中显示的值（字典参数显示 default 或第一个值）"""
         if isinstance(value, (int, float)):
-            spinbox.setValue(float(value))
-        elif isinstance(value, dict):
-            # 如果是字典，使用默认值或第一个值
-            if 'default' in value:
-                spinbox.setValue(float(value['default']))
-            elif len(value) > 0:
-                first_value = next(iter(value.values()))
-                spinbox.setValue(float(first_value))
-            else:
-                spinbox.setValue(0.0)
-        else:
-            # 其他情况使用默认值
-            spinbox.setValue(0.0)
-            print(f"未知的参数值类型: {type(value)}, 值: {value}")
-
-        return spinbox
+            return float(value)
+        if isinstance(value, dict) and value:
+            return float(value.get('default', next(iter(value.values()))))
+        return 0.0
+
+    @staticmethod
+    def _is_editable(param_name: str, value) -> bool:
+        if param_name in SKIPPED_PARAMS:
+            return False
+        if isinstance(value, dict):
+            return all(isinstance(v, (int, float)) for v in value.values())
+        return isinstance(value, (int, float))
+
+    def _row(self, index: int) -> Tuple[QLabel, QDoubleSpinBox]:
+        """获取第 index 行的控件，池中不足时新建"""
+        while len(self._rows) <= index:
+            row = len(self._rows)
+            label = QLabel()
+            spinbox = self._create_param_spinbox()
+            spinbox.valueChanged.connect(lambda value, row=row: self._on_param_changed(row, value))
+            self.params_layout.addWidget(label, row, 0)
+            self.params_layout.addWidget(spinbox, row, 1)
+            self._rows.append((label, spinbox))
+        return self._rows[index]
 
     def _on_weapon_changed(self, weapon_name: str):
-        """处理武器选择变化"""
+        """处理武器选择变化（复用已有的参数行，只更新文字和数值）"""
+        self.current_weapon = weapon_name
+        weapon_params = self.weapons_data.get(weapon_name, {})
+        if not weapon_params:
+            print(f"未找到武器参数: {weapon_name}")
+
+        self._row_params = [name for name, value in weapon_params.items()
+                            if self._is_editable(name, value)]
+        container = self.params_layout.parentWidget()
+        container.setUpdatesEnabled(False)
         try:
-            # 清除现有参数
-            self._clear_params_layout()
-
-            # 获取武器参数
-            weapon_params = self.weapons_data.get(weapon_name, {})
-            if not weapon_params:
-                print(f"未找到武器参数: {weapon_name}")
-                return
-
-            # 创建参数控件
-            row = 0
-            for param_name, param_value in weapon_params.items():
-                # 跳过特殊参数
-                if param_name in ['default', 'burst']:
-                    continue
-
-                # 创建标签
-                label = QLabel(param_name)
-                self.params_layout.addWidget(label, row, 0)
-
-                # 创建并配置SpinBox
-                spinbox = self._create_param_spinbox(param_value)
-                spinbox.valueChanged.connect(
-                    lambda value, name=param_name: self._on_param_changed(name, value)
-                )
-                self.params_layout.addWidget(spinbox, row, 1)
-
-                row += 1
-
-        except Exception as e:
-            print(f"处理武器变化失败: {e}")
-
-    def _clear_params_layout(self):
-        """清除参数布局"""
-        while self.params_layout.count():
-            item = self.params_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-    def _save_weapon_params(self):
-        """保存武器参数"""
-        if not self.current_weapon:
+            for index, param_name in enumerate(self._row_params):
+                label, spinbox = self._row(index)
+                label.setText(param_name)
+                spinbox.blockSignals(True)
+                spinbox.setValue(self._param_value(weapon_params[param_name]))
+                spinbox.blockSignals(False)
+                label.show()
+                spinbox.show()
+            for label, spinbox in self._rows[len(self._row_params):]:
+                label.hide()
+                spinbox.hide()
+        finally:
+            container.setUpdatesEnabled(True)
+
+    def _on_param_changed(self, row: int, value: float):
+        """参数调节框数值变化：更新内存中的数据并记录被修改的字段"""
+        if not self.current_weapon or row >= len(self._row_params):
             return
+        param_name = self._row_params[row]
+        weapon_params = self.weapons_data.get(self.current_weapon, {})
+        current = weapon_params.get(param_name)
+        if isinstance(current, dict):
+            # 字典参数只修改 default，保留各配件单独的系数
+            current['default'] = value
+            self.writer.set((self.current_weapon, param_name, 'default'), value)
+        else:
+            weapon_params[param_name] = value
+            self.writer.set((self.current_weapon, param_name), value)
 
-        try:
-            # 更新数据
-            weapon_params = self.weapons_data[self.current_weapon]
-            for param_name, spinbox in self.param_widgets.items():
-                weapon_params[param_name] = spinbox.value()
-
-            # 写入文件
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            config_path = os.path.join(
-                current_dir,
-                '../../../resources/config/weapons.json'
-            )
-
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.weapons_data, f, indent=4, ensure_ascii=False)
+    def _save_weapon_params(self):
+        """要求后台立即写入所有未保存的修改（不等待写入完成，结果见 save_finished）"""
+        if self.writer.request_flush():
+            self.status_label.setText("正在保存...")
+        else:
+            self.status_label.setText("没有需要保存的修改")
 
-        except Exception as e:
-            print(f"保存武器参数失败: {e}")
+    def _on_save_finished(self, success: bool, error: str):
+        """后台写入完成（界面线程）"""
+        if success:
+            self.status_label.setText("已保存")
+        else:
+            self.status_label.setText("保存失败")
+            self.logger.error(f"保存武器参数失败: {error}")
 
     def _reset_weapon_params(self):
-        """重置武器参数"""
+        """放弃当前武器尚未写入的修改并从文件重新加载"""
         if not self.current_weapon:
             return
 
-        # 重新加载数据
-        self._load_weapons_data()
-
-        # 更新显示
+        self.writer.discard((self.current_weapon,))
+        # 只重新加载当前武器，其他武器未保存的修改仍以内存中的值为准
+        saved = self._read_weapons_file()
+        self.weapons_data[self.current_weapon] = saved.get(self.current_weapon, {})
         self._on_weapon_changed(self.current_weapon)
+
+    def close_writer(self):
+        """写入剩余修改（窗口关闭时调用）"""
+        self.writer.close()
@@ -102,6 +102,11 @@ ATTRIBUTE_KEYS: Dict[str, List[str]] = {
     "stocks": ["normal", "heavy", "pg"],
 }
 
+# 模板类别（与 weapon_templates 下的目录一一对应，顺序即类别编号）
+TEMPLATE_CATEGORIES: List[str] = [
+    "poses", "weapons", "muzzles", "grips", "scopes", "stocks", "bag", "car", "shoot"
+]
+
 def get_weapon_type(weapon_name: str) -> WeaponType:
     """获取武器类型"""
     rifle_weapons = ["AKM", "Berry", "AUG", "M416", "ACE32", "G36C", "GROZA", "FAMAS", "M16", "K2", "SCAR", "QBZ"]
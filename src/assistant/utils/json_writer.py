@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+FieldPath = Tuple[str, ...]
+
+
+class DebouncedJsonWriter:
+    """按字段合并修改、在后台线程防抖写回的 JSON 文件
+
+    set() 只记录被修改的字段并立即返回；最后一次修改后 delay 秒内没有新的修改时，
+    后台线程读取磁盘上的当前文件、只覆盖记录过的字段，写入临时文件后原子替换，
+    读取方（如 RecoilTables）永远不会读到写了一半的文件，也不会丢失未修改的字段。
+    request_flush() 要求立即写入但不等待，结果通过 on_written/on_error 回调通知。
+    """
+
+    def __init__(self, path: Path, delay: float = 0.5,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 on_written: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            path: JSON 文件路径
+            delay: 防抖时间（秒）
+            on_error: 写入失败时在后台线程中调用
+            on_written: 写入成功后在后台线程中调用
+        """
+        self.path = Path(path)
+        self.delay = delay
+        self.on_error = on_error
+        self.on_written = on_written
+        self.writes = 0  # 已完成的写入次数
+        self._pending: Dict[FieldPath, Any] = {}
+        self._deadline = 0.0
+        self._flush_requested = False
+        self._closing = False
+        self._writing = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """尚未写入的字段数"""
+        with self._cond:
+            return len(self._pending)
+
+    def set(self, path: FieldPath, value: Any) -> None:
+        """记录一个字段的新值，例如 set(("M416", "muzzles", "default"), 0.9)"""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("写入器已关闭")
+            self._pending[tuple(path)] = value
+            self._deadline = time.monotonic() + self.delay
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def discard(self, prefix: FieldPath = ()) -> int:
+        """丢弃以 prefix 开头的未写入修改，返回丢弃的字段数"""
+        prefix = tuple(prefix)
+        with self._cond:
+            keys = [key for key in self._pending if key[:len(prefix)] == prefix]
+            for key in keys:
+                del self._pending[key]
+            return len(keys)
+
+    def request_flush(self) -> bool:
+        """要求后台线程立即写入未写入的修改，不等待完成；没有需要写入的修改时返回False"""
+        with self._cond:
+            if self._pending:
+                self._flush_requested = True
+                self._ensure_thread()
+                self._cond.notify_all()
+            return bool(self._pending) or self._writing
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """立即写入未写入的修改并等待完成，超时返回False"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if not self._pending and not self._writing:
+                return True
+            self._flush_requested = True
+            self._ensure_thread()
+            self._cond.notify_all()
+            while self._pending or self._writing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """写入剩余修改并停止后台线程"""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return flushed
+
+    def _ensure_thread(self) -> None:
+        """调用方持有锁"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="JsonWriter")
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closing:
+                    if self._pending:
+                        remaining = self._deadline - time.monotonic()
+                        if self._flush_requested or remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if not self._pending:
+                    return
+                changes, self._pending = self._pending, {}
+                self._flush_requested = False
+                self._writing = True
+            try:
+                self._apply(changes)
+                self.writes += 1
+            except Exception as e:
+                # 写入失败时保留修改（更晚的修改优先），下次防抖后重试
+                with self._cond:
+                    for key, value in changes.items():
+                        self._pending.setdefault(key, value)
+                    self._deadline = time.monotonic() + self.delay
+                if self.on_error is not None:
+                    self.on_error(e)
+            else:
+                if self.on_written is not None:
+                    self.on_written()
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+                if self._closing:
+                    return
+
+    def _apply(self, changes: Dict[FieldPath, Any]) -> None:
+        """把修改合并到磁盘上的当前内容并原子替换"""
+        data: Dict[str, Any] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        for path, value in changes.items():
+            node = data
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=self.path.name, suffix='.tmp', dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
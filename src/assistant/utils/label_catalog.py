@@ -0,0 +1,171 @@
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .constants import TEMPLATE_CATEGORIES, get_attribute_keys, translate_name
+
+# 保留编号
+UNSET_ID = -1  # 区域尚未识别
+NONE_ID = 0  # 识别结果为 none
+NONE_LABEL = "none"
+
+
+class LabelCatalog:
+    """识别结果标签目录
+
+    启动时根据 ATTRIBUTE_KEYS 与模板目录一次性构建，为类别、区域、标签分配
+    小整数编号，并预先计算显示名称与 Lua 字面量。识别核心只处理整数数组，
+    字符串转换只发生在输出端（写文件、刷新界面）。
+    """
+
+    def __init__(self, regions: Optional[Dict[str, List[int]]] = None,
+                 template_dir: Optional[Path] = None):
+        """
+        Args:
+            regions: 区域配置 {区域名: [x, y, w, h]}
+            template_dir: 模板根目录（包含各类别子目录），为None时不检查模板文件
+        """
+        self.template_dir = Path(template_dir) if template_dir else None
+
+        # 标签表，0 号固定为 none
+        self.labels: List[str] = [NONE_LABEL]
+        self.label_ids: Dict[str, int] = {NONE_LABEL: NONE_ID}
+
+        # 类别表
+        self.categories: List[str] = list(TEMPLATE_CATEGORIES)
+        self.category_ids: Dict[str, int] = {name: i for i, name in enumerate(self.categories)}
+        self.category_labels: List[np.ndarray] = []
+        for category in self.categories:
+            ids = [self._add_label(name) for name in get_attribute_keys(category)]
+            self.category_labels.append(np.array(ids, dtype=np.int16))
+
+        # 预计算的输出形式
+        self.display_names: List[str] = [translate_name(name) for name in self.labels]
+        self.lua_literals: List[str] = [f'"{name}"' for name in self.labels]
+
+        # 区域表
+        self.regions: List[str] = []
+        self.region_ids: Dict[str, int] = {}
+        self.region_categories = np.zeros(0, dtype=np.int16)
+        self.wide_rects = np.zeros((0, 4), dtype=np.int32)  # 配置中的原始（宽）区域
+        # 当前使用的 (区域, 界面缩放, 是否已校准)：校准线程复制后整体替换引用，
+        # 识别线程读到的数组不会被原地修改，区域与缩放也总是来自同一次更新
+        self._rois = (np.zeros((0, 4), dtype=np.int32), np.ones(0, dtype=np.float32),
+                      np.zeros(0, dtype=bool))
+        self._roi_lock = Lock()  # 只串行化写入方
+        if regions:
+            self.set_regions(regions)
+
+    def _add_label(self, name: str) -> int:
+        """登记标签并返回编号"""
+        if name not in self.label_ids:
+            self.label_ids[name] = len(self.labels)
+            self.labels.append(name)
+        return self.label_ids[name]
+
+    def set_regions(self, regions: Dict[str, List[int]]) -> None:
+        """登记识别区域，区域名前缀决定所属类别"""
+        self.regions = [name for name in regions if name.split('_')[0] in self.category_ids]
+        self.region_ids = {name: i for i, name in enumerate(self.regions)}
+        self.wide_rects = np.array(
+            [regions[name] for name in self.regions], dtype=np.int32
+        ).reshape(-1, 4)
+        self.region_categories = np.array(
+            [self.category_ids[name.split('_')[0]] for name in self.regions], dtype=np.int16
+        )
+        with self._roi_lock:
+            self._rois = (self.wide_rects.copy(), np.ones(len(self.regions), dtype=np.float32),
+                          np.zeros(len(self.regions), dtype=bool))
+
+    @property
+    def region_rects(self) -> np.ndarray:
+        """当前使用的区域 [x, y, w, h]（只读）"""
+        return self._rois[0]
+
+    @property
+    def region_scales(self) -> np.ndarray:
+        """校准得到的界面缩放（只读）"""
+        return self._rois[1]
+
+    @property
+    def region_calibrated(self) -> np.ndarray:
+        """各区域是否已校准（只读）"""
+        return self._rois[2]
+
+    def region_roi(self, region_id: int) -> Tuple[List[int], float]:
+        """当前使用的区域与缩放，两者来自同一次更新"""
+        rects, scales, _ = self._rois
+        return rects[region_id].tolist(), float(scales[region_id])
+
+    def _set_roi(self, region_id: int, rect, scale: float, calibrated: bool) -> None:
+        """复制后修改，再整体替换引用"""
+        with self._roi_lock:
+            rects, scales, flags = (array.copy() for array in self._rois)
+            rects[region_id] = rect
+            scales[region_id] = scale
+            flags[region_id] = calibrated
+            self._rois = (rects, scales, flags)
+
+    def apply_roi(self, region_id: int, rect: List[int], scale: float) -> None:
+        """使用校准后的紧凑区域与缩放"""
+        self._set_roi(region_id, rect, scale, True)
+
+    def reset_roi(self, region_id: int) -> None:
+        """恢复配置中的原始区域"""
+        self._set_roi(region_id, self.wide_rects[region_id], 1.0, False)
+
+    def category_of(self, region: str) -> int:
+        """获取区域所属的类别编号"""
+        return self.category_ids.get(region.split('_')[0], -1)
+
+    def category_label_names(self, category_id: int) -> List[Tuple[int, str]]:
+        """获取类别下全部标签 [(标签编号, 标签名)]"""
+        return [(int(label_id), self.labels[label_id]) for label_id in self.category_labels[category_id]]
+
+    def label_id(self, name: str) -> int:
+        """标签名转编号，未知标签视为 none"""
+        return self.label_ids.get(name, NONE_ID)
+
+    def label_name(self, label_id: int) -> str:
+        """编号转标签名"""
+        return self.labels[label_id] if 0 <= label_id < len(self.labels) else NONE_LABEL
+
+    def display_name(self, name: str) -> str:
+        """标签名转显示名称"""
+        label_id = self.label_ids.get(name)
+        return self.display_names[label_id] if label_id is not None else name
+
+    def lua_literal(self, value) -> str:
+        """标签名转 Lua 字面量，非标签值按字符串输出"""
+        label_id = self.label_ids.get(value)
+        return self.lua_literals[label_id] if label_id is not None else f'"{value}"'
+
+    def template_paths(self, category: str) -> List[Tuple[int, Path]]:
+        """获取类别下存在的模板文件
+
+        Returns:
+            List[Tuple[int, Path]]: [(标签编号, 模板路径)]
+        """
+        if self.template_dir is None or category not in self.category_ids:
+            return []
+        folder = self.template_dir / category
+        result = []
+        for label_id in self.category_labels[self.category_ids[category]]:
+            path = folder / f"{self.labels[label_id]}.png"
+            if path.is_file():
+                result.append((int(label_id), path))
+        return result
+
+    def new_region_array(self) -> np.ndarray:
+        """创建与区域表等长、全部未识别的结果数组"""
+        return np.full(len(self.regions), UNSET_ID, dtype=np.int16)
+
+    def to_results(self, label_ids: np.ndarray) -> Dict[str, str]:
+        """将区域结果数组转换为 {区域名: 标签名}，未识别的区域不输出"""
+        return {
+            self.regions[i]: self.labels[label_id]
+            for i, label_id in enumerate(label_ids.tolist())
+            if label_id != UNSET_ID
+        }
@@ -0,0 +1,129 @@
+import ctypes
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def _linux_thread_times() -> Dict[int, Tuple[str, float]]:
+    """{线程号: (线程名, CPU 秒)}，读取 /proc/self/task"""
+    tick = os.sysconf('SC_CLK_TCK')
+    result = {}
+    for tid in os.listdir('/proc/self/task'):
+        try:
+            with open(f'/proc/self/task/{tid}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue  # 线程已退出
+        name = stat[stat.index('(') + 1:stat.rindex(')')]
+        fields = stat[stat.rindex(')') + 2:].split()
+        # 括号后从第3个字段（state）开始，utime/stime 为第14、15个字段
+        result[int(tid)] = (name, (int(fields[11]) + int(fields[12])) / tick)
+    return result
+
+
+def _windows_thread_times() -> Dict[int, Tuple[str, float]]:
+    """{线程号: (线程名, CPU 秒)}，只包含 Python 创建的线程"""
+    kernel32 = ctypes.windll.kernel32
+    result = {}
+    for thread in threading.enumerate():
+        if thread.native_id is None:
+            continue
+        handle = kernel32.OpenThread(0x1000, False, thread.native_id)  # THREAD_QUERY_LIMITED_INFORMATION
+        if not handle:
+            continue
+        try:
+            creation, exit_, kernel, user = (ctypes.c_ulonglong() for _ in range(4))
+            if kernel32.GetThreadTimes(handle, ctypes.byref(creation), ctypes.byref(exit_),
+                                       ctypes.byref(kernel), ctypes.byref(user)):
+                result[thread.native_id] = (thread.name, (kernel.value + user.value) / 1e7)
+        finally:
+            kernel32.CloseHandle(handle)
+    return result
+
+
+def _windows_rss() -> int:
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return 0
+    return counters.WorkingSetSize
+
+
+def process_rss() -> int:
+    """当前进程常驻内存（字节），无法获取时返回0"""
+    try:
+        if os.name == 'nt':
+            return _windows_rss()
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError, IndexError):
+        return 0
+
+
+def thread_cpu_times() -> Dict[int, Tuple[str, float]]:
+    """各线程累计 CPU 时间，平台不支持时返回空字典"""
+    try:
+        if os.name == 'nt':
+            return _windows_thread_times()
+        return _linux_thread_times()
+    except (OSError, ValueError, AttributeError, IndexError):
+        return {}
+
+
+class ProcessSampler:
+    """进程与各线程的 CPU 占用、常驻内存采样（只依赖标准库）
+
+    CPU 占用按相邻两次采样之间的增量计算，100% 表示占满一个核心。
+    系统 CPU 时间的计时粒度较粗（通常 10~16 毫秒），两次调用间隔小于
+    min_interval 时直接返回上一次的结果。
+    """
+
+    def __init__(self, min_interval: float = 0.2):
+        self.min_interval = min_interval
+        self._last: Optional[Tuple[float, float, Dict[int, Tuple[str, float]]]] = None
+        self._result: Optional[Dict] = None
+
+    def sample(self) -> Dict:
+        now = time.monotonic()
+        if self._result is not None and now - self._last[0] < self.min_interval:
+            return self._result
+        times = os.times()
+        cpu = times.user + times.system
+        threads = thread_cpu_times()
+        names = {thread.native_id: thread.name for thread in threading.enumerate()}
+
+        cpu_percent = 0.0
+        thread_stats: List[Dict] = []
+        if self._last is not None:
+            last_now, last_cpu, last_threads = self._last
+            elapsed = max(now - last_now, 1e-6)
+            cpu_percent = (cpu - last_cpu) / elapsed * 100
+            for tid, (name, seconds) in threads.items():
+                previous = last_threads.get(tid, (name, seconds))[1]
+                thread_stats.append({
+                    "id": tid,
+                    "name": names.get(tid, name),
+                    "cpu_percent": (seconds - previous) / elapsed * 100,
+                    "cpu_time": seconds,
+                })
+            thread_stats.sort(key=lambda item: item["cpu_percent"], reverse=True)
+        self._last = (now, cpu, threads)
+
+        self._result = {
+            "pid": os.getpid(),
+            "cpu_percent": cpu_percent,
+            "cpu_count": os.cpu_count() or 1,
+            "rss": process_rss(),
+            "threads": thread_stats,
+        }
+        return self._result
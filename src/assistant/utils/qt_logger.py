@@ -0,0 +1,116 @@
+import logging
+import sys
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .logger_factory import LoggerFactory
+from ...config.settings import ConfigManager
+
+
+@LoggerFactory.register("qt")
+class QtLogger(QObject):
+    """Qt日志记录器，包含UI信号和文件日志功能"""
+    log_signal = pyqtSignal(str)
+    ui_update_signal = pyqtSignal(dict)
+    close_progress_signal = pyqtSignal(int)
+    perf_signal = pyqtSignal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self.settings = ConfigManager("config")
+        self.logs_path = self.settings.get_path('logs')
+        self.log_config = self.settings.get('logger')
+        self.format_str = self.log_config.get('format', '[%(time)s] [%(level)s] %(message)s')
+        self.time_format = self.log_config.get('time_format', '%H:%M:%S')
+        self.level = getattr(logging, self.log_config.get('level', 'DEBUG'))
+        self._setup_logger()
+
+    def _setup_logger(self):
+        self.logger = logging.getLogger("QtLogger")
+        self.logger.setLevel(getattr(logging, "INFO"))
+
+        # 确保日志目录存在
+        self.logs_path.mkdir(parents=True, exist_ok=True)
+
+        # 文件处理器
+        file_handler = logging.FileHandler(
+            self.logs_path / self.log_config.get('filename', 'app.log'),
+            encoding='utf-8'
+        )
+        file_handler.setLevel(self.level)
+        formatter = logging.Formatter(
+            fmt=self.format_str,
+            datefmt=self.time_format  # 添加日期格式
+        )
+        file_handler.setFormatter(formatter)
+
+        # 控制台处理器
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(self.level)
+        console_handler.setFormatter(formatter)
+
+        self.logger.addHandler(file_handler)
+        self.logger.addHandler(console_handler)
+
+    def debug(self, message: str):
+        self.logger.debug(message)
+        self._emit_ui_log('DEBUG', message)
+
+    def info(self, message: str):
+        self.logger.info(message)
+        self._emit_ui_log('INFO', message)
+
+    def warning(self, message: str):
+        self.logger.warning(message)
+        self._emit_ui_log('WARN', message)
+
+    def error(self, message: str):
+        self.logger.error(message)
+        self._emit_ui_log('ERROR', message)
+
+    def log_batch(self, records: list):
+        """写入一批来自其他进程的日志，界面只追加一次
+
+        Args:
+            records: [(级别, 时间, 消息), ...]
+        """
+        lines = []
+        for level, asctime, message in records:
+            self.logger.log(getattr(logging, 'WARNING' if level == 'WARN' else level, logging.INFO), message)
+            lines.append(self.format_str % {'asctime': asctime, 'levelname': level, 'message': message})
+        if lines:
+            self.log_signal.emit("\n".join(lines))
+
+    def close_progress(self, progress: int):
+        self.close_progress_signal.emit(progress)
+
+    def update_ui(self, ui_data: dict):
+        self.ui_update_signal.emit(ui_data)
+
+    def update_perf(self, perf_data: dict):
+        self.perf_signal.emit(perf_data)
+
+    def cleanup(self):
+        for handler in self.logger.handlers[:]:
+            handler.close()
+            self.logger.removeHandler(handler)
+
+    def _get_time(self) -> str:
+        """获取当前时间字符串"""
+        from datetime import datetime
+        return datetime.now().strftime(self.time_format)
+
+    def _emit_ui_log(self, level: str, message: str):
+        """发送UI日志
+        
+        Args:
+            level: 日志级别
+            message: 日志消息
+        """
+        log_data = {
+            'asctime': self._get_time(),
+            'levelname': level,
+            'message': message
+        }
+
+        self.log_signal.emit(self.format_str % log_data)
@@ -0,0 +1,87 @@
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """启动耗时分析器（单例模式）
+
+    通过包装 builtins.__import__ 记录每个模块首次导入的耗时（含子模块），
+    并通过 phase() 记录各初始化阶段的耗时。未启用时所有方法均为空操作。
+    """
+    _instance: Optional['StartupProfiler'] = None
+
+    @classmethod
+    def get_instance(cls) -> 'StartupProfiler':
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.perf_counter()
+        self.imports: Dict[str, float] = {}
+        self.phases: List[Tuple[str, float, float]] = []  # (阶段, 开始偏移, 耗时)
+        self._original_import = None
+
+    def enable(self) -> None:
+        """开始记录导入与阶段耗时"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self) -> None:
+        """停止记录导入耗时"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 只统计首次加载的模块，已加载模块直接放行
+        full_name = name
+        if level > 0:
+            try:
+                full_name = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+        if full_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.imports.setdefault(full_name, time.perf_counter() - start)
+
+    @contextmanager
+    def phase(self, name: str):
+        """记录一个初始化阶段的耗时"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.start_time, time.perf_counter() - start))
+
+    def report(self, top: int = 25) -> str:
+        """生成启动耗时报告
+
+        Args:
+            top: 输出耗时最长的导入数量
+        """
+        total = time.perf_counter() - self.start_time
+        lines = [f"启动耗时: {total * 1000:.1f} ms", "", "阶段:"]
+        for name, offset, duration in self.phases:
+            lines.append(f"  {name:<28} +{offset * 1000:8.1f} ms  {duration * 1000:8.1f} ms")
+        lines += ["", f"导入（前 {top} 项，含子模块）:"]
+        for name, duration in sorted(self.imports.items(), key=lambda x: -x[1])[:top]:
+            lines.append(f"  {name:<40} {duration * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -3,33 +3,44 @@
 import multiprocessing
 import sys
 import traceback
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from PyQt5.QtWidgets import QApplication, QMessageBox
-
-from src.assistant.ui.main_window import MainWindow
-from src.assistant.utils.logger_factory import LoggerFactory
+from src.assistant.utils.startup_profiler import StartupProfiler
 from src.config.settings import ConfigManager
 
+if TYPE_CHECKING:
+    from PyQt5.QtWidgets import QApplication
+    from src.assistant.ui.main_window import MainWindow
+
+PROFILE_STARTUP_FLAG = "--profile-startup"
+
 
 class Application:
     """应用程序主类"""
     def __init__(self):
-        self.app: Optional[QApplication] = None
-        self.window: Optional[MainWindow] = None
+        self.app: Optional['QApplication'] = None
+        self.window: Optional['MainWindow'] = None
         self.capture_daemon = None  # 添加 capture_daemon 属性
+        self.profiler = StartupProfiler.get_instance()
         # 1. 初始化配置（全局单例）
-        self.settings = ConfigManager("config")
+        with self.profiler.phase("加载配置"):
+            self.settings = ConfigManager("config")
         # 2. 初始化日志（全局单例）
-        self.logger = LoggerFactory.get_logger()
+        with self.profiler.phase("初始化日志"):
+            from src.assistant.utils.logger_factory import LoggerFactory
+            self.logger = LoggerFactory.get_logger()
 
     def initialize(self) -> bool:
         """初始化应用程序组件"""
         try:
 
             # 4. 初始化UI
-            self.app = QApplication(sys.argv)
-            self.window = MainWindow()
+            with self.profiler.phase("创建 QApplication"):
+                from PyQt5.QtWidgets import QApplication
+                self.app = QApplication(sys.argv)
+            with self.profiler.phase("创建主窗口"):
+                from src.assistant.ui.main_window import MainWindow
+                self.window = MainWindow()
             width = self._get_screen_width()
             height = self._get_screen_height()
             self.settings.set('screen', 'width', width)
@@ -40,6 +51,12 @@ class Application:
             capture_config.set('frame_shape', 'height', height)
             capture_config.save()
 
+            # 核心在子进程中运行时提前拉起，开启识别时无需等待导入
+            if self.settings.get('core', 'mode', 'thread') == 'process':
+                with self.profiler.phase("启动核心进程"):
+                    from src.assistant.core.core_process import CoreProcess
+                    CoreProcess.get_instance().launch()
+
             # 应用窗口设置
             window_settings = self.settings.get('window')
             
@@ -69,7 +86,13 @@ class Application:
 
             # 显示主窗口
             if self.window:
-                self.window.show()
+                with self.profiler.phase("显示主窗口"):
+                    self.window.show()
+
+            # 事件循环第一次空闲时输出启动报告
+            if self.profiler.enabled:
+                from PyQt5.QtCore import QTimer
+                QTimer.singleShot(0, self._report_startup)
 
             # 进入事件循环
             return self.app.exec_()
@@ -81,9 +104,26 @@ class Application:
         finally:
             self.cleanup()
 
+    def _report_startup(self):
+        """输出启动耗时报告"""
+        self.profiler.disable()
+        report = self.profiler.report()
+        print(report)
+        try:
+            report_path = self.settings.get_path('logs') / 'startup_profile.txt'
+            report_path.write_text(report, encoding='utf-8')
+            self.logger.info(f"启动耗时报告已保存到: {report_path}")
+        except Exception as e:
+            self.logger.error(f"保存启动耗时报告失败: {e}")
+
     def cleanup(self):
         """清理资源"""
         try:
+            # 关闭核心进程
+            if 'src.assistant.core.core_process' in sys.modules:
+                from src.assistant.core.core_process import CoreProcess
+                CoreProcess.get_instance().shutdown()
+
             # 清理日志
             if self.logger:
                 self.logger.cleanup()
@@ -98,6 +138,7 @@ class Application:
     def _show_error(self, title: str, message: str):
         """显示错误对话框"""
         if self.app:
+            from PyQt5.QtWidgets import QMessageBox
             error_box = QMessageBox()
             error_box.setIcon(QMessageBox.Critical)
             error_box.setWindowTitle(title)
@@ -126,7 +167,11 @@ def main():
     if getattr(sys, 'frozen', False):
         # 如果是打包后的程序，确保multiprocessing正常工作
         multiprocessing.freeze_support()
-    
+
+    if PROFILE_STARTUP_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_STARTUP_FLAG)
+        StartupProfiler.get_instance().enable()
+
     app = Application()
 
     try:
@@ -1,21 +1,43 @@
 import threading
 import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
 
 import numpy as np
 
+from ..utils.backend_health import CaptureHealth
 from ..utils.process_logger import ProcessLogger
+from ..utils.rate_policy import CaptureRatePolicy
 from ...config.settings import ConfigManager
 
 
+@dataclass(frozen=True)
+class Frame:
+    """一帧截图及其元数据"""
+    image: np.ndarray
+    timestamp: float  # 开始截图时的 time.monotonic()，画面内容不早于该时刻
+    seq: int  # 后端内递增的帧序号
+    backend: str  # 截图后端名称
+
+    def is_newer(self, after: Optional[float] = None, after_seq: Optional[int] = None) -> bool:
+        """是否在指定时刻之后开始截取、且序号大于指定序号"""
+        return ((after is None or self.timestamp >= after)
+                and (after_seq is None or self.seq > after_seq))
+
+
 class BaseCapture(ABC):
-    """截图基类"""
-    _instances = {}  # 用于存储各个子类的实例
-    _locks = {}  # 为每个子类存储独立的锁
+    """截图基类
+
+    get_instance() 返回按配置创建的默认实例（其帧率修改会写回配置）；
+    截图会话直接构造实例，各自拥有显示器、区域、帧率与帧缓存。
+    """
+    _instances = {}  # 各子类的默认实例
+    _locks = {}  # 为每个子类存储独立的锁（只用于创建默认实例）
 
     @classmethod
     def get_instance(cls) -> 'BaseCapture':
-        """获取单例实例"""
+        """获取默认实例"""
         # 为每个子类创建独立的锁
         if cls not in cls._locks:
             cls._locks[cls] = threading.Lock()
@@ -24,22 +46,122 @@ class BaseCapture(ABC):
         if cls not in cls._instances:
             with cls._locks[cls]:
                 if cls not in cls._instances:
-                    cls._instances[cls] = cls()
-                    cls._instances[cls].initialize()
+                    instance = cls()
+                    instance.persist_settings = True
+                    instance.initialize()
+                    cls._instances[cls] = instance
         return cls._instances[cls]
 
-    def __init__(self):
+    @classmethod
+    def release_instance(cls) -> None:
+        """释放默认实例（切换后端后释放未使用的后端资源）"""
+        lock = cls._locks.get(cls)
+        if lock is None:
+            return
+        with lock:
+            instance = cls._instances.pop(cls, None)
+        if instance is not None:
+            with instance._lock:
+                instance.cleanup()
+
+    def __init__(self, monitor: Optional[int] = None, roi: Optional[Sequence[int]] = None,
+                 fps: Optional[float] = None):
+        """
+        Args:
+            monitor: 显示器编号（从1开始，与 mss.monitors 一致），None 时读取配置
+            roi: 显示器内的截取区域 [x, y, w, h]，None 表示整个显示器
+            fps: 最大帧率，None 时读取配置
+        """
         self.settings = ConfigManager("capture_config")
         self.logger = ProcessLogger.get_instance()
         self.method = 'base'  # 子类需要覆盖这个属性
+        self.monitor = monitor if monitor is not None else self.settings.get('capture', 'monitor', 1)
+        self.roi = tuple(int(v) for v in roi) if roi is not None else None
+        self.persist_settings = False  # 只有默认实例把帧率写回配置
+        self._lock = threading.Lock()
 
         # 添加截屏频率控制
-        self.min_capture_interval = 1.0 / self.settings.get('capture', 'fps', 60)  # 默认最大60fps
+        fps = fps if fps is not None else self.settings.get('capture', 'fps', 60)  # 默认最大60fps
+        self.min_capture_interval = 1.0 / fps
+        self.rate_policy = self._create_rate_policy(fps)
+        self.health = CaptureHealth()
         self._initialized = False
 
         # 添加帧缓存
         self._frame_cache = None
+        self._frame: Optional[Frame] = None
+        self._seq = 0
         self.last_capture_time = 0
+        # capture() 返回先前截取的画面时，由子类设置为该画面开始截取的 time.monotonic()
+        self.image_timestamp: Optional[float] = None
+        self.last_error: Optional[str] = None  # 最近一次 grab() 的错误，暂无新画面不算错误
+
+    def _create_rate_policy(self, fps: float):
+        """按 rate_policy 配置创建按需帧率策略，fps 作为峰值帧率"""
+        policy = self.settings.get('rate_policy', default={}) or {}
+        if not policy.get('enabled', False):
+            return None
+        return CaptureRatePolicy(
+            max_fps=fps,
+            idle_fps=policy.get('idle_fps', 1.0),
+            hold=policy.get('hold', 1.0),
+            decay=policy.get('decay', 0.5)
+        )
+
+    def demand(self):
+        """有新的截图需求（Tab、右键、识别进行中），立即提升到峰值帧率"""
+        if self.rate_policy is not None:
+            self.rate_policy.demand()
+
+    def crop_roi(self, image: np.ndarray) -> np.ndarray:
+        """按截取区域裁剪整屏图像（返回视图）"""
+        if self.roi is None:
+            return image
+        x, y, w, h = self.roi
+        return image[y:y + h, x:x + w]
+
+    def _store(self, image: np.ndarray, timestamp: float) -> Frame:
+        """登记新帧（调用方持有锁），后端给出了画面实际截取时刻时以其为准"""
+        self.last_capture_time = timestamp  # 频率限制按本次截图调用的时刻计算
+        if self.image_timestamp is not None:
+            timestamp = min(timestamp, self.image_timestamp)
+            self.image_timestamp = None
+        self._seq += 1
+        frame = Frame(image, timestamp, self._seq, self.method)
+        self._frame = frame
+        self._frame_cache = image
+        return frame
+
+    def grab(self) -> Optional[np.ndarray]:
+        """执行一次实际截图并记录运行状况（调用方持有锁或独占实例）
+
+        capture() 抛出异常计为失败；返回None表示暂无新画面，单独统计
+        """
+        start = time.perf_counter()
+        self.image_timestamp = None
+        self.last_error = None
+        try:
+            image = self.capture()
+        except Exception as e:
+            self.logger.error(f"{self.method} 截图失败: {e}")
+            self.last_error = str(e) or type(e).__name__
+            self.health.record(False)
+            return None
+        if image is None:
+            self.health.record_idle()
+        else:
+            self.health.record(True, time.perf_counter() - start)
+        return image
+
+    @property
+    def latest_frame(self) -> Optional[Frame]:
+        """最近一帧（可能已过时）"""
+        return self._frame
+
+    def held_frames(self) -> list:
+        """当前持有的帧缓冲（内存统计用，同一数组可能出现多次）"""
+        frame = self._frame
+        return [self._frame_cache, frame.image if frame is not None else None]
 
     def safe_capture(self) -> np.ndarray:
         """带频率限制和资源管理的安全截图方法，使用缓存而不是sleep
@@ -47,35 +169,105 @@ class BaseCapture(ABC):
         Returns:
             numpy.ndarray: 如果成功，返回图像数组；如果失败，返回None
         """
-        current_time = time.time()
+        frame = self.capture_frame()
+        return frame.image if frame is not None else None
+
+    def capture_frame(self) -> Optional[Frame]:
+        """带频率限制的截图，距上次截图不足最小间隔时返回缓存帧
+
+        Returns:
+            Frame: 帧对象（可通过 timestamp/seq 判断是否为缓存帧）；失败返回None
+        """
+        current_time = time.monotonic()
 
         # 使用类的锁确保线程安全
-        with self.__class__._locks[self.__class__]:
+        with self._lock:
             if not self._initialized and not self.initialize():
                 return None
 
-            try:
-                # 检查是否需要进行新的捕获
-                if (current_time - self.last_capture_time) >= self.min_capture_interval:
-                    # 执行实际的捕获
-                    frame = self.capture()
-                    if frame is not None:
-                        self._frame_cache = frame
-                        self.last_capture_time = current_time
+            # 检查是否需要进行新的捕获
+            interval = (self.rate_policy.interval() if self.rate_policy is not None
+                        else self.min_capture_interval)
+            if (current_time - self.last_capture_time) >= interval:
+                # 执行实际的捕获
+                image = self.grab()
+                if image is None:
+                    return None
+                if self.rate_policy is not None:
+                    self.rate_policy.record_capture()
+                return self._store(image, current_time)
+            # 返回缓存的帧
+            self.health.cached += 1
+            return self._frame
+
+    def wait_frame(self, after: Optional[float] = None, after_seq: Optional[int] = None,
+                   timeout: float = 1.0, poll_interval: float = 0.002) -> Optional[Frame]:
+        """等待第一帧在 after 时刻之后开始截取（或序号大于 after_seq）的新画面
+
+        已有满足条件的帧时直接返回；否则绕过频率限制立即截图，后端暂无新画面
+        （如 DXGI 桌面未刷新）时每 poll_interval 秒重试，直到超时。
+
+        Args:
+            after: time.monotonic() 时刻
+            after_seq: 帧序号
+            timeout: 超时时间（秒）
+            poll_interval: 重试间隔（秒）
+        Returns:
+            Frame: 满足条件的第一帧，超时返回None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            frame = self._frame
+            if frame is not None and frame.is_newer(after, after_seq):
+                return frame
+            with self._lock:
+                # 等锁期间其他线程可能已经截到新帧
+                frame = self._frame
+                if frame is not None and frame.is_newer(after, after_seq):
                     return frame
-                else:
-                    # 返回缓存的帧
-                    return self._frame_cache
+                if not self._initialized and not self.initialize():
+                    return None
+                start = time.monotonic()
+                image = self.grab()
+                if image is not None:
+                    if self.rate_policy is not None:
+                        self.rate_policy.record_capture()
+                    frame = self._store(image, start)
+                    if frame.is_newer(after, after_seq):
+                        return frame
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def capture_burst(self, count: int, interval: float = 0.0) -> List[np.ndarray]:
+        """连续抓取多帧（绕过频率限制），用于怀疑结果变化时的多帧投票
 
-            except Exception as e:
-                self.logger.error(f"{self.method} 截图失败: {e}")
-                return self._frame_cache  # 发生错误时返回缓存的帧
+        Args:
+            count: 帧数
+            interval: 相邻两次抓取的间隔（秒）
+        Returns:
+            List[numpy.ndarray]: 成功抓取的帧
+        """
+        frames = []
+        for i in range(count):
+            with self._lock:
+                if not self._initialized and not self.initialize():
+                    break
+                start = time.monotonic()
+                image = self.grab()
+                if image is not None:
+                    frames.append(self._store(image, start).image)
+            if interval > 0 and i < count - 1:
+                time.sleep(interval)
+        return frames
 
     def set_fps(self, fps: int):
         """设置FPS"""
         self.min_capture_interval = 1.0 / fps
-        self.settings.set('capture', 'fps', fps)
-        self.settings.save()
+        if self.rate_policy is not None:
+            self.rate_policy.set_max_fps(fps)
+        if self.persist_settings:
+            self.settings.set('capture', 'fps', fps)
 
     def get_fps(self) -> int:
         """获取FPS"""
@@ -87,8 +279,8 @@ class BaseCapture(ABC):
         pass
 
     @abstractmethod
-    def capture(self) -> np.ndarray:
-        """执行截图"""
+    def capture(self) -> Optional[np.ndarray]:
+        """执行截图：返回 BGR 或 BGRA 图像，暂无新画面时返回None，出错时抛出异常"""
         pass
 
     @abstractmethod
@@ -1,22 +1,30 @@
 import ctypes
+import threading
+import time
 from ctypes import c_void_p, c_bool, c_uint, c_ulonglong, POINTER, c_ubyte
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
 
 import numpy as np
 
 from .base_capture import BaseCapture
+from ..utils.process_logger import ProcessLogger
+from ..utils.shared_resource import SharedResource
 
 
-class DXGICapture(BaseCapture):
-    def __init__(self):
-        super().__init__()
-        self.method = 'dxgi'
+class DXGIDevice:
+    """进程内共享的 DXGI 桌面复制实例
 
-        # 从配置文件获取分辨率
-        self.target_width = self.settings.get('frame_shape', 'width', 2560)  # 默认1920
-        self.target_height = self.settings.get('frame_shape', 'height', 1440)  # 默认1080
+    DLL 只复制主显示器，且同一时刻只需要一个复制实例：多个截图会话共享同一设备，
+    按引用计数创建和释放。桌面没有刷新时 GetNextFrameData 不返回新帧，
+    所以设备保留最近一帧及其截取时刻，其他会话尚未取走的新帧仍可以拿到，
+    并按实际截取时刻（而不是取走的时刻）判断新旧。
+    """
+
+    def __init__(self, dll_path: Path, width: int, height: int):
+        self.logger = ProcessLogger.get_instance()
 
         # 加载 DLL
-        dll_path = self.settings.get_path('dll') / 'CaptureScreen.dll'
         self.dll = ctypes.CDLL(str(dll_path))
 
         # 设置函数参数和返回类型
@@ -36,8 +44,8 @@ class DXGICapture(BaseCapture):
 
         # 预先创建捕获帧所需的 ctypes 对象
         self._data_ptr = POINTER(c_ubyte)()
-        self._width = c_uint(self.target_width)  # 使用配置的宽度
-        self._height = c_uint(self.target_height)  # 使用配置的高度
+        self._width = c_uint(width)  # 使用配置的宽度
+        self._height = c_uint(height)  # 使用配置的高度
         self._stride = c_uint()  # stride 需要从DLL获取，因为可能包含内存对齐
         self._timestamp = c_ulonglong()
 
@@ -47,44 +55,52 @@ class DXGICapture(BaseCapture):
             self.logger.error("Failed to create DXGI screen capture instance")
             raise RuntimeError("Failed to create DXGI screen capture instance")
 
+        self._lock = threading.Lock()
         self._initialized = False
-        self.frame_data = np.empty((self.target_height, self.target_width, 4), dtype=np.uint8)  # 预分配数组
+        self.last_frame: Optional[np.ndarray] = None  # 最近一帧 BGRA
+        self.last_timestamp = 0.0  # 最近一帧开始截取时的 time.monotonic()
+        self.seq = 0
 
-    def initialize(self):
+    def initialize(self) -> bool:
         """初始化 DXGI 捕获"""
-        if self._initialized:
-            return True
-        # import cProfile
-        # self.profiler = cProfile.Profile()
-        # self.profiler.enable()  # 开始性能分析
-        if not self.handle:
-            self.logger.error("DXGI handle is null")
-            return False
-
-        self._initialized = self.dll.InitializeCapture(self.handle)
-        if not self._initialized:
-            self.logger.error("Failed to initialize DXGI capture")
-        else:
-            self.logger.info("DXGI capture initialized successfully")
-            # 捕获第一帧以确保初始化完成
-            # first_frame = self.capture()
-            # if first_frame is None:
-            #     self.logger.error("Failed to capture first frame")
-            #     self._initialized = False
-            
-        return self._initialized
-
-    def capture(self):
-        """执行截图
-        
+        with self._lock:
+            if self._initialized:
+                return True
+            if not self.handle:
+                self.logger.error("DXGI handle is null")
+                return False
+
+            self._initialized = self.dll.InitializeCapture(self.handle)
+            if not self._initialized:
+                self.logger.error("Failed to initialize DXGI capture")
+            else:
+                self.logger.info("DXGI capture initialized successfully")
+            return self._initialized
+
+    def grab(self, seen_seq: int) -> Tuple[Optional[np.ndarray], int, float]:
+        """
+        获取比 seen_seq 更新的帧
         Returns:
-            numpy.ndarray: 如果成功，返回 RGB 格式的 numpy 数组
-            None: 如果失败
+            Tuple[Optional[np.ndarray], int, float]: (BGRA 帧, 帧序号, 开始截取该帧时的 time.monotonic())，
+            没有更新的帧时返回 (None, seen_seq, 0.0)；返回的可能是其他会话先前截取、本会话尚未取走的帧
         """
+        with self._lock:
+            start = time.monotonic()
+            frame = self._next_frame()
+            if frame is not None:
+                self.last_frame = frame
+                self.last_timestamp = start
+                self.seq += 1
+            if self.seq > seen_seq and self.last_frame is not None:
+                return self.last_frame, self.seq, self.last_timestamp
+            return None, seen_seq, 0.0
+
+    def _next_frame(self) -> Optional[np.ndarray]:
+        """从 DLL 读取下一帧（调用方持有锁），桌面未刷新时返回None，读取出错时抛出异常"""
         try:
             # 确保指针为空
             self._data_ptr = POINTER(c_ubyte)()
-            
+
             success = self.dll.GetNextFrameData(
                 self.handle,
                 ctypes.byref(self._data_ptr),
@@ -104,12 +120,7 @@ class DXGICapture(BaseCapture):
 
                 # 重塑数组为正确的维度 (BGRA)
                 actual_width = self._stride.value // 4  # BGRA 格式，每像素4字节
-                frame = frame_data.reshape(self._height.value, actual_width, 4)
-
-                # 转换 BGRA 为 RGB (去掉 alpha 通道并调换通道顺序)
-                rgb_frame = frame[..., [2, 1, 0]].copy()  # 创建副本以确保内存安全
-
-                return rgb_frame
+                return frame_data.reshape(self._height.value, actual_width, 4)
 
             finally:
                 # 确保在任何情况下都释放内存
@@ -118,18 +129,73 @@ class DXGICapture(BaseCapture):
                     self._data_ptr = POINTER(c_ubyte)()
 
         except Exception as e:
-            self.logger.error(f"捕获屏幕失败: {e}")
+            raise RuntimeError(f"DXGI 读取帧失败: {e}") from e
+
+    def close(self) -> None:
+        """释放复制实例"""
+        with self._lock:
+            if self.handle:
+                try:
+                    self.dll.DestroyScreenCapture(self.handle)
+                except Exception:
+                    pass
+                self.handle = None
+                self._initialized = False
+
+
+class DXGICapture(BaseCapture):
+    """使用 DXGI 桌面复制的截图实现（仅主显示器，可指定区域）"""
+
+    def __init__(self, monitor: Optional[int] = None, roi: Optional[Sequence[int]] = None,
+                 fps: Optional[float] = None):
+        super().__init__(monitor, roi, fps)
+        self.method = 'dxgi'
+        if self.monitor != 1:
+            raise ValueError(f"DXGI 截图只支持主显示器，无法截取显示器 {self.monitor}")
+
+        # 从配置文件获取分辨率
+        width = self.settings.get('frame_shape', 'width', 2560)  # 默认1920
+        height = self.settings.get('frame_shape', 'height', 1440)  # 默认1080
+        dll_path = self.settings.get_path('dll') / 'CaptureScreen.dll'
+        self._device_key = ('dxgi', str(dll_path))
+        self.device: Optional[DXGIDevice] = SharedResource.acquire(
+            self._device_key, lambda: DXGIDevice(dll_path, width, height), DXGIDevice.close)
+        self._device_seq = 0
+
+    def initialize(self):
+        """初始化 DXGI 捕获"""
+        if self.device is None:
+            return False
+        self._initialized = self.device.initialize()
+        return self._initialized
+
+    def capture(self):
+        """执行截图
+
+        Returns:
+            numpy.ndarray: 如果成功，返回 BGR 格式的 numpy 数组
+            None: 如果没有新画面（读取出错时抛出异常）
+        """
+        if self.device is None:
+            raise RuntimeError("DXGI 设备已释放")
+        frame, self._device_seq, timestamp = self.device.grab(self._device_seq)
+        if frame is None:
             return None
+        self.image_timestamp = timestamp
+        # 先裁剪再去掉 alpha 通道，与其他后端一致保持 BGR 通道顺序（模板与通道模式均按 BGR 处理）
+        return self.crop_roi(frame)[..., :3].copy()  # 创建副本以确保内存安全
+
+    def held_frames(self) -> list:
+        """当前持有的帧缓冲，包括共享设备保留的最近一帧 BGRA 原图"""
+        device = self.device
+        return super().held_frames() + [device.last_frame if device is not None else None]
 
     def cleanup(self):
-        """释放资源"""
-        if hasattr(self, 'handle') and self.handle:
-            try:
-                self.dll.DestroyScreenCapture(self.handle)
-                self.handle = None
-                self._initialized = False
-            except:
-                pass
+        """释放对共享设备的引用"""
+        if getattr(self, 'device', None) is not None:
+            self.device = None
+            self._initialized = False
+            SharedResource.release(self._device_key)
 
     def __del__(self):
         """析构函数，确保资源被正确释放"""
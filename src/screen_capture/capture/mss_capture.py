@@ -1,3 +1,5 @@
+from typing import Optional, Sequence
+
 import mss
 import numpy as np
 
@@ -5,13 +7,14 @@ from .base_capture import BaseCapture
 
 
 class MSSCapture(BaseCapture):
-    """使用MSS的截图实现"""
+    """使用MSS的截图实现（每个实例持有自己的 mss 对象，可指定显示器与区域）"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, monitor: Optional[int] = None, roi: Optional[Sequence[int]] = None,
+                 fps: Optional[float] = None):
+        super().__init__(monitor, roi, fps)
         self.method = 'mss'
         self.mss = None
-        self.monitor = None
+        self.region = None
         self.initialize()
 
     def initialize(self) -> bool:
@@ -22,8 +25,15 @@ class MSSCapture(BaseCapture):
                 self.cleanup()
 
             self.mss = mss.mss()
-            # 获取主显示器
-            self.monitor = self.mss.monitors[1]  # monitors[0]是所有显示器的组合
+            # monitors[0]是所有显示器的组合
+            monitor = self.mss.monitors[self.monitor]
+            if self.roi is None:
+                self.region = dict(monitor)
+            else:
+                x, y, w, h = self.roi
+                self.region = {"left": monitor["left"] + x, "top": monitor["top"] + y,
+                               "width": w, "height": h}
+            self._initialized = True
             return True
         except Exception as e:
             self.logger.error(f"初始化MSS截图失败: {e}")
@@ -35,16 +45,15 @@ class MSSCapture(BaseCapture):
             # 如果 mss 实例不存在，重新初始化
             if self.mss is None:
                 if not self.initialize():
-                    return None
+                    raise RuntimeError("MSS 初始化失败")
 
-            # 截取全屏，直接返回BGRA格式
-            return np.array(self.mss.grab(self.monitor))
+            # 只截取目标区域，直接返回BGRA格式
+            return np.array(self.mss.grab(self.region))
 
-        except Exception as e:
-            self.logger.error(f"MSS截图失败: {str(e)}")
-            # 发生错误时清理并重新初始化
+        except Exception:
+            # 发生错误时清理并重新初始化（错误由 grab() 记录）
             self.cleanup()
-            return None
+            raise
 
     def cleanup(self):
         """清理MSS资源"""
@@ -52,6 +61,7 @@ class MSSCapture(BaseCapture):
             if self.mss is not None:
                 self.mss.close()
                 self.mss = None
-                self.monitor = None
+                self.region = None
+            self._initialized = False
         except Exception as e:
             self.logger.error(f"清理MSS截图资源失败: {e}")
@@ -1,4 +1,7 @@
+from typing import Optional, Sequence
+
 import numpy as np
+import win32api
 import win32con
 import win32gui
 import win32ui
@@ -7,10 +10,11 @@ from .base_capture import BaseCapture
 
 
 class Win32Capture(BaseCapture):
-    """使用Win32 API的截图实现"""
+    """使用Win32 API的截图实现（从桌面窗口复制指定显示器/区域）"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, monitor: Optional[int] = None, roi: Optional[Sequence[int]] = None,
+                 fps: Optional[float] = None):
+        super().__init__(monitor, roi, fps)
         self.method = 'win32'
         self.hwnd = None
         self.hwndDC = None
@@ -18,8 +22,29 @@ class Win32Capture(BaseCapture):
         self.saveDC = None
         self.screen_width = self.settings.get('capture', 'screen_width', 2560)
         self.screen_height = self.settings.get('capture', 'screen_height', 1440)
+        self.origin = (0, 0)
+        self._locate()
         self.initialize()
 
+    def _locate(self) -> None:
+        """按显示器编号与截取区域计算复制的起点和尺寸
+
+        1 号显示器为主显示器（原点、配置的屏幕尺寸）；其他编号按系统枚举顺序查询，
+        查询失败时退回主显示器。
+        """
+        if self.monitor != 1:
+            try:
+                monitors = win32api.EnumDisplayMonitors()
+                left, top, right, bottom = monitors[self.monitor - 1][2]
+                self.origin = (left, top)
+                self.screen_width, self.screen_height = right - left, bottom - top
+            except Exception as e:
+                self.logger.error(f"获取显示器 {self.monitor} 区域失败: {e}")
+        if self.roi is not None:
+            x, y, w, h = self.roi
+            self.origin = (self.origin[0] + x, self.origin[1] + y)
+            self.screen_width, self.screen_height = w, h
+
     def initialize(self) -> bool:
         """初始化截图资源"""
         try:
@@ -43,10 +68,10 @@ class Win32Capture(BaseCapture):
             saveBitMap.CreateCompatibleBitmap(self.mfcDC, self.screen_width, self.screen_height)
             self.saveDC.SelectObject(saveBitMap)
 
-            # 复制全屏内容到位图
+            # 复制目标区域内容到位图
             self.saveDC.BitBlt(
                 (0, 0), (self.screen_width, self.screen_height),
-                self.mfcDC, (0, 0),
+                self.mfcDC, self.origin,
                 win32con.SRCCOPY
             )
 
@@ -63,7 +88,7 @@ class Win32Capture(BaseCapture):
             return img
 
         except Exception as e:
-            self.logger.error(f"Win32截图失败: {e}")
+            raise RuntimeError(f"Win32截图失败: {e}") from e
         finally:
             self.cleanup()
 
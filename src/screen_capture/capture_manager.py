@@ -1,14 +1,25 @@
-from typing import Dict, Type
-
-import numpy as np
+import importlib
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Type, TYPE_CHECKING
 
 from src.config.settings import ConfigManager
-from src.screen_capture.capture.base_capture import BaseCapture
-from src.screen_capture.capture.dxgi_capture import DXGICapture
-from src.screen_capture.capture.mss_capture import MSSCapture
-from src.screen_capture.capture.win32_capture import Win32Capture
+from src.screen_capture.capture_session import CaptureSession
+from src.screen_capture.utils.backend_health import ProbeResult, probe_backend, rank_results
 from src.screen_capture.utils.process_logger import ProcessLogger
 
+if TYPE_CHECKING:
+    import numpy as np
+    from src.screen_capture.capture.base_capture import BaseCapture, Frame
+
+# 截图方式 -> 实现类路径，按名称在首次使用时才导入，
+# 避免未使用的后端（win32gui/win32ui、DXGI ctypes）拖慢启动
+CAPTURE_BACKENDS: Dict[str, str] = {
+    'win32': 'src.screen_capture.capture.win32_capture:Win32Capture',
+    'dxgi': 'src.screen_capture.capture.dxgi_capture:DXGICapture',
+    'mss': 'src.screen_capture.capture.mss_capture:MSSCapture',
+}
+
 
 class CaptureManager:
     """管理不同的截图实现"""
@@ -23,16 +34,17 @@ class CaptureManager:
     def __init__(self):
         if not CaptureManager._initialized:
             self.logger = ProcessLogger.get_instance()
-            self._capture_classes: Dict[str, Type[BaseCapture]] = {
-                'win32': Win32Capture,
-                'dxgi': DXGICapture,
-                'mss': MSSCapture
-            }
-            self._current_method = None
-            self._current_capture = None
+            self._capture_classes: Dict[str, str] = dict(CAPTURE_BACKENDS)
+            self._resolved: Dict[str, Type['BaseCapture']] = {}
+            self._capture_method: Optional['BaseCapture'] = None
             self.settings = ConfigManager("capture_config")
+            # 自动选择与故障切换
+            self._ranking: List[str] = []  # 测速结果从快到慢
+            self._failed: set = set()  # 已判定异常的后端
+            self._failover_lock = threading.Lock()
+            self.selection_reason = ""
+            self._sessions: 'weakref.WeakSet[CaptureSession]' = weakref.WeakSet()
             CaptureManager._initialized = True
-            self.get_capture(self.settings.get('capture', 'method', 'dxgi'))
 
     @classmethod
     def get_instance(cls) -> 'CaptureManager':
@@ -41,26 +53,176 @@ class CaptureManager:
             cls._instance = cls()
         return cls._instance
 
-    def get_capture(self, method: str) -> BaseCapture:
-        """获取指定的截图实现，如果切换方式则清理旧实例"""
+    @property
+    def capture_method(self) -> 'BaseCapture':
+        """当前截图实现，首次访问时才按配置导入并创建"""
+        if self._capture_method is None:
+            if self.settings.get('capture', 'auto_select', False):
+                self.auto_select()
+            else:
+                self.selection_reason = f"使用配置的截图方式 {self.get_method()}"
+                self.get_capture(self.get_method())
+            if self._capture_method is None:
+                raise RuntimeError(f"没有可用的截图后端: {self.selection_reason}")
+        return self._capture_method
+
+    @capture_method.setter
+    def capture_method(self, capture: 'BaseCapture'):
+        self._capture_method = capture
+
+    def active_capture(self) -> Optional['BaseCapture']:
+        """当前截图实现，尚未创建时返回None（不触发创建与自动选择）"""
+        return self._capture_method
+
+    def resolve_capture_class(self, method: str) -> Optional[Type['BaseCapture']]:
+        """按名称导入截图实现类"""
+        if method not in self._resolved:
+            target = self._capture_classes.get(method)
+            if target is None:
+                return None
+            module_name, class_name = target.split(':')
+            self._resolved[method] = getattr(importlib.import_module(module_name), class_name)
+        return self._resolved[method]
+
+    def get_capture(self, method: str) -> 'BaseCapture':
+        """获取指定的截图实现，创建失败时切换到其他可用后端"""
         try:
-            capture_class = self.get_capture_methods().get(method)
+            capture_class = self.resolve_capture_class(method)
             if capture_class:
                 self.capture_method = capture_class.get_instance()
                 return self.capture_method
         except Exception as e:
             self.logger.error(f"获取截图实现失败: {e}")
-            return self.get_capture_methods()['dxgi'].get_instance()
+            self._failed.add(method)
+            self._failover(f"{method} 创建失败: {e}")
+            return self._capture_method
+
+    def probe(self, samples: Optional[int] = None) -> List[ProbeResult]:
+        """逐个创建并测速所有截图后端，无法导入或创建的后端记为不可用"""
+        samples = samples or self.settings.get('capture', 'probe_samples', 10)
+        results = []
+        for method in self._capture_classes:
+            try:
+                capture = self.resolve_capture_class(method).get_instance()
+                results.append(probe_backend(capture, samples))
+            except Exception as e:
+                results.append(ProbeResult(method, error=str(e)))
+        return results
+
+    def auto_select(self) -> 'BaseCapture':
+        """测速所有后端，选择延迟与抖动最低的健康后端，释放其余后端"""
+        health = self.settings.get('health', default={}) or {}
+        results = self.probe()
+        ranked, reason = rank_results(results, health.get('min_success', 0.8))
+        self._ranking = [r.method for r in ranked]
+        self._failed.clear()
+        if ranked:
+            chosen = ranked[0].method
+        else:
+            # 没有健康后端时退回配置的方式，由故障检测继续处理
+            chosen = self.get_method()
+        for result in results:
+            if result.method != chosen and not result.error:
+                try:
+                    self.resolve_capture_class(result.method).release_instance()
+                except Exception as e:
+                    self.logger.warning(f"释放截图后端 {result.method} 失败: {e}")
+        self.get_capture(chosen)
+        self.selection_reason = reason
+        self.logger.info(f"截图后端自动选择: {reason}")
+        return self._capture_method
+
+    def get_selection(self) -> Dict[str, Any]:
+        """当前截图后端、选择原因与运行状况"""
+        capture = self._capture_method
+        return {
+            "method": capture.method if capture is not None else None,
+            "reason": self.selection_reason,
+            "ranking": list(self._ranking),
+            "health": capture.health.stats() if capture is not None else {},
+        }
+
+    def _check_health(self) -> None:
+        """当前后端连续失败或长时间无新画面时切换到下一个后端"""
+        capture = self._capture_method
+        if capture is None:
+            return
+        health = self.settings.get('health', default={}) or {}
+        reason = capture.health.unhealthy_reason(health.get('max_failures', 30),
+                                                 health.get('stall_timeout', 5.0))
+        if reason is not None:
+            self._failed.add(capture.method)
+            self._failover(f"{capture.method} {reason}")
+
+    def _failover(self, reason: str) -> None:
+        """按测速排名（未测速时按注册顺序）切换到第一个可用且能截到画面的后端"""
+        with self._failover_lock:
+            current = self._capture_method
+            if current is not None and current.method not in self._failed:
+                return  # 其他线程已经完成切换
+            candidates = self._ranking + [m for m in self._capture_classes if m not in self._ranking]
+            for method in candidates:
+                if method in self._failed:
+                    continue
+                try:
+                    capture = self.resolve_capture_class(method).get_instance()
+                    result = probe_backend(capture, samples=3, warmup=0)
+                    if result.successes == 0:
+                        raise RuntimeError("试截图失败")
+                    if not result.latencies:
+                        raise RuntimeError("试截图没有返回新画面")
+                except Exception as e:
+                    self._failed.add(method)
+                    self.logger.warning(f"备用截图后端 {method} 不可用: {e}")
+                    continue
+                if current is not None:
+                    capture.set_fps(current.get_fps())
+                    type(current).release_instance()
+                self.capture_method = capture
+                self.selection_reason = f"故障切换到 {method}: {reason}"
+                self.logger.warning(f"截图后端{self.selection_reason}")
+                return
+            # 全部不可用：保留当前后端并重新给所有后端机会
+            self._failed.clear()
+            if current is not None:
+                current.health.reset_stall()
+            self.logger.error(f"截图后端异常且没有可切换的后端: {reason}")
+
+    def open_session(self, method: Optional[str] = None, monitor: Optional[int] = None,
+                     roi: Optional[Sequence[int]] = None, fps: Optional[float] = None) -> CaptureSession:
+        """
+        创建独立的截图会话（不影响默认后端）
+        Args:
+            method: 截图方式，None 时使用当前默认后端的方式
+            monitor: 显示器编号（从1开始）
+            roi: 显示器内的截取区域 [x, y, w, h]
+            fps: 会话的最大帧率
+        Returns:
+            CaptureSession: 截图会话，用完后调用 close()
+        """
+        method = method or (self._capture_method.method if self._capture_method is not None
+                            else self.get_method())
+        session = CaptureSession(self.resolve_capture_class(method), monitor, roi, fps)
+        self._sessions.add(session)
+        return session
+
+    def sessions(self) -> List[CaptureSession]:
+        """仍在使用的截图会话"""
+        return [session for session in list(self._sessions) if not session.closed]
 
-    def get_capture_methods(self) -> Dict[str, Type[BaseCapture]]:
-        """获取所有可用的截图方法
+    def get_capture_methods(self) -> Dict[str, str]:
+        """获取所有可用的截图方法（不会导入具体实现）
         Returns:
-            Dict[str, Type[BaseCapture]]: 键为显示名称，值为截图类
+            Dict[str, str]: 键为显示名称，值为实现类路径
         """
         return self._capture_classes.copy()
 
     def set_fps(self, fps: int):
         """设置FPS"""
+        if self._capture_method is None:
+            # 后端尚未创建，只记录配置，创建时会读取
+            self.settings.set('capture', 'fps', fps)
+            return
         self.capture_method.set_fps(fps)
 
     def get_fps(self) -> int:
@@ -68,18 +230,59 @@ class CaptureManager:
         return self.settings.get('capture', 'fps', 60)
 
     def set_method(self, method: str):
-        """设置截图方式"""
-        self.get_capture(method)
+        """设置截图方式（手动指定后关闭自动选择）"""
+        if self._capture_method is not None:
+            self.get_capture(method)
+            self.selection_reason = f"手动指定截图方式 {method}"
         self.settings.set('capture', 'method', method)
-        self.settings.save()
+        self.settings.set('capture', 'auto_select', False)
 
     def get_method(self) -> str:
         """获取截图方式"""
         return self.settings.get('capture', 'method', 'dxgi')
 
-    def get_frame(self) -> np.ndarray:
+    def get_frame(self) -> 'np.ndarray':
         """获取帧"""
-        return self.capture_method.safe_capture()
+        image = self.capture_method.safe_capture()
+        self._check_health()
+        return image
+
+    def get_frame_info(self) -> Optional['Frame']:
+        """获取帧对象（带时间戳、序号与后端名称，可能是缓存帧）"""
+        frame = self.capture_method.capture_frame()
+        self._check_health()
+        return frame
+
+    def latest_frame(self) -> Optional['Frame']:
+        """最近一帧，不触发截图"""
+        return self.capture_method.latest_frame
+
+    def wait_frame(self, after: Optional[float] = None, after_seq: Optional[int] = None,
+                   timeout: float = 1.0) -> Optional['Frame']:
+        """等待第一帧在 after（time.monotonic() 时刻）之后截取、或序号大于 after_seq 的画面
+
+        Returns:
+            Frame: 满足条件的帧，超时返回None
+        """
+        frame = self.capture_method.wait_frame(after, after_seq, timeout)
+        self._check_health()
+        return frame
+
+    def demand(self):
+        """通知截图后端有新的需求，按需帧率策略立即提升到峰值"""
+        self.capture_method.demand()
+
+    def rate_report(self) -> Optional[str]:
+        """按需帧率策略的统计报告，未启用时返回None"""
+        if self._capture_method is None or self._capture_method.rate_policy is None:
+            return None
+        return self._capture_method.rate_policy.report()
+
+    def get_burst(self, count: int, interval: float = 0.0) -> List['np.ndarray']:
+        """连续获取多帧新画面（不受FPS限制）"""
+        frames = self.capture_method.capture_burst(count, interval)
+        self._check_health()
+        return frames
 
     # def get_frame_cache(self) -> np.ndarray:
     #     """获取帧缓存"""
@@ -0,0 +1,80 @@
+import threading
+from typing import List, Optional, Sequence, Type, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from src.screen_capture.capture.base_capture import BaseCapture, Frame
+
+
+class CaptureSession:
+    """独立的截图会话
+
+    每个会话持有自己的后端实例：显示器、截取区域、帧率策略与帧缓存互不影响，
+    可以同时运行多条识别流水线（多显示器、批量回放基准等）。
+    后端之间可共享的资源（如 DXGI 复制实例）由后端按引用计数共享。
+    """
+
+    def __init__(self, capture_class: Type['BaseCapture'], monitor: Optional[int] = None,
+                 roi: Optional[Sequence[int]] = None, fps: Optional[float] = None):
+        """
+        Args:
+            capture_class: 截图实现类
+            monitor: 显示器编号（从1开始），None 时读取配置
+            roi: 显示器内的截取区域 [x, y, w, h]
+            fps: 最大帧率，None 时读取配置
+        """
+        self.capture: 'BaseCapture' = capture_class(monitor=monitor, roi=roi, fps=fps)
+        self._close_lock = threading.Lock()
+        self.closed = False
+        if not self.capture._initialized:
+            self.capture.initialize()
+
+    @property
+    def method(self) -> str:
+        return self.capture.method
+
+    def get_frame(self) -> 'np.ndarray':
+        """获取帧（受会话帧率限制，可能是缓存帧）"""
+        return self.capture.safe_capture()
+
+    def get_frame_info(self) -> Optional['Frame']:
+        """获取帧对象"""
+        return self.capture.capture_frame()
+
+    def latest_frame(self) -> Optional['Frame']:
+        """最近一帧，不触发截图"""
+        return self.capture.latest_frame
+
+    def wait_frame(self, after: Optional[float] = None, after_seq: Optional[int] = None,
+                   timeout: float = 1.0) -> Optional['Frame']:
+        """等待第一帧在 after 之后截取、或序号大于 after_seq 的画面"""
+        return self.capture.wait_frame(after, after_seq, timeout)
+
+    def get_burst(self, count: int, interval: float = 0.0) -> List['np.ndarray']:
+        """连续获取多帧新画面"""
+        return self.capture.capture_burst(count, interval)
+
+    def demand(self) -> None:
+        self.capture.demand()
+
+    def set_fps(self, fps: float) -> None:
+        """设置会话帧率（不写回配置）"""
+        self.capture.set_fps(fps)
+
+    def get_fps(self) -> int:
+        return self.capture.get_fps()
+
+    def close(self) -> None:
+        """释放会话的后端资源"""
+        with self._close_lock:
+            if self.closed:
+                return
+            self.closed = True
+        with self.capture._lock:
+            self.capture.cleanup()
+
+    def __enter__(self) -> 'CaptureSession':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,165 @@
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+class CaptureHealth:
+    """截图后端的运行状况：记录每次实际截图的成败与耗时
+
+    后端正常返回但暂无新画面（如 DXGI 桌面未刷新）单独计入 idle，
+    不算失败，也不计入成功率与连续失败次数；但距上次截到新画面超过
+    stall_timeout 且期间一直在请求画面时，同样判定为异常。
+    """
+
+    def __init__(self, window: int = 256):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)  # 最近成功截图的耗时（毫秒）
+        self.latency_sum = 0.0  # 成功截图的累计耗时（秒）
+        self.timed = 0  # 记录了耗时的成功截图次数
+        self.cached = 0  # 未到截图间隔而返回缓存帧的次数（由截图实例在自身锁内累加）
+        self.attempts = 0
+        self.failures = 0
+        self.idle = 0  # 暂无新画面的次数
+        self.consecutive_failures = 0
+        self.idle_streak = 0  # 上次截到新画面之后暂无新画面的次数
+        self.last_success = time.monotonic()  # 上次截到新画面的时刻
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        """
+        Args:
+            ok: 是否截到画面
+            latency: 本次截图耗时（秒）
+        """
+        with self._lock:
+            self.attempts += 1
+            if ok:
+                if latency is not None:
+                    self.latencies.append(latency * 1000.0)
+                    self.latency_sum += latency
+                    self.timed += 1
+                self.consecutive_failures = 0
+                self.idle_streak = 0
+                self.last_success = time.monotonic()
+            else:
+                self.failures += 1
+                self.consecutive_failures += 1
+
+    def record_idle(self) -> None:
+        """后端正常返回但暂无新画面"""
+        with self._lock:
+            self.attempts += 1
+            self.idle += 1
+            self.idle_streak += 1
+            self.consecutive_failures = 0
+
+    def reset_stall(self) -> None:
+        """重新开始计时（没有可切换的后端时给当前后端新的机会）"""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.idle_streak = 0
+            self.last_success = time.monotonic()
+
+    def unhealthy_reason(self, max_failures: int, stall_timeout: float) -> Optional[str]:
+        """
+        超过 stall_timeout 秒没有截到新画面，且期间连续失败或暂无新画面达到
+        max_failures 次（仍在请求画面）时返回原因，否则返回None
+        """
+        with self._lock:
+            stalled = time.monotonic() - self.last_success
+            if stalled < stall_timeout:
+                return None
+            if self.consecutive_failures >= max_failures:
+                return f"连续 {self.consecutive_failures} 次截图失败，{stalled:.1f} 秒无新画面"
+            if self.idle_streak >= max_failures:
+                return f"{stalled:.1f} 秒无新画面（期间 {self.idle_streak} 次截图均未返回新画面）"
+        return None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "failures": self.failures,
+                "consecutive_failures": self.consecutive_failures,
+                "cached": self.cached,
+                "idle": self.idle,
+                "idle_streak": self.idle_streak,
+                "success_rate": 1 - self.failures / self.attempts if self.attempts else 0.0,
+            }
+
+
+@dataclass
+class ProbeResult:
+    """截图后端的测速结果"""
+    method: str
+    samples: int = 0
+    successes: int = 0  # 没有出错的次数（包括暂无新画面）
+    latencies: List[float] = field(default_factory=list)  # 截到画面的耗时（毫秒）
+    idle_latencies: List[float] = field(default_factory=list)  # 暂无新画面时的调用耗时（毫秒）
+    error: str = ""
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.samples if self.samples else 0.0
+
+    @property
+    def latency_ms(self) -> float:
+        """中位延迟（测速期间画面一直没有变化时使用无新画面调用的耗时）"""
+        latencies = self.latencies or self.idle_latencies
+        return statistics.median(latencies) if latencies else float("inf")
+
+    @property
+    def jitter_ms(self) -> float:
+        """延迟抖动（标准差）"""
+        latencies = self.latencies or self.idle_latencies
+        return statistics.pstdev(latencies) if len(latencies) > 1 else 0.0
+
+    def describe(self) -> str:
+        if self.error:
+            return f"{self.method} 不可用: {self.error}"
+        return (f"{self.method} 延迟 {self.latency_ms:.1f}ms 抖动 {self.jitter_ms:.1f}ms "
+                f"成功率 {self.success_rate:.0%}")
+
+
+def probe_backend(capture, samples: int = 10, warmup: int = 2) -> ProbeResult:
+    """
+    测量截图后端的延迟、抖动与成功率（暂无新画面不算失败，画面静止时也不会降级 DXGI）
+    Args:
+        capture: 已创建的截图实例（BaseCapture）
+        samples: 计入统计的截图次数
+        warmup: 预热次数（不计入统计）
+    Returns:
+        ProbeResult: 测速结果
+    """
+    result = ProbeResult(capture.method)
+    if not capture._initialized and not capture.initialize():
+        result.error = "初始化失败"
+        return result
+    for i in range(warmup + samples):
+        start = time.perf_counter()
+        image = capture.grab()
+        elapsed = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        result.samples += 1
+        if capture.last_error is not None:
+            continue
+        result.successes += 1
+        (result.latencies if image is not None else result.idle_latencies).append(elapsed)
+    return result
+
+
+def rank_results(results: List[ProbeResult], min_success: float) -> Tuple[List[ProbeResult], str]:
+    """
+    按延迟与抖动排序健康的后端
+    Returns:
+        Tuple[List[ProbeResult], str]: (健康后端从快到慢, 选择原因)
+    """
+    healthy = sorted((r for r in results if not r.error and r.success_rate >= min_success),
+                     key=lambda r: r.latency_ms + r.jitter_ms)
+    details = "；".join(r.describe() for r in results)
+    if not healthy:
+        return [], f"没有健康的截图后端（{details}）"
+    return healthy, f"选择 {healthy[0].method}：延迟+抖动最低（{details}）"
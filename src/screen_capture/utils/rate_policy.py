@@ -0,0 +1,98 @@
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+
+class CaptureRatePolicy:
+    """按需求调整的截图频率
+
+    平时保持 idle_fps；收到需求（Tab、右键、识别进行中）时立即升到 max_fps，
+    保持 hold 秒后按半衰期 decay 指数回落到 idle_fps。
+    同时按整数帧率统计处于各频率的时间与实际截图次数。
+    """
+
+    ACCOUNT_STEP = 0.05  # 统计时间的采样步长（秒）
+
+    def __init__(self, max_fps: float = 60, idle_fps: float = 1.0, hold: float = 1.0, decay: float = 0.5):
+        """
+        Args:
+            max_fps: 峰值帧率
+            idle_fps: 空闲帧率
+            hold: 需求出现后保持峰值的时间（秒）
+            decay: 回落半衰期（秒）
+        """
+        self.max_fps = max(max_fps, 0.1)
+        self.idle_fps = max(min(idle_fps, self.max_fps), 0.01)
+        self.hold = hold
+        self.decay = decay
+        self._lock = threading.Lock()
+        self._last_demand = -math.inf
+        self._accounted = time.monotonic()
+        self.time_at_rate: Dict[int, float] = {}
+        self.captures_at_rate: Dict[int, int] = {}
+
+    def demand(self) -> None:
+        """有新的截图需求，立即切换到峰值帧率"""
+        now = time.monotonic()
+        with self._lock:
+            self._account(now)
+            self._last_demand = now
+
+    def fps(self, now: Optional[float] = None) -> float:
+        """当前目标帧率"""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._last_demand - self.hold
+        if elapsed <= 0:
+            return self.max_fps
+        if self.decay <= 0:
+            return self.idle_fps
+        return self.idle_fps + (self.max_fps - self.idle_fps) * 0.5 ** (elapsed / self.decay)
+
+    def interval(self) -> float:
+        """当前最小截图间隔（秒）"""
+        now = time.monotonic()
+        with self._lock:
+            self._account(now)
+            return 1.0 / self.fps(now)
+
+    def record_capture(self) -> None:
+        """记录一次实际截图"""
+        bucket = int(round(self.fps()))
+        with self._lock:
+            self.captures_at_rate[bucket] = self.captures_at_rate.get(bucket, 0) + 1
+
+    def set_max_fps(self, fps: float) -> None:
+        with self._lock:
+            self._account(time.monotonic())
+            self.max_fps = max(fps, 0.1)
+            self.idle_fps = min(self.idle_fps, self.max_fps)
+
+    def _account(self, now: float) -> None:
+        """把上次统计以来的时间按帧率累加（调用方持有锁）"""
+        t = self._accounted
+        hold_end = self._last_demand + self.hold
+        idle_bucket = int(round(self.idle_fps))
+        while t < now:
+            bucket = int(round(self.fps(t)))
+            if t < hold_end:
+                step = min(hold_end, now) - t  # 保持阶段帧率不变
+            elif bucket == idle_bucket:
+                step = now - t  # 已回落到空闲帧率，之后不再变化
+            else:
+                step = min(self.ACCOUNT_STEP, now - t)
+            self.time_at_rate[bucket] = self.time_at_rate.get(bucket, 0.0) + step
+            t += step
+        self._accounted = now
+
+    def report(self) -> str:
+        """各帧率的停留时间与截图次数"""
+        with self._lock:
+            self._account(time.monotonic())
+            total = sum(self.time_at_rate.values()) or 1.0
+            lines = [f"{'帧率':>6}{'时间(s)':>10}{'占比':>8}{'截图':>8}"]
+            for bucket in sorted(set(self.time_at_rate) | set(self.captures_at_rate), reverse=True):
+                seconds = self.time_at_rate.get(bucket, 0.0)
+                lines.append(f"{bucket:>6}{seconds:>10.1f}{seconds / total:>8.1%}"
+                             f"{self.captures_at_rate.get(bucket, 0):>8}")
+        return "\n".join(lines)
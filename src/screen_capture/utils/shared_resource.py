@@ -0,0 +1,44 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class SharedResource:
+    """进程内按键共享、引用计数的资源（如 DXGI 桌面复制实例）
+
+    第一次 acquire 时调用 factory 创建，最后一次 release 时调用 closer 释放。
+    """
+    _lock = threading.Lock()
+    _entries: Dict[Hashable, List[Any]] = {}  # key -> [资源, 引用计数, closer]
+
+    @classmethod
+    def acquire(cls, key: Hashable, factory: Callable[[], Any],
+                closer: Optional[Callable[[Any], None]] = None) -> Any:
+        """获取共享资源并增加引用计数"""
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                entry = [factory(), 0, closer]
+                cls._entries[key] = entry
+            entry[1] += 1
+            return entry[0]
+
+    @classmethod
+    def release(cls, key: Hashable) -> None:
+        """减少引用计数，归零时释放资源"""
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del cls._entries[key]
+        resource, _, closer = entry
+        if closer is not None:
+            closer(resource)
+
+    @classmethod
+    def refcount(cls, key: Hashable) -> int:
+        with cls._lock:
+            entry = cls._entries.get(key)
+            return entry[1] if entry is not None else 0
@@ -0,0 +1,154 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.screen_capture.capture.base_capture import BaseCapture
+from src.screen_capture.capture_manager import CaptureManager
+from src.screen_capture.utils.backend_health import CaptureHealth, ProbeResult, probe_backend, rank_results
+
+
+class StaleCapture(BaseCapture):
+    """前 stale 次截图返回None（模拟画面未刷新）、前 broken 次抛出异常的假后端"""
+
+    def __init__(self):
+        super().__init__()
+        self.method = 'stale'
+        self.stale = 0
+        self.broken = 0
+
+    def initialize(self) -> bool:
+        self._initialized = True
+        return True
+
+    def capture(self) -> np.ndarray:
+        if self.broken > 0:
+            self.broken -= 1
+            raise RuntimeError("设备丢失")
+        if self.stale > 0:
+            self.stale -= 1
+            return None
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+    def cleanup(self):
+        pass
+
+
+class FrozenCapture(StaleCapture):
+    """从不返回新画面的假后端"""
+
+    def __init__(self):
+        super().__init__()
+        self.method = 'frozen'
+
+    def capture(self) -> np.ndarray:
+        return None
+
+
+class FreshCapture(StaleCapture):
+    """每次都返回新画面的假后端"""
+
+    def __init__(self):
+        super().__init__()
+        self.method = 'fresh'
+
+
+class TestBackendHealth(unittest.TestCase):
+    def test_probe(self):
+        """测试测速统计成功率：只有出错计为失败，暂无新画面不算失败"""
+        capture = StaleCapture.get_instance()
+        capture.stale = 2
+        result = probe_backend(capture, samples=4, warmup=0)
+        self.assertEqual(result.method, 'stale')
+        self.assertEqual(result.success_rate, 1.0)
+        self.assertEqual(len(result.latencies), 2)
+        self.assertEqual(len(result.idle_latencies), 2)
+
+        capture.broken, capture.stale = 1, 3
+        result = probe_backend(capture, samples=4, warmup=0)
+        self.assertEqual(result.success_rate, 0.75)
+        self.assertEqual(result.latencies, [])
+        self.assertLess(result.latency_ms, float("inf"))  # 画面静止时按调用耗时排序
+
+    def test_static_screen(self):
+        """画面短时间不变时不判定异常，也不计入失败"""
+        capture = StaleCapture()
+        capture.stale = 100
+        for _ in range(100):
+            self.assertIsNone(capture.grab())
+        self.assertIsNone(capture.last_error)
+        self.assertEqual(capture.health.stats()["idle"], 100)
+        self.assertEqual(capture.health.stats()["success_rate"], 1.0)
+        self.assertEqual(capture.health.stats()["consecutive_failures"], 0)
+        self.assertIsNone(capture.health.unhealthy_reason(max_failures=3, stall_timeout=60.0))
+        capture.broken = 3
+        for _ in range(3):
+            capture.grab()
+        self.assertEqual(capture.last_error, "设备丢失")
+        self.assertIsNotNone(capture.health.unhealthy_reason(max_failures=3, stall_timeout=0.0))
+
+    def test_frozen(self):
+        """测试一直没有新画面的后端超过 stall_timeout 后判定异常，截到新画面后恢复"""
+        capture = FrozenCapture()
+        for _ in range(3):
+            self.assertIsNone(capture.grab())
+        self.assertIsNone(capture.last_error)
+        reason = capture.health.unhealthy_reason(max_failures=3, stall_timeout=0.0)
+        self.assertIn("3 次截图均未返回新画面", reason)
+        self.assertIsNone(capture.health.unhealthy_reason(max_failures=3, stall_timeout=60.0))
+        self.assertIsNone(capture.health.unhealthy_reason(max_failures=4, stall_timeout=0.0))
+        capture.health.record(True)
+        self.assertIsNone(capture.health.unhealthy_reason(max_failures=3, stall_timeout=0.0))
+
+    def test_frozen_failover(self):
+        """测试一直没有新画面时切换到能截到画面的后端，备用后端同样没有新画面时跳过"""
+        manager = object.__new__(CaptureManager)
+        manager.logger = SimpleNamespace(warning=lambda message: None, error=lambda message: None)
+        manager.settings = SimpleNamespace(
+            get=lambda section, key=None, default=None:
+            {"max_failures": 3, "stall_timeout": 0.0} if section == 'health' else default)
+        manager._capture_classes = {'frozen': '', 'stale': '', 'fresh': ''}
+        manager._resolved = {'frozen': FrozenCapture, 'stale': StaleCapture, 'fresh': FreshCapture}
+        manager._ranking = ['frozen', 'stale', 'fresh']
+        manager._failed = set()
+        manager._failover_lock = threading.Lock()
+        manager.selection_reason = ""
+        manager._capture_method = FrozenCapture.get_instance()
+        StaleCapture.get_instance().stale = 3
+        self.addCleanup(StaleCapture.release_instance)
+        self.addCleanup(FreshCapture.release_instance)
+        self.addCleanup(FrozenCapture.release_instance)
+
+        for _ in range(3):
+            self.assertIsNone(manager.get_frame())
+        self.assertIsInstance(manager.active_capture(), FreshCapture)
+        self.assertIn("故障切换到 fresh", manager.selection_reason)
+        self.assertEqual(manager._failed, {'frozen', 'stale'})
+        self.assertIsNotNone(manager.get_frame())
+
+    def test_rank(self):
+        """测试按延迟与抖动排序，跳过不可用与成功率不足的后端"""
+        results = [
+            ProbeResult('slow', samples=4, successes=4, latencies=[9.0, 9.0, 9.0, 9.0]),
+            ProbeResult('fast', samples=4, successes=4, latencies=[2.0, 2.0, 3.0, 2.0]),
+            ProbeResult('flaky', samples=4, successes=1, latencies=[1.0]),
+            ProbeResult('broken', error='导入失败'),
+        ]
+        ranked, reason = rank_results(results, min_success=0.8)
+        self.assertEqual([r.method for r in ranked], ['fast', 'slow'])
+        self.assertIn('选择 fast', reason)
+
+    def test_unhealthy(self):
+        """测试连续失败且超时后判定异常，成功一次即恢复"""
+        health = CaptureHealth()
+        for _ in range(3):
+            health.record(False)
+        self.assertIsNotNone(health.unhealthy_reason(max_failures=3, stall_timeout=0.0))
+        self.assertIsNone(health.unhealthy_reason(max_failures=3, stall_timeout=60.0))
+        health.record(True)
+        self.assertIsNone(health.unhealthy_reason(max_failures=3, stall_timeout=0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import time
+import unittest
+from types import SimpleNamespace
+
+from src.assistant.core.bag_transition import wait_bag_transition
+
+
+class FakeFrames:
+    """按顺序给出按键之后截到的帧，image 即该帧背包区域的识别结果"""
+
+    def __init__(self, results):
+        self.frames = [SimpleNamespace(image=result, seq=i + 1) for i, result in enumerate(results)]
+        self.identified = []
+
+    def wait_frame(self, after=None, after_seq=None, timeout=1.0):
+        index = 0 if after_seq is None else after_seq
+        return self.frames[index] if index < len(self.frames) else None
+
+    def identify(self, image):
+        self.identified.append(image)
+        return image
+
+
+class TestBagTransition(unittest.TestCase):
+    def wait(self, was_open, results, confirm_frames=1):
+        frames = FakeFrames(results)
+        result = wait_bag_transition(was_open, frames.wait_frame, frames.identify,
+                                     time.monotonic(), 1.0, confirm_frames)
+        return result, len(frames.identified)
+
+    def test_open(self):
+        """背包关闭时按 Tab：等到背包出现为止"""
+        self.assertEqual(self.wait(False, ['none', 'none', 'bag', 'bag']), ('bag', 3))
+
+    def test_close(self):
+        """背包打开时按 Tab：关闭过程中仍显示背包的帧不算作打开"""
+        self.assertEqual(self.wait(True, ['bag', 'bag', 'none', 'bag']), ('none', 3))
+
+    def test_confirm_frames(self):
+        """需要连续多帧确认时，单帧抖动不算切换"""
+        self.assertEqual(self.wait(False, ['bag', 'none', 'bag', 'bag'], confirm_frames=2), ('bag', 4))
+
+    def test_no_frames(self):
+        """没有截到画面时返回 none；超时前没有确认时返回最后一帧的结果"""
+        self.assertEqual(self.wait(False, []), ('none', 0))
+        self.assertEqual(self.wait(True, ['bag', 'bag']), ('bag', 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import time
+import unittest
+
+import numpy as np
+
+from src.screen_capture.capture.base_capture import BaseCapture
+
+
+class FakeCapture(BaseCapture):
+    """每次截图返回递增像素值的假后端，stale 次数内返回None（模拟画面未刷新）"""
+
+    def __init__(self):
+        super().__init__()
+        self.method = 'fake'
+        self.calls = 0
+        self.stale = 0
+        self.earlier = None  # 设置后返回该时刻截取的旧画面（模拟共享设备中其他会话截取的帧）
+
+    def initialize(self) -> bool:
+        self._initialized = True
+        return True
+
+    def capture(self) -> np.ndarray:
+        self.calls += 1
+        if self.stale > 0:
+            self.stale -= 1
+            return None
+        if self.earlier is not None:
+            self.image_timestamp = self.earlier
+        return np.full((2, 2, 3), self.calls, dtype=np.uint8)
+
+    def cleanup(self):
+        pass
+
+
+class TestBaseCapture(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.capture = FakeCapture.get_instance()
+        self.capture.rate_policy = None
+        self.capture.min_capture_interval = 10.0
+
+    def test_frame_metadata(self):
+        """测试帧对象携带时间戳、序号与后端名称，频率限制内返回缓存帧"""
+        before = time.monotonic()
+        first = self.capture.wait_frame(after=before)
+        cached = self.capture.capture_frame()
+        self.assertGreaterEqual(first.timestamp, before)
+        self.assertEqual(first.backend, 'fake')
+        self.assertIs(cached, first)
+
+    def test_wait_newer(self):
+        """测试等待比指定序号更新的帧，后端暂无新画面时重试"""
+        first = self.capture.wait_frame(after=time.monotonic())
+        self.capture.stale = 3
+        newer = self.capture.wait_frame(after_seq=first.seq, timeout=1.0)
+        self.assertEqual(newer.seq, first.seq + 1)
+        self.capture.stale = 10 ** 6
+        self.assertIsNone(self.capture.wait_frame(after_seq=newer.seq, timeout=0.02))
+        self.capture.stale = 0
+
+    def test_earlier_image(self):
+        """后端返回先前截取的画面时，帧时间戳取实际截取时刻，不满足“之后截取”的等待"""
+        earlier = time.monotonic() - 5.0
+        self.capture.earlier = earlier
+        try:
+            after = time.monotonic()
+            self.assertIsNone(self.capture.wait_frame(after=after, timeout=0.02))
+            self.assertEqual(self.capture.latest_frame.timestamp, earlier)
+        finally:
+            self.capture.earlier = None
+        self.assertGreaterEqual(self.capture.wait_frame(after=after).timestamp, after)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from src.screen_capture.capture.base_capture import BaseCapture
+from src.screen_capture.capture_session import CaptureSession
+from src.screen_capture.utils.shared_resource import SharedResource
+
+
+class SharedCapture(BaseCapture):
+    """共享一个计数器资源的假后端，按截取区域返回图像"""
+    KEY = ('test', 'counter')
+
+    def __init__(self, monitor=None, roi=None, fps=None):
+        super().__init__(monitor, roi, fps)
+        self.method = 'shared'
+        self.counter = SharedResource.acquire(self.KEY, lambda: {"grabs": 0})
+        self.rate_policy = None
+
+    def initialize(self) -> bool:
+        self._initialized = True
+        return True
+
+    def capture(self) -> np.ndarray:
+        self.counter["grabs"] += 1
+        return self.crop_roi(np.full((20, 30, 3), self.monitor, dtype=np.uint8))
+
+    def cleanup(self):
+        if self.counter is not None:
+            self.counter = None
+            SharedResource.release(self.KEY)
+
+
+class TestCaptureSession(unittest.TestCase):
+    def test_independent_sessions(self):
+        """测试会话各自的显示器、区域、帧率与帧缓存互不影响"""
+        with CaptureSession(SharedCapture, monitor=1, fps=1000) as fast, \
+                CaptureSession(SharedCapture, monitor=2, roi=[5, 5, 10, 8], fps=0.1) as slow:
+            first = slow.get_frame_info()
+            self.assertEqual(first.image.shape, (8, 10, 3))
+            self.assertEqual(int(first.image[0, 0, 0]), 2)
+            self.assertIs(slow.get_frame_info(), first)  # 低帧率会话返回缓存帧
+            self.assertEqual(fast.get_frame().shape, (20, 30, 3))
+            self.assertEqual(fast.latest_frame().seq, 1)
+            self.assertEqual(SharedResource.refcount(SharedCapture.KEY), 2)
+        self.assertEqual(SharedResource.refcount(SharedCapture.KEY), 0)
+
+    def test_release_once(self):
+        """测试重复关闭只释放一次引用"""
+        first = CaptureSession(SharedCapture)
+        second = CaptureSession(SharedCapture)
+        first.close()
+        first.close()
+        self.assertEqual(SharedResource.refcount(SharedCapture.KEY), 1)
+        second.close()
+        self.assertEqual(SharedResource.refcount(SharedCapture.KEY), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
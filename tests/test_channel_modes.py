@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.assistant.core.channel_validation import load_crops, validate_category
+from src.assistant.core.image_recognition import CHANNEL_MODES, convert_channels
+from src.assistant.core.template_pack import DERIVED_FORMS
+
+
+class FakePack:
+    """按 (类别, 通道模式) 提供模板的模板包"""
+
+    def __init__(self, templates):
+        self.templates = templates
+
+    def category(self, category, form):
+        return {name: convert_channels(image, form) for name, image in self.templates.items()}
+
+
+class TestChannelModes(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作：B、G、R 三个通道取值各不相同的 BGRA 图像"""
+        rng = np.random.default_rng(0)
+        self.bgra = rng.integers(0, 256, (12, 16, 4), dtype=np.uint8)
+        self.bgra[..., 0] //= 4  # 蓝色偏暗，通道取错时结果不同
+
+    def test_convert_channels(self):
+        """测试 BGR/BGRA 输入按通道顺序转换，单通道输入原样返回"""
+        bgr = self.bgra[..., :3]
+        for image in (self.bgra, bgr):
+            np.testing.assert_array_equal(convert_channels(image, "bgr"), bgr)
+            np.testing.assert_array_equal(convert_channels(image, "b"), bgr[..., 0])
+            np.testing.assert_array_equal(convert_channels(image, "g"), bgr[..., 1])
+            np.testing.assert_array_equal(convert_channels(image, "r"), bgr[..., 2])
+            np.testing.assert_array_equal(convert_channels(image, "gray"),
+                                          cv2.cvtColor(np.ascontiguousarray(bgr), cv2.COLOR_BGR2GRAY))
+            self.assertTrue(convert_channels(image, "g").flags["C_CONTIGUOUS"])
+        gray = bgr[..., 1].copy()
+        self.assertIs(convert_channels(gray, "r"), gray)
+
+    def test_pack_forms(self):
+        """测试模板包预先计算的派生形式与运行时转换一致"""
+        bgr = np.ascontiguousarray(self.bgra[..., :3])
+        for mode in CHANNEL_MODES:
+            if mode != "bgr":
+                np.testing.assert_array_equal(DERIVED_FORMS[mode](bgr), convert_channels(bgr, mode))
+
+    def test_validate_category(self):
+        """测试截图回放：各模式识别结果一致时一致率为1"""
+        rng = np.random.default_rng(1)
+        templates = {f"label{i}": rng.integers(0, 256, (10, 10, 3), dtype=np.uint8) for i in range(3)}
+        crops = [np.pad(image, ((2, 2), (2, 2), (0, 0))) for image in templates.values()]
+        report = validate_category(FakePack(templates), "poses", crops, "g", 0.5)
+        self.assertEqual(report["samples"], 3)
+        self.assertEqual(report["agreement"], 1.0)
+        self.assertEqual(report["mismatches"], [])
+
+    def test_load_crops(self):
+        """测试读取区域截图为 BGR，忽略无法解码的文件"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            bgr = np.ascontiguousarray(self.bgra[..., :3])
+            cv2.imwrite(str(folder / "0.png"), bgr)
+            (folder / "1.png").write_bytes(b"broken")
+            crops = load_crops(folder)
+        self.assertEqual(len(crops), 1)
+        np.testing.assert_array_equal(crops[0], bgr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import multiprocessing
+import subprocess
+import sys
+import unittest
+
+from src.assistant.core.core_child import PipeLogger
+
+
+class TestPipeLogger(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.conn, child_conn = multiprocessing.Pipe(duplex=True)
+        self.logger = PipeLogger(child_conn)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.logger.cleanup()
+
+    def test_batches_and_coalesces(self):
+        """测试日志批量发送、界面数据只保留最新一份"""
+        self.logger.info("第一条")
+        self.logger.error("第二条")
+        self.logger.update_ui({"label": "旧"})
+        self.logger.update_ui({"label": "新"})
+        self.logger.close_progress(7)
+        self.logger.flush()
+
+        received = []
+        while self.conn.poll(1.0):
+            received.append(self.conn.recv())
+            if received[-1][0] == "progress":
+                break
+        kinds = [kind for kind, _ in received]
+        self.assertEqual(kinds, ["logs", "ui", "progress"])
+        self.assertEqual([(level, message) for level, _, message in received[0][1]],
+                         [("INFO", "第一条"), ("ERROR", "第二条")])
+        self.assertEqual(received[1][1], {"label": "新"})
+
+
+class TestCoreProcess(unittest.TestCase):
+    def test_child_without_qt(self):
+        """子进程入口模块不导入 PyQt5"""
+        code = ("import sys; import src.assistant.core.core_child; "
+                "print(any(name.startswith('PyQt5') for name in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+    def test_launch_not_daemon(self):
+        """核心进程不是守护进程（可以再创建识别进程池），shutdown 后正常退出"""
+        from src.assistant.core.core_process import CoreProcess
+        core = CoreProcess()
+        core.launch()
+        process = core._process
+        try:
+            self.assertFalse(process.daemon)
+            self.assertTrue(process.is_alive())
+        finally:
+            core.shutdown()
+        self.assertFalse(process.is_alive())
+        self.assertEqual(process.exitcode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from src.assistant.core.frame_gate import FrameGate, ACTIVE, STATIC, INVALID
+
+
+class TestFrameGate(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.gate = FrameGate(anchors=[(0.5, 0.5), (0.9, 0.1)])
+        rng = np.random.default_rng(0)
+        coarse = rng.integers(0, 255, (18, 32, 4), dtype=np.uint8)
+        self.frame = np.repeat(np.repeat(coarse, 40, axis=0), 40, axis=1)
+
+    def test_invalid(self):
+        """测试黑屏、纯色画面与截图失败判定为无效"""
+        self.assertEqual(self.gate.classify(np.zeros_like(self.frame)), INVALID)
+        self.assertEqual(self.gate.classify(np.full_like(self.frame, 128)), INVALID)
+        self.assertEqual(self.gate.classify(None), INVALID)
+
+    def test_static_and_wake(self):
+        """测试相同画面判定为静止，锚点处的小变化立即恢复为活动"""
+        self.assertEqual(self.gate.classify(self.frame), ACTIVE)
+        self.assertEqual(self.gate.classify(self.frame.copy()), STATIC)
+        changed = self.frame.copy()
+        changed[355:365, 635:645, :3] = 255 - changed[360, 640, :3]
+        self.assertEqual(self.gate.classify(changed), ACTIVE)
+
+    def test_backoff(self):
+        """测试连续拦截时等待时间翻倍且有上限，活动画面重置"""
+        self.gate.classify(None)
+        self.gate.classify(None)
+        self.assertEqual(self.gate.backoff(1.0, 8.0), 4.0)
+        for _ in range(5):
+            self.gate.classify(None)
+        self.assertEqual(self.gate.backoff(1.0, 8.0), 8.0)
+        self.gate.classify(self.frame)
+        self.assertEqual(self.gate.backoff(1.0, 8.0), 1.0)
+        self.assertIn('invalid', self.gate.report())
+
+    def test_gated_states(self):
+        """只拦截无效画面的消费方：静止画面不计入连续拦截次数"""
+        gate = FrameGate(gated_states=(INVALID,))
+        gate.classify(self.frame)
+        for _ in range(5):
+            self.assertEqual(gate.classify(self.frame.copy()), STATIC)
+        self.assertEqual(gate.gated_streak, 0)
+        gate.classify(None)
+        self.assertEqual(gate.backoff(0.05, 8.0), 0.1)
+
+    def test_wake(self):
+        """各实例的唤醒互不影响，唤醒只被消费一次"""
+        other = FrameGate()
+        self.gate.wake()
+        self.assertFalse(other.woken())
+        self.assertTrue(self.gate.wait(1.0))
+        self.assertFalse(self.gate.woken())
+        self.assertFalse(self.gate.wait(0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ from pathlib import Path
 import cv2
 import numpy as np
 from src.core.image_recognition import ImageRecognition
+from src.utils.label_catalog import NONE_ID
 from src.utils.logger_factory import LoggerFactory
 
 from src.config.settings import Settings
@@ -41,19 +42,27 @@ class TestImageRecognition(unittest.TestCase):
         if not self.templates:
             self.skipTest("没有找到模板图像")
 
+    def identify(self, frame, templates):
+        """按整数识别路径匹配模板，只在输出时换回模板名称"""
+        names = list(templates)
+        label_ids = np.arange(1, len(names) + 1, dtype=np.int16)
+        label_id, _ = ImageRecognition.identify_label_id(
+            frame, label_ids, list(templates.values()), self.settings.get('recognition', 'threshold', 0.5))
+        return names[label_id - 1] if label_id != NONE_ID else 'none'
+
     def test_exact_match(self):
         """测试完全匹配的情况"""
         for template_name, template in self.templates.items():
             with self.subTest(template=template_name):
                 frame = template.copy()
-                result = self.image_recognition.identify_from_templates(frame, self.templates)
+                result = self.identify(frame, self.templates)
                 self.assertEqual(result, template_name)
 
     def test_no_match(self):
         """测试无匹配的情况"""
         # 创建一个完全不同的图像（全黑）
         frame = np.zeros((100, 100, 3), dtype=np.uint8)
-        result = self.image_recognition.identify_from_templates(frame, self.templates)
+        result = self.identify(frame, self.templates)
         self.assertEqual(result, 'none')
 
     def test_partial_match(self):
@@ -67,19 +76,19 @@ class TestImageRecognition(unittest.TestCase):
                 # 保存用于调试
                 cv2.imwrite(str(self.test_data_dir / f'{template_name}_noise.png'), frame)
 
-                result = self.image_recognition.identify_from_templates(frame, self.templates)
+                result = self.identify(frame, self.templates)
                 self.assertEqual(result, template_name)
 
     def test_empty_inputs(self):
         """测试空输入的情况"""
         # 测试空frame
-        result = self.image_recognition.identify_from_templates(None, self.templates)
+        result = self.identify(None, self.templates)
         self.assertEqual(result, 'none')
 
         # 测试空templates
         if self.templates:
             frame = next(iter(self.templates.values())).copy()
-            result = self.image_recognition.identify_from_templates(frame, {})
+            result = self.identify(frame, {})
             self.assertEqual(result, 'none')
 
     def test_different_sizes(self):
@@ -101,7 +110,7 @@ class TestImageRecognition(unittest.TestCase):
         # 保存用于调试
         cv2.imwrite(str(self.test_data_dir / f'{template_name}_larger.png'), frame)
 
-        result = self.image_recognition.identify_from_templates(frame, self.templates)
+        result = self.identify(frame, self.templates)
         self.assertEqual(result, template_name)
 
     def test_capture_screen(self):
@@ -0,0 +1,99 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.assistant.utils.json_writer import DebouncedJsonWriter
+
+
+class TestDebouncedJsonWriter(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / 'weapons.json'
+        self.path.write_text(json.dumps({
+            "M416": {"base": 10.0, "muzzles": {"default": 1.0, "补偿器": 0.8}},
+            "AKM": {"base": 12.0}
+        }, ensure_ascii=False), encoding='utf-8')
+        self.writer = DebouncedJsonWriter(self.path, delay=0.05)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def _read(self):
+        return json.loads(self.path.read_text(encoding='utf-8'))
+
+    def test_coalesces_edits(self):
+        """连续修改合并为一次写入，只覆盖被修改的字段"""
+        for value in (1.1, 1.2, 1.3):
+            self.writer.set(("M416", "base"), value)
+        self.writer.set(("M416", "muzzles", "default"), 0.9)
+        self.assertEqual(self.writer.writes, 0)
+
+        deadline = time.monotonic() + 2.0
+        while self.writer.writes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.writer.writes, 1)
+        data = self._read()
+        self.assertEqual(data["M416"]["base"], 1.3)
+        self.assertEqual(data["M416"]["muzzles"], {"default": 0.9, "补偿器": 0.8})
+        self.assertEqual(data["AKM"], {"base": 12.0})
+
+    def test_preserves_external_changes(self):
+        """写入前重新读取文件，不覆盖其他字段的外部修改"""
+        self.writer.set(("M416", "base"), 11.0)
+        data = self._read()
+        data["AKM"]["base"] = 13.0
+        self.path.write_text(json.dumps(data), encoding='utf-8')
+
+        self.assertTrue(self.writer.flush())
+        data = self._read()
+        self.assertEqual(data["M416"]["base"], 11.0)
+        self.assertEqual(data["AKM"]["base"], 13.0)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_discard(self):
+        """放弃某把武器的未保存修改"""
+        self.writer.set(("M416", "base"), 20.0)
+        self.writer.set(("AKM", "base"), 20.0)
+        self.assertEqual(self.writer.discard(("M416",)), 1)
+        self.assertTrue(self.writer.flush())
+        data = self._read()
+        self.assertEqual(data["M416"]["base"], 10.0)
+        self.assertEqual(data["AKM"]["base"], 20.0)
+
+    def test_request_flush(self):
+        """request_flush 不等待写入完成，写入结果通过回调通知"""
+        written = threading.Event()
+        writer = DebouncedJsonWriter(self.path, delay=60.0, on_written=written.set)
+        try:
+            self.assertFalse(writer.request_flush())
+            writer.set(("AKM", "base"), 14.0)
+            self.assertTrue(writer.request_flush())
+            self.assertTrue(written.wait(2.0))
+            self.assertEqual(self._read()["AKM"]["base"], 14.0)
+            self.assertEqual(writer.pending, 0)
+        finally:
+            writer.close()
+
+    def test_error_callback(self):
+        """写入失败时调用 on_error 并保留修改"""
+        errors = []
+        writer = DebouncedJsonWriter(self.path, delay=60.0, on_error=errors.append)
+        try:
+            self.path.write_text("{broken", encoding='utf-8')
+            writer.set(("AKM", "base"), 14.0)
+            self.assertFalse(writer.flush(timeout=0.5))
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(writer.pending, 1)
+            writer.discard()
+        finally:
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
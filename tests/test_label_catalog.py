@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from src.assistant.utils.label_catalog import LabelCatalog, NONE_ID, UNSET_ID
+
+
+class TestLabelCatalog(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.regions = {
+            "weapons_name_rifle": [0, 0, 10, 10],
+            "muzzles_rifle": [10, 0, 10, 10],
+            "poses": [20, 0, 10, 10],
+            "unknown": [30, 0, 10, 10],
+        }
+        self.catalog = LabelCatalog(self.regions)
+
+    def test_none_is_zero(self):
+        """测试 none 固定为 0 号"""
+        self.assertEqual(self.catalog.label_id("none"), NONE_ID)
+        self.assertEqual(self.catalog.label_name(NONE_ID), "none")
+
+    def test_regions(self):
+        """测试区域编号与类别"""
+        self.assertEqual(self.catalog.regions, ["weapons_name_rifle", "muzzles_rifle", "poses"])
+        weapons = self.catalog.category_ids["weapons"]
+        self.assertEqual(self.catalog.region_categories[0], weapons)
+        np.testing.assert_array_equal(self.catalog.region_rects[1], [10, 0, 10, 10])
+
+    def test_roi_swap(self):
+        """测试校准整体替换区域数组，已取得的数组不被修改"""
+        rects, scales = self.catalog.region_rects, self.catalog.region_scales
+        self.catalog.apply_roi(1, [12, 1, 6, 6], 1.25)
+        np.testing.assert_array_equal(rects[1], [10, 0, 10, 10])
+        self.assertEqual(scales[1], 1.0)
+        self.assertEqual(self.catalog.region_roi(1), ([12, 1, 6, 6], 1.25))
+        self.assertTrue(self.catalog.region_calibrated[1])
+
+        self.catalog.reset_roi(1)
+        self.assertEqual(self.catalog.region_roi(1), ([10, 0, 10, 10], 1.0))
+        self.assertFalse(self.catalog.region_calibrated[1])
+        np.testing.assert_array_equal(self.catalog.wide_rects[1], [10, 0, 10, 10])
+
+    def test_output_forms(self):
+        """测试预计算的显示名称与 Lua 字面量"""
+        self.assertEqual(self.catalog.display_name("x2"), "2倍")
+        self.assertEqual(self.catalog.lua_literal("M416"), '"M416"')
+        self.assertEqual(self.catalog.lua_literal(1.0), '"1.0"')
+
+    def test_to_results(self):
+        """测试整数结果数组转换为字符串结果"""
+        ids = self.catalog.new_region_array()
+        ids[0] = self.catalog.label_id("M416")
+        ids[2] = NONE_ID
+        self.assertEqual(ids[1], UNSET_ID)
+        self.assertEqual(self.catalog.to_results(ids), {"weapons_name_rifle": "M416", "poses": "none"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import threading
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from src.assistant.ui.main_window import MainWindow
+
+
+class TestLazyTabs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.window = MainWindow()
+
+    def tearDown(self):
+        self.window.label.close()
+        self.window.deleteLater()
+
+    def test_lazy_tabs(self):
+        """测试启动时只创建当前标签页，其他标签页首次切换时才创建并替换占位页"""
+        window = self.window
+        self.assertEqual(window.tab_widget.count(), 4)
+        self.assertIs(window.tab_widget.widget(0), window.auto_tab)
+        self.assertIsNone(window.weapon_tab)
+        self.assertIsNone(window.about_tab)
+
+        window.tab_widget.setCurrentIndex(3)
+        self.assertIsNotNone(window.about_tab)
+        self.assertIs(window.tab_widget.widget(3), window.about_tab)
+        self.assertEqual(window.tab_widget.currentIndex(), 3)
+        self.assertEqual(window.tab_widget.tabText(3), "关于")
+        self.assertIsNone(window.weapon_tab)
+
+        about_tab = window.about_tab
+        window.tab_widget.setCurrentIndex(0)
+        window.tab_widget.setCurrentIndex(3)
+        self.assertIs(window.about_tab, about_tab)
+
+
+class TestWeaponTab(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """测试前的准备工作"""
+        from src.assistant.ui.tabs.weapon_tab import WeaponTab
+        self.tab = WeaponTab()
+
+    def tearDown(self):
+        self.tab.writer.close()
+        self.tab.deleteLater()
+
+    def test_save_result(self):
+        """测试保存不等待写入，写入线程的结果经信号回到界面"""
+        self.tab._save_weapon_params()
+        self.assertEqual(self.tab.status_label.text(), "没有需要保存的修改")
+
+        thread = threading.Thread(target=self.tab.save_finished.emit, args=(False, "磁盘已满"))
+        thread.start()
+        thread.join()
+        self.app.processEvents()
+        self.assertEqual(self.tab.status_label.text(), "保存失败")
+
+        self.tab.save_finished.emit(True, "")
+        self.assertEqual(self.tab.status_label.text(), "已保存")
+
+
+if __name__ == '__main__':
+    unittest.main()
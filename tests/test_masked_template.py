@@ -0,0 +1,47 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from src.assistant.core.image_recognition import ImageRecognition, MaskedTemplate, decode_template
+
+
+class TestMaskedTemplate(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作：带透明边缘的图标模板与包含该图标的区域截图"""
+        rng = np.random.default_rng(0)
+        self.bgra = rng.integers(0, 256, (12, 10, 4), dtype=np.uint8)
+        self.bgra[..., 3] = 0
+        self.bgra[2:10, 2:8, 3] = 255
+        self.image = rng.integers(0, 256, (24, 20, 3), dtype=np.uint8)
+        # 图标加少量噪声后放入截图，最高分小于1
+        noise = rng.integers(-30, 31, (12, 10, 3))
+        self.image[5:17, 6:16] = np.clip(self.bgra[..., :3].astype(int) + noise, 0, 255)
+
+    def decoded(self):
+        ok, encoded = cv2.imencode(".png", self.bgra)
+        self.assertTrue(ok)
+        return decode_template(encoded.tobytes())
+
+    def test_decode_keeps_alpha(self):
+        """测试解码模板时保留透明通道，掩码来自 alpha"""
+        template, mask = self.decoded()
+        np.testing.assert_array_equal(template, self.bgra[..., :3])
+        np.testing.assert_array_equal(mask, np.where(self.bgra[..., 3] > 0, 255, 0))
+
+    def test_matches_opencv(self):
+        """测试预计算的掩码匹配分数与 cv2.matchTemplate 带掩码的 TM_CCOEFF_NORMED 一致"""
+        template, mask = self.decoded()
+        for image, templ in ((self.image, template),
+                             (cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY), cv2.cvtColor(template, cv2.COLOR_BGR2GRAY))):
+            masked = MaskedTemplate.prepare(templ, mask)
+            label_id, score = ImageRecognition.identify_label_id_masked(image, np.array([3], np.int16), [masked], 0.5)
+            expected = cv2.matchTemplate(image, templ, cv2.TM_CCOEFF_NORMED,
+                                         mask=mask if image.ndim == 2 else cv2.merge([mask] * 3))
+            self.assertEqual(label_id, 3)
+            self.assertAlmostEqual(score, float(np.nanmax(expected)), places=4)
+            self.assertLess(score, 0.999)
+
+
+if __name__ == '__main__':
+    unittest.main()
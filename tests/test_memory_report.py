@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.assistant.core.image_recognition import CategoryTemplates, MaskedTemplate
+from src.assistant.core.memory_report import MB, MallocSnapshots, MemoryLedger, held_bytes
+from src.assistant.core.recognition_cache import RecognitionCache
+
+
+class TestMemoryReport(unittest.TestCase):
+    def test_held_bytes(self):
+        """视图与原数组只计一次，文件映射不计入，可遍历 dataclass"""
+        frame = np.zeros((100, 100, 4), dtype=np.uint8)
+        self.assertEqual(held_bytes([frame, frame[10:20], {"crop": frame[..., :3]}]), frame.nbytes)
+        self.assertEqual(held_bytes(1234), 1234)
+
+        template = np.ones((4, 4), dtype=np.float32)
+        masked = MaskedTemplate.prepare(template + np.eye(4, dtype=np.float32), np.ones((4, 4), np.uint8))
+        bank = CategoryTemplates(np.arange(2, dtype=np.int16), [template, template], masked=[masked, None])
+        expected = bank.label_ids.nbytes + template.nbytes + masked.zero_mean.nbytes + masked.mask.nbytes
+        self.assertEqual(held_bytes(bank), expected)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mapped = np.memmap(Path(temp_dir) / 'blob', dtype=np.uint8, mode='w+', shape=(4096,))
+            self.assertEqual(held_bytes([mapped, mapped[:16].reshape(4, 4)]), 0)
+            del mapped
+
+    def test_shared_buffers(self):
+        """多个子系统引用同一缓冲区时计入先登记的子系统"""
+        ledger = MemoryLedger()
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        ledger.register("frames", lambda: [frame])
+        ledger.register("crops", lambda: [frame[:8, :8]])
+        report = ledger.report()
+        self.assertEqual(report["frames"]["bytes"], frame.nbytes)
+        self.assertEqual(report["crops"]["bytes"], 0)
+        self.assertEqual(list(ledger.report(["crops"])), ["crops"])
+        self.assertEqual(ledger.report(["crops"])["crops"]["bytes"], frame.nbytes)
+
+    def test_budgets(self):
+        """超出预算时调用释放函数，没有释放函数时只报告"""
+        ledger = MemoryLedger()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = RecognitionCache(Path(temp_dir) / 'cache.npz', 'v1')
+            for key in range(1000):
+                cache.put(key, 1, 0.9)
+            ledger.register("caches", cache.nbytes,
+                            lambda budget: cache.trim(budget // cache.ENTRY_BYTES))
+            ledger.register("templates", lambda: np.zeros(MB, dtype=np.uint8))
+            ledger.set_budgets({"caches": 0.05, "templates": 0.5})
+
+            self.assertEqual(sorted(ledger.check_budgets()), ["caches", "templates"])
+            self.assertLessEqual(cache.nbytes(), 0.05 * MB)
+            self.assertIsNone(cache.get(0))  # 淘汰最久未使用的条目
+            self.assertEqual(cache.get(999), (1, 0.9))
+            self.assertEqual(ledger.check_budgets(), ["templates"])
+            self.assertEqual(ledger.report()["templates"]["budget"], MB // 2)
+
+    def test_budget_before_register(self):
+        """预算先于子系统登记设置时，登记后同样生效；重新登记保留预算"""
+        ledger = MemoryLedger()
+        ledger.set_budgets({"frames": 0.5})
+        ledger.register("frames", lambda: np.zeros(MB, dtype=np.uint8))
+        ledger.register("crops", lambda: 0)
+        self.assertEqual(ledger.report()["frames"]["budget"], MB // 2)
+        self.assertIsNone(ledger.report()["crops"]["budget"])
+        self.assertEqual(ledger.check_budgets(), ["frames"])
+
+        ledger.register("frames", lambda: 0)
+        self.assertEqual(ledger.report()["frames"]["budget"], MB // 2)
+        ledger.set_budgets({})
+        self.assertIsNone(ledger.report()["frames"]["budget"])
+
+    def test_malloc_snapshots(self):
+        """两次快照之间的增长按位置列出"""
+        snapshots = MallocSnapshots()
+        was_tracing = snapshots.enabled
+        try:
+            snapshots.take()
+            self.assertEqual(snapshots.diff(), [])
+            retained = [bytearray(1024) for _ in range(256)]
+            snapshots.take()
+            growth = snapshots.diff(top=5)
+            self.assertTrue(growth)
+            self.assertGreater(sum(item["size_diff"] for item in growth), 200 * 1024)
+            del retained
+        finally:
+            if not was_tracing:
+                snapshots.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+from src.assistant.core.metrics import (PREFIX, Counter, Gauge, Histogram, MetricsRegistry,
+                                        MetricsServer, render)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_shards(self):
+        """各线程分别计数，线程退出后计数合并保留"""
+        counter = Counter("jobs_total", "任务数", ("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc("b", amount=2)
+        self.assertEqual(counter.value("a"), 4000)
+        self.assertEqual(counter.value("b"), 2)
+        self.assertEqual(len(counter._shards), 1)  # 已退出线程的分片已合并
+
+    def test_histogram_render(self):
+        """直方图按累计桶输出，并带 _sum 与 _count"""
+        histogram = Histogram("latency_seconds", "耗时", ("stage",), buckets=(0.01, 0.1))
+        for value in (0.005, 0.05, 0.5):
+            histogram.observe(value, "match")
+        text = render([histogram.collect()])
+        name = PREFIX + "latency_seconds"
+        self.assertIn(f"# TYPE {name} histogram", text)
+        self.assertIn(f'{name}_bucket{{stage="match",le="0.01"}} 1', text)
+        self.assertIn(f'{name}_bucket{{stage="match",le="0.1"}} 2', text)
+        self.assertIn(f'{name}_bucket{{stage="match",le="+Inf"}} 3', text)
+        self.assertIn(f'{name}_count{{stage="match"}} 3', text)
+
+    def test_gauge_getter(self):
+        """仪表盘在导出时读取当前值"""
+        depth = [3]
+        gauge = Gauge("queue_depth", "队列长度", getter=lambda: depth[0])
+        depth[0] = 5
+        self.assertIn(f"{PREFIX}queue_depth 5\n", render([gauge.collect()]))
+
+    def test_server(self):
+        """GET /metrics 返回注册表内容，其他路径返回404"""
+        registry = MetricsRegistry()
+        registry.counter("file_writes_total", "写出次数").inc()
+        server = MetricsServer(registry)
+        port = server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+                self.assertIn(f"{PREFIX}file_writes_total 1", response.read().decode("utf-8"))
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
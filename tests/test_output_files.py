@@ -0,0 +1,119 @@
+import json
+import re
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from threading import Lock
+from types import SimpleNamespace
+
+from src.assistant.core.metrics import MetricsRegistry
+from src.assistant.core.recoil_table import RecoilTables
+from src.assistant.utils.label_catalog import LabelCatalog
+
+try:
+    from src.assistant.core.pubg_main import GameState, PubgCore
+    IMPORT_ERROR = ""
+except ImportError as e:  # keyboard / pynput 只在 Windows 上可用
+    PubgCore = None
+    IMPORT_ERROR = str(e)
+
+WEAPONS = {"M416": {"interval": 86, "bullets": 3, "base": 2.0}}
+
+# 一行一个赋值：数字、字符串或平铺的数字表
+LUA_NUMBER = r'-?\d+(?:\.\d+)?'
+LUA_VALUE = re.compile(rf'({LUA_NUMBER}|"[^"\\\n]*"|\{{(?:{LUA_NUMBER}(?:, {LUA_NUMBER})*)?\}})')
+LUA_LINE = re.compile(rf'([A-Za-z_]\w*) = {LUA_VALUE.pattern}')
+
+
+def parse_lua(text: str) -> dict:
+    """按 weapon.lua 的格式逐行解析，遇到不是合法赋值语句的行时报错"""
+    values = {}
+    for line in text.splitlines():
+        match = LUA_LINE.fullmatch(line)
+        if match is None:
+            raise ValueError(f"不是合法的 Lua 赋值: {line!r}")
+        name, value = match.groups()
+        if name in values:
+            raise ValueError(f"重复赋值: {name}")
+        values[name] = json.loads(value.replace("{", "[").replace("}", "]"))
+    return values
+
+
+@unittest.skipIf(PubgCore is None, f"缺少依赖: {IMPORT_ERROR}")
+class TestOutputFiles(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作：只创建写出结果用到的属性"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp = Path(self.temp_dir.name)
+        weapons = self.temp / 'weapons.json'
+        weapons.write_text(json.dumps(WEAPONS), encoding='utf-8')
+
+        core = object.__new__(PubgCore)
+        core.settings = SimpleNamespace(get_path=lambda name: self.temp)
+        core.catalog = LabelCatalog()
+        core.state = GameState()
+        core.recoil_tables = RecoilTables(weapons)
+        core.image_recognition = SimpleNamespace(frame_timestamp=None, frame_seq=0)
+        core.file_writes = MetricsRegistry().counter("file_writes_total", "")
+        core.results_block = None
+        core.state_server = None
+        core._tab_pressed_at = None
+        core._output_lock = Lock()
+        core.output_seq = 0
+        self.core = core
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_weapon_lua(self):
+        """weapon.lua 加上压枪曲线与序号字段后仍是合法的 Lua"""
+        self.core._write_files({"weapons_name_rifle": "M416", "scope_zoom": "2"})
+        values = parse_lua((self.temp / 'weapon.lua').read_text(encoding='utf-8'))
+        self.assertEqual(values["weapon_name"], "M416")
+        self.assertEqual(values["recoil_interval"], 86)
+        self.assertEqual(values["recoil_curve"], [4, 4, 4])
+        self.assertEqual(values["output_seq"], 1)
+        self.assertEqual(values["output_capture_time"], 0)
+        self.assertGreater(values["output_write_time"], 0)
+
+        # 没有武器参数时曲线为空表
+        self.core._write_files({})
+        values = parse_lua((self.temp / 'weapon.lua').read_text(encoding='utf-8'))
+        self.assertEqual((values["recoil_interval"], values["recoil_curve"]), (0, []))
+
+    def test_seq(self):
+        """每次写出序号加1，序号文件、results.json 与 weapon.lua 一致"""
+        for expected in (1, 2, 3):
+            self.assertEqual(self.core._write_files({}), expected)
+        self.assertEqual((self.temp / PubgCore.SEQ_FILE).read_text(encoding='utf-8'), "3")
+        results = json.loads((self.temp / 'results.json').read_text(encoding='utf-8'))
+        self.assertEqual(results["seq"], 3)
+        values = parse_lua((self.temp / 'weapon.lua').read_text(encoding='utf-8'))
+        self.assertEqual(values["output_seq"], 3)
+
+    def test_resume_seq(self):
+        """重启后从 weapon.seq 继续递增，文件缺失或内容无效时从0开始"""
+        self.assertEqual(self.core._load_output_seq(), 0)
+        (self.temp / PubgCore.SEQ_FILE).write_text("41", encoding='utf-8')
+        self.core.output_seq = self.core._load_output_seq()
+        self.assertEqual(self.core._write_files({}), 42)
+        (self.temp / PubgCore.SEQ_FILE).write_text("broken", encoding='utf-8')
+        self.assertEqual(self.core._load_output_seq(), 0)
+
+    def test_output_times(self):
+        """画面截取时刻由 time.monotonic() 换算为 Unix 毫秒"""
+        self.core.image_recognition.frame_timestamp = time.monotonic() - 0.25
+        before = time.time() * 1000
+        capture_time, write_time = self.core._output_times()
+        after = time.time() * 1000
+        self.assertTrue(before - 1 <= write_time <= after)
+        self.assertAlmostEqual(write_time - capture_time, 250, delta=20)
+
+        self.core._write_files({})
+        results = json.loads((self.temp / 'results.json').read_text(encoding='utf-8'))
+        self.assertAlmostEqual(results["write_time"] - results["capture_time"], 250, delta=50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import threading
+import unittest
+
+from src.assistant.core.perf_stats import FrameRateMeter, PerfStats, latency_summary
+from src.assistant.utils.process_stats import ProcessSampler
+
+
+class TestPerfStats(unittest.TestCase):
+    def test_stage_percentiles(self):
+        """只保留最近的样本，累计次数不受窗口限制"""
+        stats = PerfStats(window=100)
+        for i in range(200):
+            stats.record("match", i / 1000.0)
+        summary = stats.stage_summary()["match"]
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["total"], 200)
+        self.assertAlmostEqual(summary["p50"], 149.5)
+        self.assertEqual(stats.stage_summary()["write"]["count"], 0)
+
+    def test_empty_summary(self):
+        """没有样本时分位数为0"""
+        self.assertEqual(latency_summary(()), {"count": 0, "p50": 0.0, "p90": 0.0, "p99": 0.0})
+
+    def test_frame_rate(self):
+        """帧率按序号差计算，切换后端时重新计数"""
+        meter = FrameRateMeter()
+        self.assertEqual(meter.update("mss", 10, now=1.0), 0.0)
+        self.assertAlmostEqual(meter.update("mss", 40, now=1.5), 60.0)
+        self.assertEqual(meter.update("dxgi", 2, now=2.0), 0.0)
+        self.assertAlmostEqual(meter.update("dxgi", 32, now=3.0), 30.0)
+
+    def test_process_sampler(self):
+        """第二次采样起给出 CPU 占用，并包含当前线程"""
+        sampler = ProcessSampler(min_interval=0.0)
+        sampler.sample()
+        sum(i * i for i in range(200000))
+        sample = sampler.sample()
+        self.assertGreaterEqual(sample["cpu_percent"], 0.0)
+        self.assertGreaterEqual(sample["rss"], 0)
+        if sample["threads"]:
+            ids = [thread["id"] for thread in sample["threads"]]
+            self.assertIn(threading.get_native_id(), ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
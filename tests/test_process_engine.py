@@ -0,0 +1,44 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.assistant.core.engine_benchmark import build_scene, build_synthetic_pack
+from src.assistant.core.image_recognition import ImageRecognition
+from src.assistant.core.process_engine import ProcessRecognitionEngine, load_bank
+from src.assistant.core.template_pack import TemplatePack
+from src.assistant.utils.label_catalog import LabelCatalog
+
+
+class TestProcessEngine(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pack_path = build_synthetic_pack(Path(self.temp_dir.name))
+        self.pack = TemplatePack(self.pack_path)
+        self.catalog = LabelCatalog()
+        self.bank = load_bank(self.pack, self.catalog, {}, [], None)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.pack.close()
+        self.temp_dir.cleanup()
+
+    def test_matches_thread_pool(self):
+        """测试多进程识别结果与线程池一致"""
+        regions, frame = build_scene(self.pack, self.catalog, 10)
+        self.catalog.set_regions(regions)
+        recognition = ImageRecognition()
+        expected = recognition.batch_process_region_ids(self.catalog, self.bank, frame=frame)
+
+        engine = ProcessRecognitionEngine(self.pack_path, workers=2)
+        try:
+            recognition.engine = engine
+            actual = recognition.batch_process_region_ids(self.catalog, self.bank, frame=frame)
+        finally:
+            engine.close()
+        self.assertEqual(actual.tolist(), expected.tolist())
+        self.assertTrue((actual > 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import time
+import unittest
+
+from src.screen_capture.utils.rate_policy import CaptureRatePolicy
+
+
+class TestCaptureRatePolicy(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.policy = CaptureRatePolicy(max_fps=60, idle_fps=1, hold=1.0, decay=0.5)
+
+    def test_idle_without_demand(self):
+        """测试没有需求时保持空闲帧率"""
+        self.assertEqual(self.policy.fps(), 1)
+        self.assertAlmostEqual(self.policy.interval(), 1.0)
+
+    def test_boost_and_decay(self):
+        """测试需求出现后立即升到峰值并按半衰期回落"""
+        self.policy.demand()
+        now = time.monotonic()
+        self.assertEqual(self.policy.fps(now), 60)
+        self.assertEqual(self.policy.fps(now + 0.9), 60)
+        self.assertAlmostEqual(self.policy.fps(now + 1.5), 30.5, delta=0.5)
+        self.assertAlmostEqual(self.policy.fps(now + 10), 1, delta=0.01)
+
+    def test_report(self):
+        """测试按帧率统计时间与截图次数"""
+        self.policy.demand()
+        self.policy.record_capture()
+        report = self.policy.report()
+        self.assertIn("60", report)
+        self.assertEqual(self.policy.captures_at_rate, {60: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
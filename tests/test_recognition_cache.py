@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.assistant.core.recognition_cache import RecognitionCache, crop_key
+
+
+class TestRecognitionCache(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.path = Path(tempfile.mkdtemp()) / 'cache.npz'
+        self.crop = np.zeros((8, 8, 4), dtype=np.uint8)
+
+    def test_crop_key(self):
+        """测试内容键区分类别、尺寸与像素"""
+        other = self.crop.copy()
+        other[0, 0, 0] = 1
+        key = crop_key(1, self.crop)
+        self.assertEqual(key, crop_key(1, self.crop.copy()))
+        self.assertNotEqual(key, crop_key(1, other))
+        self.assertNotEqual(key, crop_key(2, self.crop))
+        self.assertNotEqual(key, crop_key(1, self.crop[:, :4]))
+
+    def test_lru_eviction(self):
+        """测试超出上限时淘汰最久未使用的条目"""
+        cache = RecognitionCache(self.path, 'v1', max_entries=2)
+        cache.put(1, 3, 0.9)
+        cache.put(2, 4, 0.8)
+        cache.get(1)
+        cache.put(3, 5, 0.7)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), (3, 0.9))
+        self.assertEqual(cache.stats()['hits'], 2)
+
+    def test_persistence(self):
+        """测试持久化与版本校验"""
+        cache = RecognitionCache(self.path, 'v1')
+        cache.put(crop_key(1, self.crop), 3, 0.5)
+        cache.save()
+
+        loaded = RecognitionCache(self.path, 'v1')
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.get(crop_key(1, self.crop)), (3, 0.5))
+        self.assertFalse(RecognitionCache(self.path, 'v2').load())
+
+
+if __name__ == '__main__':
+    unittest.main()
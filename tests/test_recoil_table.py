@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.assistant.core.recoil_table import Loadout, RecoilTables, quantize
+
+WEAPONS = {
+    "M416": {
+        "interval": 86,
+        "bullets": 4,
+        "base": 10.0,
+        "ballistic": [[2, 0.5], [4, 1.0]],
+        "muzzles": {"default": 1.0, "补偿器": 0.8},
+        "poses": {"default": 1.0, "蹲": 0.5},
+        "grips": 1.0
+    }
+}
+
+
+class TestRecoilTable(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / 'weapons.json'
+        self.path.write_text(json.dumps(WEAPONS, ensure_ascii=False), encoding='utf-8')
+        self.tables = RecoilTables(self.path, {"m416": "M416"}.get)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_curve(self):
+        """测试按配装、姿势与倍率合成曲线并输出平铺 Lua 表"""
+        curve = self.tables.curve(Loadout("m416", "补偿器", "", "", "", "蹲", 2.0))
+        self.assertEqual(curve.interval, 86)
+        self.assertEqual(curve.steps, (4, 4, 8, 8))
+        self.assertEqual(curve.lua(), "recoil_interval = 86\nrecoil_curve = {4, 4, 8, 8}\n")
+        self.assertEqual(self.tables.curve(Loadout("", "", "", "", "", "", 1.0)).steps, ())
+
+    def test_cache(self):
+        """测试相同配装命中缓存，参数文件修改后重新计算"""
+        loadout = Loadout("M416", "", "", "", "", "", 1.0)
+        first = self.tables.curve(loadout)
+        self.assertIs(self.tables.curve(loadout), first)
+        self.assertEqual((self.tables.hits, self.tables.misses), (1, 1))
+
+        WEAPONS["M416"]["base"] = 20.0
+        self.path.write_text(json.dumps(WEAPONS, ensure_ascii=False), encoding='utf-8')
+        os.utime(self.path, ns=(0, 1))
+        self.assertEqual(self.tables.curve(loadout).steps, (10, 10, 20, 20))
+        WEAPONS["M416"]["base"] = 10.0
+
+    def test_quantize(self):
+        """测试取整误差累计到下一发，总位移不漂移"""
+        steps = quantize([0.4] * 10)
+        self.assertEqual(sum(steps), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
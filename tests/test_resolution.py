@@ -0,0 +1,46 @@
+import unittest
+
+from src.assistant.core.resolution import compile_regions, normalize_regions, _parse_name
+
+
+class TestResolution(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.config = {
+            "regions": {"poses": [1280, 1296, 64, 64]},
+            "shoot_pixel": {"x": 1270, "y": 1368},
+        }
+
+    def test_same_resolution(self):
+        """测试分辨率相同时区域保持不变"""
+        regions, shoot = compile_regions(self.config, 2560, 1440)
+        self.assertEqual(regions["poses"], [1280, 1296, 64, 64])
+        self.assertEqual(shoot, {"x": 1270, "y": 1368})
+
+    def test_scaled_reference(self):
+        """测试按参考分辨率换算"""
+        config = dict(self.config, reference={"width": 2560, "height": 1440})
+        regions, shoot = compile_regions(config, 1920, 1080)
+        self.assertEqual(regions["poses"], [960, 972, 48, 48])
+        self.assertEqual(shoot, {"x": 952, "y": 1026})
+
+    def test_normalized(self):
+        """测试归一化区域"""
+        config = {
+            "normalized": True,
+            "regions": normalize_regions(self.config["regions"], 2560, 1440),
+            "shoot_pixel": {"x": 0.5, "y": 0.5},
+        }
+        regions, shoot = compile_regions(config, 1920, 1080)
+        self.assertEqual(regions["poses"], [960, 972, 48, 48])
+        self.assertEqual(shoot, {"x": 960, "y": 540})
+
+    def test_parse_name(self):
+        """测试从目录名解析分辨率"""
+        self.assertEqual(_parse_name("25601440"), (2560, 1440))
+        self.assertEqual(_parse_name("1280720"), (1280, 720))
+        self.assertEqual(_parse_name("weapon"), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
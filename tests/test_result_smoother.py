@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from src.assistant.core.result_smoother import ResultSmoother
+from src.assistant.utils.label_catalog import NONE_ID, UNSET_ID
+
+
+class TestResultSmoother(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.smoother = ResultSmoother(2, window=5, votes=3, margin=0.15)
+
+    def test_single_flicker_ignored(self):
+        """测试单帧抖动不会改变稳定结果"""
+        self.assertEqual(self.smoother.observe(0, 1, 0.8), 1)
+        self.assertEqual(self.smoother.observe(0, 2, 0.7), 1)
+        self.assertEqual(self.smoother.observe(0, 1, 0.8), 1)
+        self.assertEqual(self.smoother.stats(), {"raw_flips": 2, "stable_flips": 0})
+
+    def test_votes_switch(self):
+        """测试新结果累计足够票数后切换"""
+        self.smoother.observe(0, 1, 0.8)
+        self.smoother.observe(0, 2, 0.7)
+        self.smoother.observe(0, 2, 0.7)
+        self.assertEqual(self.smoother.observe(0, 2, 0.7), 2)
+        self.assertEqual(self.smoother.stats()["stable_flips"], 1)
+
+    def test_confirm_frames(self):
+        """测试发现变化后再观测 confirm_frames 帧一致的结果即可按票数切换"""
+        for votes in (2, 3, 5):
+            smoother = ResultSmoother(1, window=5, votes=votes, margin=1.0)
+            smoother.observe(0, 1, 0.8)
+            self.assertEqual(smoother.observe(0, 2, 0.7), 1)
+            stable = [smoother.observe(0, 2, 0.7) for _ in range(smoother.confirm_frames)]
+            self.assertEqual(stable, [1] * (votes - 2) + [2])
+
+    def test_margin_switch(self):
+        """测试分数明显更高时立即切换"""
+        self.smoother.observe(0, 1, 0.6)
+        self.assertEqual(self.smoother.observe(0, 2, 0.9), 2)
+
+    def test_none_needs_votes(self):
+        """测试 none 的分数不参与分数优势判断，切换到或切换出 none 都需要票数"""
+        self.smoother.observe(0, NONE_ID, 0.3)
+        self.assertEqual(self.smoother.observe(0, 2, 0.9), NONE_ID)
+        self.smoother.observe(1, 2, 0.5)
+        self.assertEqual(self.smoother.observe(1, NONE_ID, 0.49), 2)
+        self.assertEqual(self.smoother.observe(1, NONE_ID, 0.49), 2)
+        self.assertEqual(self.smoother.observe(1, NONE_ID, 0.49), NONE_ID)
+
+    def test_observe_all(self):
+        """测试整帧观测与怀疑区域"""
+        ids = np.array([1, UNSET_ID], dtype=np.int16)
+        scores = np.array([0.8, 0.0], dtype=np.float32)
+        stable = self.smoother.observe_all(ids, scores)
+        self.assertEqual(stable.tolist(), [1, UNSET_ID])
+        self.assertEqual(self.smoother.suspects(np.array([2, 3], dtype=np.int16)), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+
+from src.assistant.core.results_block import ResultsBlock, ResultsReader
+from src.assistant.utils.label_catalog import LabelCatalog
+
+
+class TestResultsBlock(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.catalog = LabelCatalog()
+        self.name = f"test_results_{os.getpid()}"
+        self.block = ResultsBlock(self.catalog, self.name)
+
+    def tearDown(self):
+        self.block.close()
+
+    def test_snapshot(self):
+        """测试读取方拿到与写入一致的快照，标签名可还原"""
+        with ResultsReader(self.name, self.catalog) as reader:
+            self.assertTrue(reader.labels_match)
+            self.assertIsNone(reader.snapshot())  # 尚未发布
+
+            label = self.catalog.labels[1]
+            self.block.publish({"weapon_name": label, "bag": "none"}, 1.5, 7, 1000, 1010)
+            snapshot = reader.snapshot()
+            self.assertEqual((snapshot.seq, snapshot.capture_time, snapshot.write_time), (7, 1000, 1010))
+            self.assertEqual(snapshot.scope_zoom, 1.5)
+            names = snapshot.names(self.catalog)
+            self.assertEqual(names["weapon_name"], label)
+            self.assertEqual(names["bag"], "none")
+            self.assertEqual(names["muzzles"], "")
+
+    def test_wait_change(self):
+        """测试等待更新的序号，超时返回None"""
+        with ResultsReader(self.name, self.catalog) as reader:
+            self.block.publish({}, 1.0, 3, 0, 0)
+            self.assertEqual(reader.wait_change(2, timeout=0.1).seq, 3)
+            self.assertIsNone(reader.wait_change(3, timeout=0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.assistant.core.image_recognition import CategoryTemplates
+from src.assistant.core.roi_calibration import RoiCalibration, search_roi
+from src.assistant.utils.label_catalog import LabelCatalog
+
+
+class TestRoiCalibration(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        rng = np.random.default_rng(0)
+        # 平滑的随机图案，缩放后仍能稳定匹配
+        coarse = rng.integers(0, 255, (5, 8, 3), dtype=np.uint8)
+        self.template = cv2.resize(coarse, (30, 20), interpolation=cv2.INTER_CUBIC)
+        self.bank = CategoryTemplates(np.array([1], dtype=np.int16), [self.template])
+        self.frame = np.zeros((200, 300, 3), dtype=np.uint8)
+
+    def test_offset_and_scale(self):
+        """测试在宽窗口内找到偏移与缩放"""
+        scaled = cv2.resize(self.template, None, fx=1.1, fy=1.1, interpolation=cv2.INTER_LINEAR)
+        self.frame[57:57 + scaled.shape[0], 83:83 + scaled.shape[1]] = scaled
+        roi = search_roi(self.frame, [60, 40, 80, 60], self.bank, [0.9, 1.0, 1.1], pad=0, margin=2)
+        self.assertAlmostEqual(roi.scale, 1.1)
+        self.assertGreater(roi.score, 0.9)
+        self.assertLessEqual(abs(roi.rect[0] - 81), 1)
+        self.assertLessEqual(abs(roi.rect[1] - 55), 1)
+        self.assertEqual(roi.wide, [60, 40, 80, 60])
+
+    def test_persist_and_apply(self):
+        """测试校准表持久化、应用与失效"""
+        self.frame[50:70, 80:110] = self.template
+        catalog = LabelCatalog({"poses": [60, 40, 80, 60]})
+        path = Path(tempfile.mkdtemp()) / 'roi.json'
+        calibration = RoiCalibration(path, [1.0])
+        self.assertIsNotNone(calibration.calibrate(catalog, 0, self.frame, self._bank_for(catalog), 0.5))
+        self.assertTrue(catalog.region_calibrated[0])
+        calibration.save()
+
+        fresh = LabelCatalog({"poses": [60, 40, 80, 60]})
+        loaded = RoiCalibration(path, [1.0])
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.apply(fresh), 1)
+        np.testing.assert_array_equal(fresh.region_rects[0], catalog.region_rects[0])
+
+        loaded.invalidate(fresh, 0)
+        np.testing.assert_array_equal(fresh.region_rects[0], [60, 40, 80, 60])
+        self.assertEqual(loaded.apply(LabelCatalog({"poses": [0, 0, 80, 60]})), 0)
+
+    def _bank_for(self, catalog):
+        """构建按类别编号索引的模板库"""
+        empty = CategoryTemplates(np.zeros(0, dtype=np.int16), [])
+        bank = [empty] * len(catalog.categories)
+        bank[catalog.category_ids["poses"]] = self.bank
+        return bank
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import builtins
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.assistant.utils.startup_profiler import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.profiler = StartupProfiler()
+
+    def tearDown(self):
+        self.profiler.disable()
+
+    def test_disabled(self):
+        """测试未启用时阶段不记录，也不替换导入函数"""
+        original = builtins.__import__
+        with self.profiler.phase("创建主窗口"):
+            pass
+        self.assertEqual(self.profiler.phases, [])
+        self.assertIs(builtins.__import__, original)
+
+    def test_phases(self):
+        """测试阶段按顺序记录开始偏移与耗时"""
+        self.profiler.enable()
+        with self.profiler.phase("加载配置"):
+            time.sleep(0.02)
+        with self.profiler.phase("创建主窗口"):
+            pass
+        (first, first_offset, first_duration), (second, second_offset, _) = self.profiler.phases
+        self.assertEqual((first, second), ("加载配置", "创建主窗口"))
+        self.assertGreaterEqual(first_duration, 0.015)
+        self.assertGreaterEqual(second_offset, first_offset + first_duration)
+
+    def test_imports(self):
+        """测试只记录首次导入的模块，停止后恢复原导入函数"""
+        original = builtins.__import__
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "profiled_module.py").write_text("import time\ntime.sleep(0.01)\n", encoding="utf-8")
+            sys.path.insert(0, temp_dir)
+            try:
+                self.profiler.enable()
+                import profiled_module  # noqa: F401
+                import json  # noqa: F401  已加载的模块不记录
+                self.profiler.disable()
+            finally:
+                sys.path.remove(temp_dir)
+                sys.modules.pop("profiled_module", None)
+        self.assertIs(builtins.__import__, original)
+        self.assertGreaterEqual(self.profiler.imports["profiled_module"], 0.005)
+        self.assertNotIn("json", self.profiler.imports)
+
+    def test_report(self):
+        """测试报告包含总耗时、各阶段与耗时最长的导入"""
+        self.profiler.enable()
+        with self.profiler.phase("加载配置"):
+            pass
+        self.profiler.imports.update({"slow": 0.5, "fast": 0.001, "medium": 0.1})
+        report = self.profiler.report(top=2)
+        self.assertTrue(report.startswith("启动耗时: "))
+        self.assertIn("加载配置", report)
+        lines = report.splitlines()
+        imports = lines[lines.index("导入（前 2 项，含子模块）:") + 1:]
+        self.assertEqual([line.split()[0] for line in imports], ["slow", "medium"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import socket
+import threading
+import time
+import unittest
+
+from src.assistant.core.state_server import StateServer
+
+
+class TestStateServer(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.commands = []
+        self.server = StateServer(self._handle, max_pending=4096)
+        self.port = self.server.start()
+        self.server.publish(1, {"weapon_name": "m416", "poses": "stand"})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _handle(self, message):
+        if message["cmd"] == "slow":
+            time.sleep(0.5)
+            return {"thread": threading.current_thread().name}
+        if message["cmd"] == "fps":
+            self.commands.append(message["value"])
+            return {"fps": message["value"]}
+        raise ValueError(f"未知命令: {message['cmd']}")
+
+    def _connect(self):
+        conn = socket.create_connection(("127.0.0.1", self.port), timeout=2.0)
+        return conn, conn.makefile("r", encoding="utf-8")
+
+    def _request(self, conn, reader, message):
+        conn.sendall((json.dumps(message) + "\n").encode())
+        return json.loads(reader.readline())
+
+    def test_get_subscribe_delta(self):
+        """测试获取状态、订阅后只推送变化的字段"""
+        conn, reader = self._connect()
+        with conn, reader:
+            state = self._request(conn, reader, {"cmd": "subscribe"})
+            self.assertEqual(state["seq"], 1)
+            self.assertEqual(state["state"]["poses"], "stand")
+            self.server.publish(2, {"weapon_name": "m416", "poses": "crouch"})
+            delta = json.loads(reader.readline())
+            self.assertEqual(delta, {"type": "delta", "seq": 2, "changes": {"poses": "crouch"}})
+
+    def test_commands(self):
+        """测试控制命令交给处理函数，错误返回 ok=false，缺少 token 时拒绝"""
+        token = self.server.token
+        conn, reader = self._connect()
+        with conn, reader:
+            self.assertEqual(self._request(conn, reader, {"cmd": "fps", "value": 30, "token": token})["fps"], 30)
+            self.assertFalse(self._request(conn, reader, {"cmd": "bogus", "token": token})["ok"])
+            self.assertFalse(self._request(conn, reader, {"cmd": "fps", "value": 1})["ok"])
+            self.assertFalse(self._request(conn, reader, {"cmd": "fps", "value": 1, "token": "x"})["ok"])
+            self.assertTrue(self._request(conn, reader, {"cmd": "stats"})["ok"])
+            self.assertFalse(self._request(conn, reader, "not json")["ok"])
+            self.assertEqual(reader.readline(), "")  # 无效请求后断开连接
+        self.assertEqual(self.commands, [30])
+
+    def test_blocking_command(self):
+        """测试耗时的控制命令在命令线程中执行，等待期间其他客户端照常收发"""
+        slow, slow_reader = self._connect()
+        conn, reader = self._connect()
+        with slow, slow_reader, conn, reader:
+            slow.sendall((json.dumps({"cmd": "slow", "token": self.server.token}) + "\n").encode())
+            time.sleep(0.05)
+            start = time.perf_counter()
+            self.assertEqual(self._request(conn, reader, {"cmd": "get"})["seq"], 1)
+            self.assertLess(time.perf_counter() - start, 0.3)
+            result = json.loads(slow_reader.readline())
+            self.assertTrue(result["ok"])
+            self.assertTrue(result["thread"].startswith("StateServerCommand"))
+
+    def test_http_request_rejected(self):
+        """测试浏览器发来的 HTTP 请求在请求行处断开，请求体不会被执行"""
+        conn, reader = self._connect()
+        with conn, reader:
+            body = json.dumps({"cmd": "fps", "value": 1, "token": self.server.token}) + "\n"
+            conn.sendall(("POST / HTTP/1.1\r\nHost: 127.0.0.1:47800\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n{body}").encode())
+            self.assertFalse(json.loads(reader.readline())["ok"])
+            self.assertEqual(reader.readline(), "")
+        self.assertEqual(self.commands, [])
+
+    def test_slow_subscriber(self):
+        """测试不读取的订阅者不会阻塞发布，超过积压上限后丢弃并记录统计"""
+        conn, reader = self._connect()
+        with conn, reader:
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+            self._request(conn, reader, {"cmd": "subscribe"})
+            start = time.perf_counter()
+            for seq in range(2, 5000):
+                self.server.publish(seq, {"weapon_name": "x" * 4000 + str(seq)})
+            self.assertLess(time.perf_counter() - start, 1.0)
+            deadline = time.monotonic() + 2.0
+            while time.monotonic() < deadline:
+                stats = self.server.stats()
+                if stats and stats[0]["dropped"] > 0:
+                    break
+                time.sleep(0.01)
+            self.assertGreater(stats[0]["dropped"], 0)
+            self.assertTrue(stats[0]["lagging"])
+
+
+if __name__ == '__main__':
+    unittest.main()
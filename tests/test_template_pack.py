@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from src.assistant.core.template_pack import PACK_PATTERN, TemplatePack
+
+
+class TestTemplatePack(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作：一个分辨率目录，含 config.json 与两个类别的模板"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name)
+        (self.source / 'config.json').write_text(json.dumps({"poses": [1, 2, 3, 4]}), encoding='utf-8')
+        rng = np.random.default_rng(0)
+        self.stand = rng.integers(0, 256, (8, 6, 4), dtype=np.uint8)
+        self.stand[..., 3] = 0
+        self.stand[2:6, 1:5, 3] = 255
+        self.car = rng.integers(0, 256, (5, 7, 3), dtype=np.uint8)
+        self.write_png('poses', 'stand', self.stand)
+        self.write_png('car', 'car', self.car)
+        self.packs = []
+
+    def tearDown(self):
+        for pack in self.packs:
+            pack.close()
+        self.temp_dir.cleanup()
+
+    def write_png(self, category, name, image):
+        folder = self.source / 'weapon_templates' / category
+        folder.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(folder / f'{name}.png'), image)
+
+    def load(self):
+        pack = TemplatePack.load_or_build(self.source)
+        self.packs.append(pack)
+        return pack
+
+    def test_build(self):
+        """测试编译后各形式的模板、掩码与配置可以直接读取"""
+        pack = TemplatePack(TemplatePack.build(self.source))
+        self.packs.append(pack)
+        self.assertEqual(pack.config, {"poses": [1, 2, 3, 4]})
+        self.assertEqual(pack.labels('poses'), ['stand'])
+        np.testing.assert_array_equal(pack.get('poses', 'stand'), self.stand[..., :3])
+        np.testing.assert_array_equal(pack.get('poses', 'stand', 'g'), self.stand[..., 1])
+        np.testing.assert_array_equal(pack.get('poses', 'stand', 'mask'),
+                                      np.where(self.stand[..., 3] > 0, 255, 0))
+        np.testing.assert_array_equal(pack.get('car', 'car'), self.car)
+        self.assertIsNone(pack.get('car', 'missing'))
+        self.assertFalse(pack.get('car', 'car').flags.writeable)
+        self.assertTrue(pack.verify())
+
+        sources = pack.sources('poses', [(5, 'stand'), (6, 'missing')], 'gray')
+        self.assertEqual([label_id for label_id, *_ in sources], [5, 6])
+        self.assertEqual(sources[0][2].shape, (8, 6))
+        self.assertIsNone(sources[1][1])
+
+    def test_load_or_build(self):
+        """测试包存在且未过期时直接加载，不重新编译，也不校验数据区哈希"""
+        first = self.load()
+        content_hash = first.content_hash
+        mtime = os.stat(first.path).st_mtime_ns
+        with mock.patch.object(TemplatePack, 'verify', side_effect=AssertionError("加载时不应校验哈希")):
+            second = self.load()
+        self.assertEqual(second.path, first.path)
+        self.assertEqual(second.content_hash, content_hash)
+        self.assertEqual(os.stat(first.path).st_mtime_ns, mtime)
+
+    def test_stale(self):
+        """测试模板源文件变化后判定为过期并重新编译"""
+        pack = self.load()
+        self.assertFalse(pack.is_stale(self.source))
+        self.write_png('car', 'car', np.zeros((9, 9, 3), dtype=np.uint8))
+        self.assertTrue(pack.is_stale(self.source))
+        rebuilt = self.load()
+        self.assertEqual(rebuilt.get('car', 'car').shape, (9, 9, 3))
+        self.assertNotEqual(rebuilt.content_hash, pack.content_hash)
+
+    def test_rebuild_new_file(self):
+        """测试重新编译写入新文件，已映射的旧包不被替换，之后删除旧包"""
+        pack = self.load()
+        car = pack.get('car', 'car')
+        expected = car.copy()
+        with mock.patch('src.assistant.core.template_pack.os.replace', wraps=os.replace) as replace:
+            self.write_png('car', 'car', np.zeros((9, 9, 3), dtype=np.uint8))
+            rebuilt = self.load()
+        self.assertNotEqual(rebuilt.path, pack.path)
+        self.assertNotIn(pack.path, [Path(call.args[1]) for call in replace.call_args_list])
+        np.testing.assert_array_equal(car, expected)  # 旧包的视图仍然可用
+        self.assertEqual(list(self.source.glob(PACK_PATTERN)), [rebuilt.path])
+
+    def test_verify(self):
+        """测试数据区被改动后哈希校验失败"""
+        pack = TemplatePack(TemplatePack.build(self.source))
+        pack_path = pack.path
+        pack.close()
+        data = bytearray(pack_path.read_bytes())
+        data[-1] ^= 0xFF
+        pack_path.write_bytes(bytes(data))
+
+        corrupted = TemplatePack(pack_path)
+        self.packs.append(corrupted)
+        self.assertFalse(corrupted.verify())
+
+    def test_invalid_file(self):
+        """测试格式错误的文件无法加载，load_or_build 重新编译并删除旧版固定文件名的包"""
+        legacy = self.source / 'templates.pack'
+        legacy.write_bytes(b"not a pack")
+        with self.assertRaises(ValueError):
+            TemplatePack(legacy)
+        pack = self.load()
+        self.assertEqual(pack.labels('car'), ['car'])
+        self.assertFalse(legacy.exists())
+
+        pack.close()
+        pack.path.write_bytes(b"not a pack")
+        self.assertEqual(self.load().labels('car'), ['car'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.assistant.core.tracing import Tracer, traced
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.tracer = Tracer.get_instance()
+        self.tracer.configure(False, 50000)
+        self.tracer.clear()
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.tracer.configure(False)
+        self.tracer.clear()
+
+    def test_disabled(self):
+        """未开启时不记录"""
+        with self.tracer.span("safe_capture") as span:
+            span.set(seq=1)
+        self.assertEqual(len(self.tracer), 0)
+
+    def test_ring_capacity(self):
+        """超过容量时只保留最近的记录"""
+        self.tracer.configure(True, 3)
+        for i in range(5):
+            with self.tracer.span("process_region", index=i):
+                pass
+        events = [event for event in self.tracer.events() if event["ph"] == "X"]
+        self.assertEqual([event["args"]["index"] for event in events], [2, 3, 4])
+
+    def test_dump(self):
+        """导出的 JSON 为 Chrome trace event 格式，并带线程名"""
+        self.tracer.configure(True)
+
+        @traced("write_files")
+        def write():
+            with self.tracer.span("safe_capture") as span:
+                span.set(seq=7)
+
+        worker = threading.Thread(target=write, name="Worker")
+        worker.start()
+        worker.join()
+        write()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "trace.json"
+            self.tracer.dump(path)
+            data = json.loads(path.read_text(encoding="utf-8"))
+
+        spans = [event for event in data["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual([event["name"] for event in spans],
+                         ["safe_capture", "write_files", "safe_capture", "write_files"])
+        self.assertEqual(spans[0]["args"], {"seq": 7})
+        self.assertNotEqual(spans[0]["tid"], spans[2]["tid"])
+        outer, inner = spans[1], spans[0]
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+        names = {event["tid"]: event["args"]["name"] for event in data["traceEvents"] if event["ph"] == "M"}
+        self.assertEqual(names[spans[0]["tid"]], "Worker")
+
+
+if __name__ == '__main__':
+    unittest.main()